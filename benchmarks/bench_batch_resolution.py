@@ -0,0 +1,58 @@
+# Resolving every preset one by one versus through the BatchResolver on a
+# synthetic 10k preset studio. Run from the repository root:
+#
+#   python -m benchmarks.bench_batch_resolution
+import argparse
+import time
+
+from rez_wg_config_launcher_demo import resolver
+from rez_wg_config_launcher_demo.batch import BatchResolver
+
+from benchmarks.synthetic import build_studio
+
+
+def per_preset(projects):
+    return {
+        project: {preset: resolver.resolve(preset) for preset in project.presets}
+        for project in projects
+    }
+
+
+def batched(projects):
+    return BatchResolver().resolve_projects(projects)
+
+
+def run(
+    project_count: int,
+    presets_per_project: int,
+    sequences_per_project: int,
+    settings_per_node: int,
+):
+    print(f"{project_count * presets_per_project} presets")
+    for label, resolve in [("per preset", per_preset), ("batched", batched)]:
+        # Fresh data for every run so neither side profits from warm caches.
+        _, projects = build_studio(
+            project_count,
+            presets_per_project,
+            sequences_per_project=sequences_per_project,
+            settings_per_node=settings_per_node,
+        )
+        start = time.perf_counter()
+        resolve(projects)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12}: {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--presets-per-project", type=int, default=100)
+    parser.add_argument("--sequences-per-project", type=int, default=2)
+    parser.add_argument("--settings-per-node", type=int, default=20)
+    args = parser.parse_args()
+    run(
+        args.projects,
+        args.presets_per_project,
+        args.sequences_per_project,
+        args.settings_per_node,
+    )
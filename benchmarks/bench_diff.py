@@ -0,0 +1,69 @@
+# Time to diff every pair of presets in a project: resolving both presets of
+# each pair and comparing everything, against the DiffEngine, which folds each
+# shared configuration and preset once and only compares the keys set below the
+# presets' common ancestor. Runs from the repository root:
+#
+#   python -m benchmarks.bench_diff
+import argparse
+import itertools
+import time
+
+from benchmarks.synthetic import build_studio
+from rez_wg_config_launcher_demo import resolver
+from rez_wg_config_launcher_demo.diff import DiffEngine
+
+
+def diff_resolved(left, right) -> int:
+    left_environment = resolver.resolve(left)
+    right_environment = resolver.resolve(right)
+    keys = left_environment.environment.keys() | right_environment.environment.keys()
+    differences = sum(
+        left_environment.environment.get(key) != right_environment.environment.get(key)
+        for key in keys
+    )
+    names = left_environment.packages.keys() | right_environment.packages.keys()
+    differences += sum(
+        repr(left_environment.packages.get(name))
+        != repr(right_environment.packages.get(name))
+        for name in names
+    )
+    return differences
+
+
+def run(presets_per_project: int, settings_per_node: int):
+    _, projects = build_studio(
+        project_count=2,
+        presets_per_project=presets_per_project,
+        settings_per_node=settings_per_node,
+    )
+    presets = projects[0].presets
+    pairs = list(itertools.combinations(presets, 2))
+    print(f"{len(pairs)} pairs of {len(presets)} presets")
+
+    start = time.perf_counter()
+    resolved_differences = sum(diff_resolved(left, right) for left, right in pairs)
+    print(
+        f"{'resolved':>10}: {(time.perf_counter() - start) * 1000:.0f}ms,"
+        f" {resolved_differences} differences"
+    )
+
+    start = time.perf_counter()
+    engine = DiffEngine()
+    engine_differences = sum(
+        # Tools and icons are not compared by the resolved diff above.
+        sum(difference.type not in ("Tool", "Icon") for difference in diff.differences)
+        for diff in engine.diff_all(presets)
+    )
+    print(
+        f"{'engine':>10}: {(time.perf_counter() - start) * 1000:.0f}ms,"
+        f" {engine_differences} differences"
+    )
+    assert engine_differences == resolved_differences
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--presets-per-project", type=int, default=100)
+    parser.add_argument("--settings-per-node", type=int, default=50)
+    args = parser.parse_args()
+    run(args.presets_per_project, args.settings_per_node)
@@ -0,0 +1,126 @@
+# Launches a dummy tool (a shell script printing a few lines and sleeping) for
+# many presets through the LaunchQueue at several concurrency limits, and
+# reports the resolve, spawn and time-to-process-start latencies. Every preset
+# requests its own package from a stand-in repository that sleeps for
+# --resolve-seconds per resolve, the part the concurrency limit bounds. Runs
+# from the repository root:
+#
+#   python -m benchmarks.bench_launch_queue
+import argparse
+import os
+import stat
+import statistics
+import tempfile
+import threading
+import time
+
+from rez_wg_config_launcher_demo.data_model import Configuration, EnvVarAction, Preset
+from rez_wg_config_launcher_demo.launch import LaunchEventKind, LaunchQueue
+from rez_wg_config_launcher_demo.rez_resolve import (
+    LocalPackageRepository,
+    ResolveCache,
+    write_package_repository,
+)
+
+DUMMY_TOOL = """#!/bin/sh
+echo "$PRESET starting"
+echo "$PRESET warning" >&2
+sleep "$DUMMY_SECONDS"
+echo "$PRESET done"
+"""
+
+
+def create_presets(path: str, count: int) -> list[Preset]:
+    # The presets' PATH replaces the inherited one, the script still needs sleep.
+    config = Configuration("studio")
+    config.add_env_var("PATH", path, EnvVarAction.SET)
+    config.add_tool("dummy_tool")
+    return [
+        Preset(f"preset_{i}", config)
+        .add_env_var("PRESET", str(i), EnvVarAction.SET)
+        .add_package_requirement(f"package_{i}", "~=1.0")
+        for i in range(count)
+    ]
+
+
+def run(launches: int, limits: list[int], tool_seconds: float, resolve_seconds: float):
+    with tempfile.TemporaryDirectory() as directory:
+        tool_path = os.path.join(directory, "dummy_tool")
+        with open(tool_path, "w") as file:
+            file.write(DUMMY_TOOL)
+        os.chmod(tool_path, os.stat(tool_path).st_mode | stat.S_IEXEC)
+        write_package_repository(
+            f"{directory}/packages",
+            {f"package_{i}": {"1.0": []} for i in range(launches)},
+        )
+        presets = create_presets(
+            os.pathsep.join([directory, os.environ.get("PATH", "")]), launches
+        )
+        base_environment = dict(os.environ, DUMMY_SECONDS=str(tool_seconds))
+
+        print(
+            f"{launches} launches, {resolve_seconds}s package resolves,"
+            f" tool running {tool_seconds}s"
+        )
+        for limit in limits:
+            resolve_cache = ResolveCache(
+                LocalPackageRepository([f"{directory}/packages"], resolve_seconds),
+                directory=f"{directory}/resolves_{limit}",
+            )
+            queue = LaunchQueue(
+                max_concurrent=limit,
+                resolve_cache=resolve_cache,
+                base_environment=base_environment,
+            )
+            output_lines = []
+            finished = threading.Semaphore(0)
+
+            def on_event(event):
+                if event.kind == LaunchEventKind.OUTPUT:
+                    output_lines.extend(event.lines)
+                elif event.launch.done:
+                    finished.release()
+
+            queue.add_listener(on_event)
+            start = time.perf_counter()
+            submitted = [queue.submit(preset) for preset in presets]
+            submit_seconds = time.perf_counter() - start
+            for _ in submitted:
+                finished.acquire()
+            elapsed = time.perf_counter() - start
+            queue.shutdown()
+
+            failed = [launch for launch in submitted if launch.returncode != 0]
+            if failed:
+                raise RuntimeError(f"{len(failed)} launches failed: {failed[0].error}")
+            timings = [launch.timings for launch in submitted]
+            to_start = sorted(timing.start_seconds for timing in timings)
+            print(
+                f"  limit {limit:>3}: all done in {elapsed:.2f}s,"
+                f" submit {submit_seconds * 1000:.1f}ms,"
+                f" resolve {_median(t.resolve_seconds for t in timings):.1f}ms,"
+                f" spawn {_median(t.spawn_seconds for t in timings):.1f}ms,"
+                f" to start {statistics.median(to_start) * 1000:.1f}ms"
+                f" (max {to_start[-1] * 1000:.1f}ms), {len(output_lines)} output lines"
+            )
+
+
+def _median(seconds) -> float:
+    return statistics.median(seconds) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=50)
+    parser.add_argument(
+        "--limit", type=int, action="append", help="Concurrency limit(s) to run"
+    )
+    parser.add_argument("--tool-seconds", type=float, default=0.5)
+    parser.add_argument("--resolve-seconds", type=float, default=0.05)
+    args = parser.parse_args()
+    run(
+        args.launches,
+        args.limit or [1, 4, 16],
+        args.tool_seconds,
+        args.resolve_seconds,
+    )
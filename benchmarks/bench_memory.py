@@ -0,0 +1,60 @@
+# Memory held by a synthetic studio tree, measured with tracemalloc while it is
+# built. Runs from the repository root:
+#
+#   python -m benchmarks.bench_memory
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.synthetic import build_studio
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    EnvVar,
+    EnvVarAction,
+    PackageRequirement,
+)
+
+
+def run(projects: int, presets_per_project: int, settings_per_node: int):
+    gc.collect()
+    tracemalloc.start()
+    root, project_list = build_studio(
+        project_count=projects,
+        presets_per_project=presets_per_project,
+        settings_per_node=settings_per_node,
+    )
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    configurations = list(root.child_generator())
+    presets = [preset for project in project_list for preset in project.presets]
+    setting_count = sum(len(holder.settings) for holder in [*configurations, *presets])
+    print(
+        f"{len(configurations)} configurations, {len(presets)} presets,"
+        f" {setting_count} settings"
+    )
+    print(f"{'tree':>14}: {current / 2**20:.1f}MiB (peak {peak / 2**20:.1f}MiB)")
+    print(f"{'per setting':>14}: {current / setting_count:.0f} bytes, tree included")
+
+    # Shallow sizes of single objects, what every instance costs at least.
+    samples = [
+        ("EnvVar", EnvVar("KEY", "value", EnvVarAction.SET)),
+        ("Package", PackageRequirement("package", "~=1.0")),
+        ("Configuration", Configuration("leaf")),
+    ]
+    for label, sample in samples:
+        size = sys.getsizeof(sample)
+        if hasattr(sample, "__dict__"):
+            size += sys.getsizeof(sample.__dict__)
+        print(f"{label:>14}: {size} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--presets-per-project", type=int, default=100)
+    parser.add_argument("--settings-per-node", type=int, default=20)
+    args = parser.parse_args()
+    run(args.projects, args.presets_per_project, args.settings_per_node)
@@ -0,0 +1,62 @@
+# Speedup of process pool resolution over in-process batch resolution for
+# increasing worker counts, to help size submission hosts. Run from the
+# repository root:
+#
+#   python -m benchmarks.bench_parallel_resolution
+import argparse
+import os
+import time
+
+from rez_wg_config_launcher_demo.batch import BatchResolver
+from rez_wg_config_launcher_demo.parallel import resolve_projects_parallel
+
+from benchmarks.synthetic import build_studio
+
+
+def serial(root, projects):
+    return [
+        [resolved.to_dict() for resolved in presets.values()]
+        for presets in BatchResolver().resolve_projects(projects).values()
+    ]
+
+
+def worker_counts(cpu_count: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= cpu_count:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpu_count:
+        counts.append(cpu_count)
+    return counts
+
+
+def run(project_count: int, presets_per_project: int, max_workers: int):
+    root, projects = build_studio(project_count, presets_per_project)
+    print(f"{project_count * presets_per_project} presets, {os.cpu_count()} cores")
+
+    start = time.perf_counter()
+    expected = serial(root, projects)
+    serial_time = time.perf_counter() - start
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'efficiency':>11}")
+    print(f"{'serial':>8} {serial_time:>9.3f} {1:>8.2f} {'':>11}")
+
+    for workers in worker_counts(max_workers):
+        # Fresh data so the pool does not profit from warm caches.
+        root, projects = build_studio(project_count, presets_per_project)
+        start = time.perf_counter()
+        results = resolve_projects_parallel(root, projects, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        # Keyed by objects of different trees, compared in order.
+        assert [list(presets.values()) for presets in results.values()] == expected
+        speedup = serial_time / elapsed
+        print(
+            f"{workers:>8} {elapsed:>9.3f} {speedup:>8.2f} {speedup / workers:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--presets-per-project", type=int, default=100)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    run(args.projects, args.presets_per_project, args.max_workers)
@@ -0,0 +1,72 @@
+# Time until a preset's rez context is available at launch: resolved on the
+# spot, read from the ResolveCache, and after a background pre-warm of the
+# project. The stand-in repository sleeps for --resolve-seconds per resolve to
+# play the part of the rez solver. Runs from the repository root:
+#
+#   python -m benchmarks.bench_resolve_cache
+import argparse
+import tempfile
+import time
+
+from benchmarks.synthetic import build_studio
+from rez_wg_config_launcher_demo.rez_resolve import (
+    LocalPackageRepository,
+    ResolveCache,
+    parse_request,
+    preset_requests,
+    write_package_repository,
+)
+
+
+def run(presets_per_project: int, resolve_seconds: float):
+    root, projects = build_studio(
+        project_count=2, presets_per_project=presets_per_project, settings_per_node=2
+    )
+    presets = projects[0].presets
+    # Versions 0.0, 1.0, ... of every requested package cover the "~=N.0" and
+    # "~=N" specifiers the synthetic studio uses.
+    versions = {f"{version}.0": [] for version in range(presets_per_project)}
+    packages = {
+        parse_request(request)[0]: versions
+        for project in projects
+        for preset in project.presets
+        for request in preset_requests(preset)
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        write_package_repository(f"{directory}/packages", packages)
+        repository = LocalPackageRepository([f"{directory}/packages"], resolve_seconds)
+        distinct = len({tuple(preset_requests(preset)) for preset in presets})
+        print(f"{len(presets)} presets, {distinct} distinct request lists")
+
+        cache = ResolveCache(repository, f"{directory}/cache")
+        start = time.perf_counter()
+        for preset in presets:
+            cache.resolve_preset(preset)
+        cold = (time.perf_counter() - start) / len(presets)
+        start = time.perf_counter()
+        for preset in presets:
+            cache.resolve_preset(preset)
+        warm = (time.perf_counter() - start) / len(presets)
+        print(f"{'cold':>10}: {cold * 1000:.1f}ms per launch")
+        print(f"{'cached':>10}: {warm * 1000:.2f}ms per launch")
+
+        cache.clear()
+        start = time.perf_counter()
+        future = cache.prewarm(presets)
+        started = time.perf_counter() - start
+        future.result()
+        start = time.perf_counter()
+        for preset in presets:
+            cache.resolve_preset(preset)
+        prewarmed = (time.perf_counter() - start) / len(presets)
+        print(f"{'pre-warm':>10}: {started * 1000:.1f}ms to start")
+        print(f"{'prewarmed':>10}: {prewarmed * 1000:.2f}ms per launch, {cache.stats}")
+        cache.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--presets-per-project", type=int, default=100)
+    parser.add_argument("--resolve-seconds", type=float, default=0.05)
+    args = parser.parse_args()
+    run(args.presets_per_project, args.resolve_seconds)
@@ -0,0 +1,122 @@
+# Longest event loop stall while the selection in the Config Editor changes
+# rapidly across deep configurations, with settings resolved on the GUI thread
+# (as selection handling used to) versus through the SettingsResolveQueue.
+# Runs headless, from the repository root:
+#
+#   python -m benchmarks.bench_selection_stall
+import argparse
+import gc
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy import QtCore, QtWidgets
+
+from rez_wg_config_launcher_demo import ui_model, view
+from rez_wg_config_launcher_demo.data_model import Configuration, EnvVarAction
+
+
+def build_chain(depth: int, settings_per_node: int) -> tuple[Configuration, list[Configuration]]:
+    # One long parent chain, every node deeper than the last, so each newly
+    # selected node resolves more settings than the one before. Levels repeat
+    # most of their parent's settings, which resolution deduplicates, so the
+    # cost is in resolving rather than in showing many rows.
+    root = Configuration("root")
+    chain = []
+    parent = root
+    for level in range(depth):
+        config = Configuration(f"level_{level}").set_parent_configuration(parent)
+        for i in range(settings_per_node):
+            config.add_env_var(f"VAR_{i}", str(i), EnvVarAction.SET)
+        config.add_env_var("LEVEL", str(level), EnvVarAction.SET)
+        chain.append(config)
+        parent = config
+    return root, chain
+
+
+def settle(app, seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+
+
+def measure_stall(app, select, configurations, interval_ms: int) -> float:
+    # A heartbeat timer records the longest gap between its ticks while another
+    # timer changes the selection every `interval_ms`.
+    settle(app, 0.5)
+    # A full collection of the previous run's garbage would show up as a stall
+    # that has nothing to do with selection handling.
+    gc.collect()
+    longest = 0.0
+    last = time.perf_counter()
+
+    def beat():
+        nonlocal last, longest
+        now = time.perf_counter()
+        longest = max(longest, now - last)
+        last = now
+
+    heartbeat = QtCore.QTimer()
+    heartbeat.setInterval(1)
+    heartbeat.timeout.connect(beat)
+
+    remaining = list(configurations)
+    selector = QtCore.QTimer()
+    selector.setInterval(interval_ms)
+    selector.timeout.connect(lambda: select(remaining.pop(0)) if remaining else None)
+
+    heartbeat.start()
+    selector.start()
+    while remaining:
+        app.processEvents()
+    # Let the last resolution land.
+    settle(app, 1.0)
+    selector.stop()
+    heartbeat.stop()
+    return longest
+
+
+def run(depth: int, settings_per_node: int, interval_ms: int):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    print(f"{depth} deep configurations, {settings_per_node} settings each")
+
+    # Fresh trees for both runs so neither profits from resolved caches.
+    root, chain = build_chain(depth, settings_per_node)
+    editor = view.ConfigEditor(root, expand_depth=depth)
+    editor.show()
+
+    def select_synchronously(configuration):
+        editor.set_table_setting_model(ui_model.ConfigTableSettingModel(configuration))
+
+    stall = measure_stall(app, select_synchronously, chain, interval_ms)
+    print(f"{'GUI thread':>12}: longest stall {stall * 1000:.1f}ms")
+    editor.close()
+
+    root, chain = build_chain(depth, settings_per_node)
+    editor = view.ConfigEditor(root, expand_depth=depth)
+    editor.show()
+    tree_model = editor.tree_model
+    tree_proxy = editor.tree_proxy
+    selection_model = editor.config_tree_view.selectionModel()
+
+    def select_in_view(configuration):
+        selection_model.select(
+            tree_proxy.mapFromSource(tree_model.index_for_configuration(configuration)),
+            QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect,
+        )
+
+    stall = measure_stall(app, select_in_view, chain, interval_ms)
+    print(f"{'thread pool':>12}: longest stall {stall * 1000:.1f}ms")
+    shown = editor.configuration_table_view.model()
+    print(f"{'':>12}  shows '{shown.configuration.name}' with {len(shown.config_settings)} rows")
+    editor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--settings-per-node", type=int, default=300)
+    parser.add_argument("--interval-ms", type=int, default=5)
+    args = parser.parse_args()
+    run(args.depth, args.settings_per_node, args.interval_ms)
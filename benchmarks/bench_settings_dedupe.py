@@ -0,0 +1,46 @@
+# Scaling of get_all_configuration_settings with the number of settings along
+# an inheritance chain. Run from the repository root:
+#
+#   python -m benchmarks.bench_settings_dedupe
+import argparse
+import time
+
+from rez_wg_config_launcher_demo.data_model import Configuration, EnvVarAction
+
+SETTING_COUNTS = [1_000, 10_000, 100_000]
+CHAIN_DEPTH = 10
+
+
+def build_chain(setting_count: int, depth: int = CHAIN_DEPTH) -> Configuration:
+    per_node = setting_count // depth
+    config = Configuration("root")
+    for level in range(depth):
+        config = Configuration(f"level_{level}").set_parent_configuration(config)
+        for i in range(per_node):
+            # Every level re-declares half of the previous level's settings so
+            # the dedupe path is exercised as well as the insert path.
+            index = level * per_node + i - (per_node // 2 if i % 2 else 0)
+            if i % 3:
+                config.add_env_var(f"VAR_{index}", str(index), EnvVarAction.SET)
+            else:
+                config.add_package_requirement(f"package_{index}", f"~={index}")
+    return config
+
+
+def run(setting_counts: list[int]):
+    print(f"{'settings':>10} {'seconds':>10} {'us/setting':>12}")
+    for setting_count in setting_counts:
+        leaf = build_chain(setting_count)
+        start = time.perf_counter()
+        leaf.get_all_configuration_settings()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{setting_count:>10} {elapsed:>10.4f} {elapsed / setting_count * 1e6:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("counts", nargs="*", type=int, default=SETTING_COUNTS)
+    args = parser.parse_args()
+    run(args.counts)
@@ -0,0 +1,80 @@
+# Queries against a SettingsIndex over a synthetic studio with about a million
+# settings, versus scanning every configuration and preset for each query, and
+# the cost of keeping the index current while settings change. Runs from the
+# repository root:
+#
+#   python -m benchmarks.bench_settings_index
+import argparse
+import time
+
+from benchmarks.synthetic import build_studio
+from rez_wg_config_launcher_demo.data_model import EnvVarAction
+from rez_wg_config_launcher_demo.search import SettingsIndex, setting_term
+
+
+def scan(holders, text: str) -> list:
+    text = text.lower()
+    return [
+        (holder, setting)
+        for holder in holders
+        for setting in holder.settings
+        if text in setting_term(setting).lower()
+    ]
+
+
+def timed(function, repeat: int) -> tuple[float, object]:
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(projects: int, settings_per_node: int, repeat: int):
+    root, project_list = build_studio(
+        project_count=projects, settings_per_node=settings_per_node
+    )
+    configurations = list(root.child_generator())
+    presets = [preset for project in project_list for preset in project.presets]
+    holders = configurations + presets
+    setting_count = sum(len(holder.settings) for holder in holders)
+    print(f"{len(holders)} configurations and presets, {setting_count} settings")
+
+    start = time.perf_counter()
+    index = SettingsIndex(root, project_list)
+    print(f"{'build':>19}: {(time.perf_counter() - start) * 1000:.0f}ms, {len(index)} terms")
+
+    queries = [
+        ("exact", lambda: index.find("SEQ_PATH_7")),
+        ("exact, rare", lambda: index.find("app_3_package_0")),
+        ("substring", lambda: index.search("path_4")),
+        ("substring, no hit", lambda: index.search("nuke")),
+        ("substring holders", lambda: index.search_holders("path_4")),
+        ("first 1000 holders", lambda: index.search_holders("path_4", limit=1000)),
+    ]
+    for label, query in queries:
+        elapsed, matches = timed(query, repeat)
+        print(f"{label:>19}: {elapsed * 1000:.2f}ms, {len(matches)} matches")
+
+    elapsed, matches = timed(lambda: scan(holders, "path_4"), 1)
+    print(f"{'scan substring':>19}: {elapsed * 1000:.2f}ms, {len(matches)} matches")
+
+    # Every change reindexes only the changed configuration.
+    config = configurations[-1]
+    start = time.perf_counter()
+    for i in range(repeat):
+        config.add_env_var(f"ADDED_{i}", str(i), EnvVarAction.SET)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{'update':>19}: {elapsed * 1000:.2f}ms per added setting")
+    elapsed, matches = timed(lambda: index.search("added_"), 1)
+    print(f"{'search after update':>19}: {elapsed * 1000:.2f}ms, {len(matches)} matches")
+    index.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--settings-per-node", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.projects, args.settings_per_node, args.repeat)
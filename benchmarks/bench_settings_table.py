@@ -0,0 +1,81 @@
+# Time to open a Preset Editor on a preset with thousands of resolved settings
+# until its table is filled and painted, then to paint every page while
+# scrolling to the bottom. Runs headless, from the repository root:
+#
+#   python -m benchmarks.bench_settings_table
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy import QtCore, QtWidgets
+
+from rez_wg_config_launcher_demo.data_model import Configuration, EnvVarAction, Preset
+from rez_wg_config_launcher_demo.view import PresetEditor
+
+
+def build_preset(depth: int, settings_per_node: int) -> Preset:
+    # A chain of configurations that each add their own variables and
+    # packages, so every setting shows up in the preset's resolved table.
+    config = Configuration("root")
+    for level in range(depth):
+        config = Configuration(f"level_{level}").set_parent_configuration(config)
+        for i in range(settings_per_node):
+            if i % 4 == 3:
+                config.add_package_requirement(f"package_{level}_{i}", f"~={i}.0")
+            else:
+                config.add_env_var(
+                    f"VAR_{level}_{i}", f"/studio/level_{level}/{i}", EnvVarAction.PREPEND
+                )
+    return Preset("preset", config).add_env_var("PRESET", "1", EnvVarAction.SET)
+
+
+def run(depth: int, settings_per_node: int, repeat: int):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    preset = build_preset(depth, settings_per_node)
+    row_count = len(preset.get_all_configuration_settings())
+
+    open_times = []
+    scroll_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        editor = PresetEditor(preset)
+        editor.show()
+        # Settings are resolved on a worker thread, wait for them to arrive.
+        pool = QtCore.QThreadPool.globalInstance()
+        while editor.resolve_queue.busy or pool.activeThreadCount():
+            app.processEvents()
+        app.processEvents()
+        table = editor.configuration_table_view
+        table.viewport().repaint()
+        open_times.append(time.perf_counter() - start)
+
+        scroll_bar = table.verticalScrollBar()
+        start = time.perf_counter()
+        value = 0
+        while value < scroll_bar.maximum():
+            value = min(value + scroll_bar.pageStep(), scroll_bar.maximum())
+            scroll_bar.setValue(value)
+            table.viewport().repaint()
+        app.processEvents()
+        scroll_times.append(time.perf_counter() - start)
+        pages = max(scroll_bar.maximum() // max(scroll_bar.pageStep(), 1), 1)
+        editor.deleteLater()
+        app.processEvents()
+
+    print(f"{row_count} rows, best of {repeat}")
+    print(f"{'open':>8}: {min(open_times) * 1000:.1f}ms")
+    print(
+        f"{'scroll':>8}: {min(scroll_times) * 1000:.1f}ms for {pages} pages,"
+        f" {min(scroll_times) / pages * 1000:.2f}ms per page"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=50)
+    parser.add_argument("--settings-per-node", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.depth, args.settings_per_node, args.repeat)
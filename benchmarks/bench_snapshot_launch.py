@@ -0,0 +1,62 @@
+# Time a farm node spends preparing the environment of a preset launch: loading
+# the config directory and resolving the preset, against looking up the preset's
+# frozen snapshot. The config directory cache is warm in both cases, the way it
+# is after the first launch on a node. Runs from the repository root:
+#
+#   python -m benchmarks.bench_snapshot_launch
+import argparse
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import build_studio
+from rez_wg_config_launcher_demo import resolver, store
+from rez_wg_config_launcher_demo.snapshot import SnapshotStore, launch_environment
+
+
+def run(projects: int, settings_per_node: int, launches: int):
+    root, project_list = build_studio(
+        project_count=projects,
+        presets_per_project=10,
+        settings_per_node=settings_per_node,
+    )
+    project = project_list[-1]
+    preset = project.presets[-1]
+    with tempfile.TemporaryDirectory() as directory:
+        config_dir = f"{directory}/config"
+        store.save(config_dir, root, project_list)
+        snapshots = SnapshotStore(f"{directory}/snapshots")
+        snapshots.freeze(preset, project.name)
+        # Fills the config directory cache.
+        store.load(config_dir)
+
+        resolved_times = []
+        for _ in range(launches):
+            start = time.perf_counter()
+            _, loaded_projects = store.load(config_dir)
+            loaded = next(p for p in loaded_projects if p.name == project.name)
+            loaded_preset = next(p for p in loaded.presets if p.name == preset.name)
+            environment = dict(resolver.resolve(loaded_preset).environment)
+            resolved_times.append(time.perf_counter() - start)
+
+        snapshot_times = []
+        for _ in range(launches):
+            start = time.perf_counter()
+            snapshot = snapshots.lookup(project.name, preset.name)
+            launch_environment(snapshot, {})
+            snapshot_times.append(time.perf_counter() - start)
+
+    assert snapshot.environment == environment
+    node_count = sum(1 for _ in root.child_generator())
+    print(f"{node_count} configurations, median of {launches} launches")
+    for label, times in [("resolved", resolved_times), ("snapshot", snapshot_times)]:
+        print(f"{label:>10}: {statistics.median(times) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--settings-per-node", type=int, default=10)
+    parser.add_argument("--launches", type=int, default=20)
+    args = parser.parse_args()
+    run(args.projects, args.settings_per_node, args.launches)
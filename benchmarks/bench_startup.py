@@ -0,0 +1,120 @@
+# Launcher cold start: import time of the headless modules and the time from
+# starting a process to the launcher's first paint, each in fresh processes on
+# the offscreen platform. Also checks that the headless modules
+# never import Qt and that starting the launcher does not build the editors.
+# Exits non-zero when a check fails or a median exceeds its limit, so it can
+# guard against regressions. Runs from the repository root:
+#
+#   python -m benchmarks.bench_startup
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Must not pull in Qt, `resolve` and scripting use them without a display.
+HEADLESS_MODULES = [
+    "rez_wg_config_launcher_demo.data_model",
+    "rez_wg_config_launcher_demo.resolver",
+    "rez_wg_config_launcher_demo.batch",
+    "rez_wg_config_launcher_demo.store",
+    "rez_wg_config_launcher_demo.search",
+    "rez_wg_config_launcher_demo.rez_resolve",
+    "rez_wg_config_launcher_demo.instrumentation",
+    "rez_wg_config_launcher_demo.snapshot",
+    "rez_wg_config_launcher_demo.diff",
+    "rez_wg_config_launcher_demo.cli",
+]
+QT_MODULES = ("qtpy", "PySide6", "PySide2", "PyQt5", "PyQt6")
+
+
+def _child_import(module: str):
+    start = time.perf_counter()
+    __import__(module)
+    elapsed = time.perf_counter() - start
+    qt_loaded = any(name in sys.modules for name in QT_MODULES)
+    print(json.dumps({"seconds": elapsed, "qt": qt_loaded}))
+
+
+def _child_first_paint(started: float):
+    from qtpy import QtCore, QtWidgets
+
+    from rez_wg_config_launcher_demo import demo_data, view
+
+    class PaintWatcher(QtCore.QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QtCore.QEvent.Type.Paint and self.painted is None:
+                self.painted = time.time()
+                QtCore.QTimer.singleShot(0, app.quit)
+            return False
+
+    app = QtWidgets.QApplication([])
+    root = demo_data.create_config_data()
+    launcher = view.AppLauncher(demo_data.create_project_data(root), root)
+    watcher = PaintWatcher()
+    watcher.painted = None
+    launcher.installEventFilter(watcher)
+    launcher.show()
+    app.exec_()
+    editors_built = launcher._config_editor is not None
+    print(json.dumps({"seconds": watcher.painted - started, "editors": editors_built}))
+    sys.stdout.flush()
+    # The result is out, skip tearing Qt down with the interpreter.
+    os._exit(0)
+
+
+def _run_child(*arguments: str) -> dict:
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", *arguments],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat: int, max_import_ms: float, max_first_paint_ms: float) -> int:
+    failures = []
+    for module in HEADLESS_MODULES:
+        results = [_run_child("import", module) for _ in range(repeat)]
+        median = statistics.median(result["seconds"] for result in results) * 1000
+        print(f"{module.rsplit('.', 1)[-1]:>14}: import {median:.1f}ms")
+        if any(result["qt"] for result in results):
+            failures.append(f"{module} imports Qt")
+        if median > max_import_ms:
+            failures.append(f"{module} import {median:.1f}ms > {max_import_ms}ms")
+
+    results = []
+    for _ in range(repeat):
+        results.append(_run_child("first-paint", repr(time.time())))
+    median = statistics.median(result["seconds"] for result in results) * 1000
+    print(f"{'first paint':>14}: {median:.1f}ms after starting the process")
+    if any(result["editors"] for result in results):
+        failures.append("the launcher built the config editor on startup")
+    if median > max_first_paint_ms:
+        failures.append(f"first paint {median:.1f}ms > {max_first_paint_ms}ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=150)
+    parser.add_argument("--max-first-paint-ms", type=float, default=1500)
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        kind, argument = args.child
+        if kind == "import":
+            _child_import(argument)
+        else:
+            _child_first_paint(float(argument))
+    else:
+        sys.exit(run(args.repeat, args.max_import_ms, args.max_first_paint_ms))
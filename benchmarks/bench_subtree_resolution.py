@@ -0,0 +1,51 @@
+# Time and memory to resolve the settings of every configuration and preset of
+# a synthetic studio, as the config editor and batch tools do when walking a
+# subtree. Memory is what the resolved settings caches hold afterwards, measured
+# with tracemalloc. Runs from the repository root:
+#
+#   python -m benchmarks.bench_subtree_resolution
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.synthetic import build_studio
+
+
+def run(projects: int, sequences_per_project: int, settings_per_node: int):
+    for label, method in [
+        ("lists", "get_all_configuration_settings"),
+        ("layers", "get_resolved_settings"),
+    ]:
+        # A fresh tree per run, so neither finds the other's caches.
+        root, project_list = build_studio(
+            project_count=projects,
+            sequences_per_project=sequences_per_project,
+            settings_per_node=settings_per_node,
+        )
+        holders = list(root.child_generator())
+        holders.extend(preset for project in project_list for preset in project.presets)
+        gc.collect()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        setting_count = 0
+        for holder in holders:
+            setting_count += len(getattr(holder, method)())
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        cached, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{label:>8}: {elapsed * 1000:.0f}ms for {len(holders)} holders,"
+            f" {setting_count} resolved settings, {cached / 2**20:.1f}MiB cached"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--sequences-per-project", type=int, default=10)
+    parser.add_argument("--settings-per-node", type=int, default=20)
+    args = parser.parse_args()
+    run(args.projects, args.sequences_per_project, args.settings_per_node)
@@ -0,0 +1,125 @@
+# Time to import a show-shaped tree of --nodes configurations (sequences of
+# shots, each inheriting one of the studio's applications and setting a few
+# variables and packages) into an existing studio: one data model call per
+# mutation, against collecting them in a Transaction. Runs without listeners
+# and with a SettingsIndex kept up to date through the change listeners, best
+# of --repeat runs. Runs from the repository root:
+#
+#   python -m benchmarks.bench_transaction
+import argparse
+import gc
+import time
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    EnvVarAction,
+    Transaction,
+)
+from rez_wg_config_launcher_demo.search import SettingsIndex
+
+APPLICATION_COUNT = 10
+SHOTS_PER_SEQUENCE = 100
+
+
+def create_studio() -> tuple[Configuration, list[Configuration]]:
+    root = Configuration("root")
+    studio = Configuration("studio").set_parent_configuration(root)
+    studio.add_env_var("REZ_PACKAGES_PATH", "/studio/packages", EnvVarAction.SET)
+    applications = [
+        Configuration(f"app_{a}")
+        .set_parent_configuration(studio)
+        .add_tool(f"app_{a}")
+        .add_package_requirement(f"app_{a}", "~=1.0")
+        for a in range(APPLICATION_COUNT)
+    ]
+    return root, applications
+
+
+def build_per_call(root: Configuration, applications: list[Configuration], nodes: int):
+    show = (
+        Configuration("show")
+        .set_parent_configuration(root.get_child_by_name("studio"))
+        .add_env_var("SHOW", "show", EnvVarAction.SET)
+    )
+    for q in range(nodes // (SHOTS_PER_SEQUENCE + 1)):
+        sequence = (
+            Configuration(f"seq_{q}")
+            .set_parent_configuration(show)
+            .add_env_var("SEQUENCE", f"seq_{q}", EnvVarAction.SET)
+        )
+        for s in range(SHOTS_PER_SEQUENCE):
+            (
+                Configuration(f"seq_{q}_shot_{s}")
+                .set_parent_configuration(sequence)
+                .add_inheriting_configuration(applications[s % APPLICATION_COUNT])
+                .add_env_var("SHOT", f"shot_{s}", EnvVarAction.SET)
+                .add_env_var("SHOT_PATH", f"/shows/seq_{q}/{s}", EnvVarAction.PREPEND)
+                .add_package_requirement(f"shot_tools_{s % 20}", "~=2.0")
+            )
+
+
+def build_transaction(
+    root: Configuration, applications: list[Configuration], nodes: int
+):
+    with Transaction(root) as transaction:
+        show = transaction.add_configuration("show", root.get_child_by_name("studio"))
+        transaction.add_env_var(show, "SHOW", "show", EnvVarAction.SET)
+        for q in range(nodes // (SHOTS_PER_SEQUENCE + 1)):
+            sequence = transaction.add_configuration(f"seq_{q}", show)
+            transaction.add_env_var(sequence, "SEQUENCE", f"seq_{q}", EnvVarAction.SET)
+            for s in range(SHOTS_PER_SEQUENCE):
+                shot = transaction.add_configuration(
+                    f"seq_{q}_shot_{s}",
+                    sequence,
+                    inherits=[applications[s % APPLICATION_COUNT]],
+                )
+                (
+                    transaction.add_env_var(
+                        shot, "SHOT", f"shot_{s}", EnvVarAction.SET
+                    )
+                    .add_env_var(
+                        shot, "SHOT_PATH", f"/shows/seq_{q}/{s}", EnvVarAction.PREPEND
+                    )
+                    .add_package_requirement(shot, f"shot_tools_{s % 20}", "~=2.0")
+                )
+
+
+def run(nodes: int, repeat: int):
+    results = {}
+    for indexed in (False, True):
+        for label, build in [
+            ("per call", build_per_call),
+            ("transaction", build_transaction),
+        ]:
+            times = []
+            for _ in range(repeat):
+                root, applications = create_studio()
+                index = SettingsIndex(root) if indexed else None
+                # The previous tree is only freed by the cycle collector.
+                gc.collect()
+                start = time.perf_counter()
+                build(root, applications, nodes)
+                times.append(time.perf_counter() - start)
+                if index is not None:
+                    index.close()
+            # Both end up with the same tree and the same resolved settings.
+            last = list(root.child_generator())[-1]
+            results[(indexed, label)] = (
+                sum(1 for _ in root.child_generator()),
+                last.path,
+                [repr(s.setting) for s in last.get_resolved_settings()],
+                len(index.find("shot")) if index is not None else None,
+            )
+            print(
+                f"{label:>12}{' + index' if indexed else '':>8}:"
+                f" {min(times) * 1000:.0f}ms for {results[(indexed, label)][0]} nodes"
+            )
+        assert results[(indexed, "per call")] == results[(indexed, "transaction")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.nodes, args.repeat)
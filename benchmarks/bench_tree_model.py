@@ -0,0 +1,114 @@
+# Throughput of the TreeConfigurationModel calls Qt makes while painting and
+# scrolling (index, parent, rowCount) on a wide synthetic tree, with row
+# positions cached on the configurations versus looked up in the parent's
+# children list. Runs headless, from the repository root:
+#
+#   python -m benchmarks.bench_tree_model
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy import QtCore
+
+from rez_wg_config_launcher_demo.data_model import Configuration
+from rez_wg_config_launcher_demo.ui_model import TreeConfigurationModel
+
+
+class LinearRowTreeConfigurationModel(TreeConfigurationModel):
+    # parent() as it was before rows were cached.
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parentItem = index.internalPointer().parent
+        if parentItem is self._rootItem:
+            return QtCore.QModelIndex()
+        return self.createIndex(parentItem.parent.children.index(parentItem), 0, parentItem)
+
+
+def build_tree(shows: int, sequences: int, shots: int) -> Configuration:
+    # root -> shows -> sequences -> shots. parent() of a shot needs the row of
+    # its sequence among thousands of siblings.
+    root = Configuration("root")
+    for show in range(shows):
+        show_node = Configuration(f"show_{show}").set_parent_configuration(root)
+        for sequence in range(sequences):
+            sequence_node = Configuration(
+                f"show_{show}_seq_{sequence}"
+            ).set_parent_configuration(show_node)
+            for shot in range(shots):
+                Configuration(
+                    f"show_{show}_seq_{sequence}_shot_{shot}"
+                ).set_parent_configuration(sequence_node)
+    return root
+
+
+def fetch_all(model: TreeConfigurationModel) -> list[QtCore.QModelIndex]:
+    indexes = []
+    stack = [QtCore.QModelIndex()]
+    while stack:
+        parent = stack.pop()
+        while model.has_more_rows(parent):
+            model.fetch_more_rows(parent)
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            indexes.append(index)
+            stack.append(index)
+    return indexes
+
+
+def measure(model: TreeConfigurationModel, indexes: list[QtCore.QModelIndex], repeat: int):
+    parents = [model.parent(index) for index in indexes]
+    rows = [index.row() for index in indexes]
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for row, parent in zip(rows, parents):
+            model.index(row, 0, parent)
+    results["index"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for index in indexes:
+            model.parent(index)
+    results["parent"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for index in indexes:
+            model.rowCount(index)
+    results["rowCount"] = time.perf_counter() - start
+    return results
+
+
+def run(shows: int, sequences: int, shots: int, repeat: int):
+    root = build_tree(shows, sequences, shots)
+    node_count = sum(1 for _ in root.child_generator(root=False))
+    print(f"{node_count} nodes, {repeat} pass(es) over every row")
+
+    for label, model_class in [
+        ("linear rows", LinearRowTreeConfigurationModel),
+        ("cached rows", TreeConfigurationModel),
+    ]:
+        model = model_class(root, max_fetched_rows=node_count)
+        model.fetch_batch_size = node_count
+        indexes = fetch_all(model)
+        results = measure(model, indexes, repeat)
+        calls = len(indexes) * repeat
+        summary = ", ".join(
+            f"{name} {calls / elapsed / 1e6:.2f}M/s" for name, elapsed in results.items()
+        )
+        print(f"{label:>12}: {summary}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shows", type=int, default=10)
+    parser.add_argument("--sequences", type=int, default=1000)
+    parser.add_argument("--shots", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    app = QtCore.QCoreApplication([])
+    run(args.shows, args.sequences, args.shots, args.repeat)
@@ -0,0 +1,344 @@
+# Scaling suite: times tree construction, name lookups, preset resolution and
+# Qt model traversal, and measures memory, on generated studios of each shape
+# in benchmarks.synthetic.SHAPES. Results are compared against the stored
+# baseline (benchmarks/baseline.json) and the run exits non-zero when a metric
+# regressed by more than the tolerance. Timings are the CPU time of the best of
+# --repeat runs. Baselines are machine specific, record one with
+# --update-baseline before comparing on a new machine. Every scenario runs in
+# its own process, a scenario that crashes (e.g. a Qt binding aborting the
+# interpreter) is reported as failed and the others still run. Runs from the
+# repository root:
+#
+#   python -m benchmarks.suite
+#   python -m benchmarks.suite --shape large --output results.json
+#   python -m benchmarks.suite --update-baseline
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from benchmarks.synthetic import SHAPES, StudioShape, build_shaped_studio
+from rez_wg_config_launcher_demo import resolver
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Created by the Qt scenario when nothing else did, kept for the whole run.
+_qt_application = None
+
+
+def scenario_construction(shape: StudioShape) -> dict[str, float]:
+    start = time.process_time()
+    build_shaped_studio(shape)
+    return {"seconds": time.process_time() - start}
+
+
+def scenario_get_child_by_name(shape: StudioShape) -> dict[str, float]:
+    root, _ = build_shaped_studio(shape)
+    configurations = list(root.child_generator())
+    rng = random.Random(shape.seed)
+    names = [rng.choice(configurations).name for _ in range(100_000)]
+    project = root.get_child_by_path("studio/projects/project_0")
+
+    start = time.process_time()
+    for name in names:
+        root.get_child_by_name(name)
+    from_root = time.process_time() - start
+    # Mostly misses, the subtree check has to walk up from each match.
+    start = time.process_time()
+    for name in names:
+        project.get_child_by_name(name)
+    from_subtree = time.process_time() - start
+    return {"root_seconds": from_root, "subtree_seconds": from_subtree}
+
+
+def scenario_preset_resolution(shape: StudioShape) -> dict[str, float]:
+    _, projects = build_shaped_studio(shape)
+    presets = [preset for project in projects for preset in project.presets]
+
+    start = time.process_time()
+    for preset in presets:
+        resolver.resolve(preset)
+    cold = time.process_time() - start
+    start = time.process_time()
+    for preset in presets:
+        resolver.resolve(preset)
+    warm = time.process_time() - start
+    return {"cold_seconds": cold, "warm_seconds": warm}
+
+
+def scenario_qt_model_traversal(shape: StudioShape) -> dict[str, float]:
+    # Qt is only imported when this scenario runs.
+    from qtpy import QtCore
+
+    from rez_wg_config_launcher_demo.ui_model import TreeConfigurationModel
+
+    global _qt_application
+    if QtCore.QCoreApplication.instance() is None:
+        _qt_application = QtCore.QCoreApplication([])
+    root, _ = build_shaped_studio(shape)
+    node_count = sum(1 for _ in root.child_generator(root=False))
+    model = TreeConfigurationModel(root, max_fetched_rows=node_count)
+    display_role = QtCore.Qt.ItemDataRole.DisplayRole
+
+    # Fetches and visits every row the way a fully expanded view would.
+    start = time.process_time()
+    stack = [QtCore.QModelIndex()]
+    while stack:
+        parent = stack.pop()
+        while model.has_more_rows(parent):
+            model.fetch_more_rows(parent)
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            model.data(index, display_role)
+            model.parent(index)
+            stack.append(index)
+    return {"seconds": time.process_time() - start}
+
+
+def scenario_memory(shape: StudioShape) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    tree = build_shaped_studio(shape)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return {"mib": current / 2**20}
+
+
+SCENARIOS: dict[str, Callable[[StudioShape], dict[str, float]]] = {
+    "construction": scenario_construction,
+    "get_child_by_name": scenario_get_child_by_name,
+    "preset_resolution": scenario_preset_resolution,
+    "qt_model_traversal": scenario_qt_model_traversal,
+    "memory": scenario_memory,
+}
+
+
+def run_scenario(shape: StudioShape, name: str, repeat: int) -> dict[str, float]:
+    runs = []
+    for _ in range(repeat):
+        # Like timeit, collections would only add noise to the timings.
+        gc.collect()
+        gc.disable()
+        try:
+            runs.append(SCENARIOS[name](shape))
+        finally:
+            gc.enable()
+    # The best run of each metric, lower is better for all of them and slower
+    # runs mostly measure other load on the machine.
+    return {metric: min(run[metric] for run in runs) for metric in runs[0]}
+
+
+def run_shape(
+    shape_name: str, scenarios: list[str], repeat: int
+) -> tuple[dict, list[str]]:
+    # The results of the scenarios that completed and a message per scenario
+    # that did not.
+    results = {}
+    failures = []
+    for name in scenarios:
+        metrics, failure = _run_isolated(shape_name, name, repeat)
+        if metrics is None:
+            failures.append(f"{shape_name} {name}: {failure}")
+            print(f"  {name:<36} FAILED ({failure})")
+        else:
+            results[name] = metrics
+    return {"shape": SHAPES[shape_name].to_dict(), "scenarios": results}, failures
+
+
+def _run_isolated(
+    shape_name: str, name: str, repeat: int
+) -> tuple[Optional[dict[str, float]], Optional[str]]:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.suite",
+        "--run-scenario",
+        shape_name,
+        name,
+        "--repeat",
+        str(repeat),
+    ]
+    process = subprocess.run(
+        command,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode < 0:
+        return None, f"crashed with {signal.Signals(-process.returncode).name}"
+    if process.returncode != 0:
+        return None, f"exited with {process.returncode}"
+    try:
+        return json.loads(process.stdout.splitlines()[-1]), None
+    except (IndexError, ValueError):
+        return None, "printed no results"
+
+
+def compare(
+    shape_name: str,
+    result: dict,
+    baseline: dict,
+    tolerance: float,
+    memory_tolerance: float,
+    min_seconds: float,
+) -> list[str]:
+    regressions = []
+    expected = baseline.get("shapes", {}).get(shape_name)
+    if expected is not None and expected["shape"] != result["shape"]:
+        regressions.append(
+            f"{shape_name}: the baseline was recorded for a different shape,"
+            " update it with --update-baseline"
+        )
+        expected = None
+
+    for scenario, metrics in result["scenarios"].items():
+        for metric, value in metrics.items():
+            line = f"  {scenario + '.' + metric:<36} {_format(metric, value):>10}"
+            reference = None
+            if expected is not None:
+                reference = expected["scenarios"].get(scenario, {}).get(metric)
+            if reference is None:
+                print(line)
+                continue
+            limit = memory_tolerance if metric == "mib" else tolerance
+            change = value / reference - 1 if reference else 0.0
+            line += f"  baseline {_format(metric, reference):>10}  {change:+.0%}"
+            if metric != "mib" and reference < min_seconds:
+                # Too short to tell a regression from noise.
+                line += "  (not compared)"
+            elif change > limit:
+                regressions.append(
+                    f"{shape_name} {scenario}.{metric}: {_format(metric, value)}"
+                    f" vs baseline {_format(metric, reference)} ({change:+.0%},"
+                    f" tolerance {limit:.0%})"
+                )
+                line += "  REGRESSION"
+            print(line)
+    return regressions
+
+
+def _format(metric: str, value: float) -> str:
+    if metric == "mib":
+        return f"{value:.1f}MiB"
+    return f"{value * 1000:.1f}ms"
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=sorted(SHAPES),
+        help="Shape(s) to run, small and medium by default",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario(s) to run, all by default",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    # Used by the suite itself, runs one scenario and prints its metrics.
+    parser.add_argument(
+        "--run-scenario",
+        nargs=2,
+        metavar=("SHAPE", "SCENARIO"),
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results of the shapes run as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.4,
+        help="Allowed slowdown of timings relative to the baseline (0.4 = 40%%)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.02,
+        help="Timings whose baseline is shorter than this many seconds are"
+        " reported but not compared",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.05,
+        help="Allowed growth of memory relative to the baseline",
+    )
+    args = parser.parse_args(argv)
+    if args.run_scenario:
+        shape_name, name = args.run_scenario
+        metrics = run_scenario(SHAPES[shape_name], name, args.repeat)
+        print(json.dumps(metrics), flush=True)
+        return 0
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "shapes": {},
+    }
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    regressions = []
+    failures = []
+    for shape_name in args.shape or ["small", "medium"]:
+        print(shape_name, flush=True)
+        result, shape_failures = run_shape(
+            shape_name, args.scenario or list(SCENARIOS), args.repeat
+        )
+        failures.extend(shape_failures)
+        results["shapes"][shape_name] = result
+        regressions.extend(
+            compare(
+                shape_name,
+                result,
+                baseline,
+                args.tolerance,
+                args.memory_tolerance,
+                args.min_time,
+            )
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    if failures:
+        # A baseline missing scenarios would hide their regressions later on.
+        return 1
+    if args.update_baseline:
+        # Shapes that were not run keep their previous baseline.
+        shapes = dict(baseline.get("shapes", {}), **results["shapes"])
+        with open(args.baseline, "w") as file:
+            json.dump(dict(results, shapes=shapes), file, indent=2)
+            file.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,175 @@
+# Synthetic studio-shaped data built through the public data model API.
+from dataclasses import asdict, dataclass
+import random
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    EnvVarAction,
+    Preset,
+    Project,
+)
+
+
+def build_studio(
+    project_count: int = 100,
+    presets_per_project: int = 100,
+    application_count: int = 10,
+    sequences_per_project: int = 10,
+    settings_per_node: int = 10,
+    seed: int = 0,
+) -> tuple[Configuration, list[Project]]:
+    rng = random.Random(seed)
+    root = Configuration("root")
+    studio = Configuration("studio").set_parent_configuration(root)
+    for i in range(settings_per_node):
+        studio.add_env_var(f"STUDIO_VAR_{i}", f"studio_{i}", EnvVarAction.SET)
+    studio.add_env_var("REZ_PACKAGES_PATH", "/studio/packages", EnvVarAction.SET)
+
+    applications_node = Configuration("applications").set_parent_configuration(studio)
+    applications = []
+    for a in range(application_count):
+        application = (
+            Configuration(f"app_{a}")
+            .set_parent_configuration(applications_node)
+            .add_tool(f"app_{a}")
+            .add_icon(f"app_{a}.png")
+        )
+        for i in range(settings_per_node):
+            application.add_package_requirement(f"app_{a}_package_{i}", f"~={i}.0")
+        applications.append(application)
+
+    projects_node = Configuration("projects").set_parent_configuration(studio)
+    projects = []
+    for p in range(project_count):
+        project_config = Configuration(f"project_{p}").set_parent_configuration(
+            projects_node
+        )
+        for i in range(settings_per_node):
+            project_config.add_env_var(f"PROJECT_VAR_{i}", f"p{p}_{i}", EnvVarAction.SET)
+
+        bases = []
+        for a, application in enumerate(applications):
+            project_application = (
+                Configuration(f"project_{p}_app_{a}")
+                .set_parent_configuration(project_config)
+                .add_inheriting_configuration(application)
+                .add_package_requirement(f"app_{a}_package_0", f"~={p}.0")
+            )
+            for s in range(sequences_per_project):
+                sequence = Configuration(
+                    f"project_{p}_app_{a}_seq_{s}"
+                ).set_parent_configuration(project_application)
+                for i in range(settings_per_node):
+                    sequence.add_env_var(
+                        f"SEQ_PATH_{i}", f"/p{p}/seq{s}/{i}", EnvVarAction.PREPEND
+                    )
+                bases.append(sequence)
+
+        project = Project(f"project_{p}", f"p{p}")
+        for n in range(presets_per_project):
+            preset = (
+                Preset(f"preset_{n}", rng.choice(bases))
+                .add_env_var("REZ_PACKAGES_PATH", f"/dev/{n}", EnvVarAction.PREPEND)
+                .add_package_requirement(f"preset_package_{n % 7}", f"~={n}")
+            )
+            project.add_preset(preset)
+        projects.append(project)
+
+    return root, projects
+
+
+# Shape of a generated studio: `projects` subtrees under root/studio/projects,
+# each `depth` levels deep with `fan_out` children per node. A share
+# (`inherits_density`) of the nodes also inherits one of `applications` shared
+# configurations, presets are based on random leaves.
+@dataclass(frozen=True)
+class StudioShape:
+    projects: int = 10
+    depth: int = 3
+    fan_out: int = 4
+    settings_per_node: int = 5
+    inherits_density: float = 0.2
+    presets_per_project: int = 20
+    applications: int = 10
+    seed: int = 0
+
+    @property
+    def nodes_per_project(self) -> int:
+        return sum(self.fan_out**level for level in range(1, self.depth + 1))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+SHAPES = {
+    "small": StudioShape(projects=5, depth=3, fan_out=3, presets_per_project=10),
+    "medium": StudioShape(projects=20, depth=4, fan_out=4, presets_per_project=50),
+    "large": StudioShape(
+        projects=50, depth=5, fan_out=4, settings_per_node=10, presets_per_project=100
+    ),
+}
+
+
+def build_shaped_studio(shape: StudioShape) -> tuple[Configuration, list[Project]]:
+    rng = random.Random(shape.seed)
+    root = Configuration("root")
+    studio = Configuration("studio").set_parent_configuration(root)
+    _add_settings(studio, "studio", shape.settings_per_node)
+
+    applications_node = Configuration("applications").set_parent_configuration(studio)
+    applications = [
+        _add_settings(
+            Configuration(f"app_{a}")
+            .set_parent_configuration(applications_node)
+            .add_tool(f"app_{a}")
+            .add_icon(f"app_{a}.png"),
+            f"app_{a}",
+            shape.settings_per_node,
+        )
+        for a in range(shape.applications)
+    ]
+
+    projects_node = Configuration("projects").set_parent_configuration(studio)
+    projects = []
+    for p in range(shape.projects):
+        project_config = Configuration(f"project_{p}").set_parent_configuration(
+            projects_node
+        )
+        _add_settings(project_config, f"project_{p}", shape.settings_per_node)
+        level = [project_config]
+        for depth in range(1, shape.depth + 1):
+            next_level = []
+            for parent in level:
+                for c in range(shape.fan_out):
+                    node = Configuration(f"{parent.name}_{c}").set_parent_configuration(
+                        parent
+                    )
+                    # Keys repeat across levels, deeper nodes override them.
+                    _add_settings(node, f"level_{depth}", shape.settings_per_node)
+                    if applications and rng.random() < shape.inherits_density:
+                        node.add_inheriting_configuration(rng.choice(applications))
+                    next_level.append(node)
+            level = next_level
+
+        project = Project(f"project_{p}", f"p{p}")
+        for n in range(shape.presets_per_project):
+            project.add_preset(
+                Preset(f"preset_{n}", rng.choice(level))
+                .add_env_var("REZ_PACKAGES_PATH", f"/dev/{n}", EnvVarAction.PREPEND)
+                .add_package_requirement(f"preset_package_{n % 7}", f"~={n}")
+            )
+        projects.append(project)
+
+    return root, projects
+
+
+def _add_settings(
+    configuration: Configuration, prefix: str, count: int
+) -> Configuration:
+    actions = [EnvVarAction.SET, EnvVarAction.APPEND, EnvVarAction.PREPEND]
+    for i in range(count):
+        if i % 3 == 2:
+            configuration.add_package_requirement(f"package_{i}", f"~={i}.0")
+        else:
+            configuration.add_env_var(f"VAR_{i}", f"{prefix}_{i}", actions[i % 3])
+    return configuration
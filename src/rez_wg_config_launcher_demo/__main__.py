@@ -1,3 +1,5 @@
-from rez_wg_config_launcher_demo.main import run
+import sys
 
-run()
\ No newline at end of file
+from rez_wg_config_launcher_demo.cli import main
+
+sys.exit(main())
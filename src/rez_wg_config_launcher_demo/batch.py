@@ -0,0 +1,73 @@
+import os
+from typing import Iterable
+
+from rez_wg_config_launcher_demo.data_model import Configuration, Preset, Project
+from rez_wg_config_launcher_demo.resolver import ResolvedEnvironment, SettingsResolver
+
+
+# Resolves many presets at once. Every configuration is folded at most once per
+# batch and a child whose resolution order extends its parent's starts from a
+# copy of the parent's fold, so shared ancestors such as 'studio' are only ever
+# applied once.
+class BatchResolver:
+    def __init__(self, separator: str = os.pathsep):
+        self.separator = separator
+        self._resolutions: dict[Configuration, SettingsResolver] = {}
+
+    def resolve_configuration(self, configuration: Configuration) -> ResolvedEnvironment:
+        return self._resolve_prefix(configuration).result()
+
+    def resolve_preset(self, preset: Preset) -> ResolvedEnvironment:
+        return (
+            self._resolve_prefix(preset.base_configuration)
+            .copy()
+            .apply_holders((preset,))
+            .result()
+        )
+
+    # Keyed by the project and preset objects, names are not unique.
+    def resolve_projects(
+        self, projects: Iterable[Project]
+    ) -> dict[Project, dict[Preset, ResolvedEnvironment]]:
+        return {
+            project: {preset: self.resolve_preset(preset) for preset in project.presets}
+            for project in projects
+        }
+
+    def _resolve_prefix(self, configuration: Configuration) -> SettingsResolver:
+        resolver = self._resolutions.get(configuration)
+        if resolver is not None:
+            return resolver
+
+        chain: list[Configuration] = []
+        config = configuration
+        while config not in self._resolutions:
+            chain.append(config)
+            if config.parent is None or not _extends_parent(config):
+                break
+            config = config.parent
+
+        for config in reversed(chain):
+            parent = config.parent
+            if parent in self._resolutions and _extends_parent(config):
+                resolver = self._resolutions[parent].copy()  # type: ignore[index]
+                start = len(parent.get_resolution_order())  # type: ignore[union-attr]
+            else:
+                resolver = SettingsResolver(self.separator)
+                start = 0
+            resolver.apply_holders(config.get_resolution_order()[start:])
+            self._resolutions[config] = resolver
+
+        return self._resolutions[configuration]
+
+
+def _extends_parent(configuration: Configuration) -> bool:
+    parent_order = configuration.parent.get_resolution_order()  # type: ignore[union-attr]
+    order = configuration.get_resolution_order()
+    return order[: len(parent_order)] == parent_order
+
+
+def resolve_projects(
+    projects: Iterable[Project], separator: str = os.pathsep
+) -> dict[Project, dict[Preset, ResolvedEnvironment]]:
+    return BatchResolver(separator).resolve_projects(projects)
@@ -0,0 +1,421 @@
+import argparse
+import json
+import sys
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
+
+from rez_wg_config_launcher_demo import demo_data, store
+from rez_wg_config_launcher_demo.data_model import Configuration, Preset, Project
+
+# Modules only some commands need are imported by those commands, every
+# launcher start goes through here.
+if TYPE_CHECKING:
+    from rez_wg_config_launcher_demo.rez_resolve import ResolveCache
+
+
+def _select_projects(
+    projects: list[Project], project_names: Optional[list[str]], resolve_all: bool
+) -> list[Project]:
+    if resolve_all or not project_names:
+        return projects
+    by_name = {project.name: project for project in projects}
+    missing = [name for name in project_names if name not in by_name]
+    if missing:
+        raise SystemExit(f"Unknown project(s): {', '.join(missing)}")
+    return [by_name[name] for name in project_names]
+
+
+def _by_name(items: Iterable[tuple[Union[Project, Preset], Any]]) -> dict[str, Any]:
+    # Results are printed keyed by name, a name that is used again gets a
+    # counter so neither result is dropped.
+    named: dict[str, Any] = {}
+    for item, value in items:
+        name = item.name
+        count = 1
+        while name in named:
+            count += 1
+            name = f"{item.name} ({count})"
+        named[name] = value
+    return named
+
+
+def load_data(config_dir: Optional[str]) -> tuple[Configuration, list[Project]]:
+    if config_dir:
+        return store.load(config_dir)
+    root = demo_data.create_config_data()
+    return root, demo_data.create_project_data(root)
+
+
+def resolve_command(args: argparse.Namespace) -> int:
+    root, projects = load_data(args.config_dir)
+    projects = _select_projects(projects, args.project, args.all)
+    if args.jobs > 1:
+        from rez_wg_config_launcher_demo.parallel import resolve_projects_parallel
+
+        resolved_projects = resolve_projects_parallel(
+            root, projects, max_workers=args.jobs
+        )
+    else:
+        from rez_wg_config_launcher_demo.batch import BatchResolver
+
+        resolved_projects = {
+            project: {preset: resolved.to_dict() for preset, resolved in presets.items()}
+            for project, presets in BatchResolver().resolve_projects(projects).items()
+        }
+    results = _by_name(
+        (project, _by_name(presets.items()))
+        for project, presets in resolved_projects.items()
+    )
+
+    resolve_cache = create_resolve_cache(args)
+    if resolve_cache is not None:
+        from rez_wg_config_launcher_demo.rez_resolve import PackageResolveError
+
+        for presets in results.values():
+            for resolved in presets.values():
+                try:
+                    context = resolve_cache.resolve(resolved["packages"])
+                    resolved["context"] = context.to_dict()
+                except PackageResolveError as error:
+                    resolved["context"] = {"error": str(error)}
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    for project_name, presets in results.items():
+        print(project_name)
+        for preset_name, resolved in presets.items():
+            print(f"  {preset_name}")
+            print(f"    packages: {' '.join(resolved['packages'])}")
+            if "context" in resolved:
+                context = resolved["context"]
+                if "error" in context:
+                    print(f"    resolve failed: {context['error']}")
+                else:
+                    resolved_packages = " ".join(
+                        f"{package['name']}-{package['version']}"
+                        for package in context["packages"]
+                    )
+                    print(f"    resolved: {resolved_packages}")
+            for key, value in resolved["environment"].items():
+                print(f"    {key}={value}")
+    return 0
+
+
+def export_demo_command(args: argparse.Namespace) -> int:
+    root = demo_data.create_config_data()
+    store.save(args.directory, root, demo_data.create_project_data(root))
+    return 0
+
+
+def export_demo_packages_command(args: argparse.Namespace) -> int:
+    from rez_wg_config_launcher_demo.rez_resolve import write_package_repository
+
+    write_package_repository(args.directory, demo_data.create_package_repository_data())
+    return 0
+
+
+def snapshot_command(args: argparse.Namespace) -> int:
+    from rez_wg_config_launcher_demo.rez_resolve import PackageResolveError
+    from rez_wg_config_launcher_demo.snapshot import SnapshotStore
+
+    root, projects = load_data(args.config_dir)
+    projects = _select_projects(projects, args.project, args.all)
+    snapshots = SnapshotStore(
+        args.snapshot_dir, resolve_cache=create_resolve_cache(args)
+    )
+    results: dict[str, dict[str, str]] = {}
+    failed = False
+    for project in projects:
+        for preset in project.presets:
+            if args.preset and preset.name not in args.preset:
+                continue
+            try:
+                fingerprint = snapshots.freeze(preset, project.name).fingerprint
+            except PackageResolveError as error:
+                print(f"{project.name} / {preset.name}: {error}", file=sys.stderr)
+                failed = True
+                continue
+            results.setdefault(project.name, {})[preset.name] = fingerprint
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for project_name, presets in results.items():
+            print(project_name)
+            for preset_name, fingerprint in presets.items():
+                print(f"  {preset_name}: {fingerprint}")
+        stats = snapshots.stats
+        print(
+            f"{stats.hits + stats.misses} snapshot(s), {stats.misses} resolved,"
+            f" {stats.hits} unchanged",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
+def launch_command(args: argparse.Namespace) -> int:
+    from rez_wg_config_launcher_demo.snapshot import (
+        LaunchSnapshot,
+        SnapshotError,
+        SnapshotStore,
+        launch,
+    )
+
+    snapshots = SnapshotStore(
+        args.snapshot_dir, resolve_cache=create_resolve_cache(args)
+    )
+    try:
+        snapshot: Optional[LaunchSnapshot]
+        if args.snapshot:
+            snapshot = snapshots.load(args.snapshot)
+        else:
+            if not args.project or not args.preset:
+                raise SystemExit("launch needs --snapshot or --project and --preset")
+            snapshot = None
+            if not args.verify:
+                # The fast path, no configuration is loaded or resolved.
+                snapshot = snapshots.lookup(args.project, args.preset)
+            if snapshot is None:
+                # Never frozen, or checked against the configurations: only
+                # resolved again when a contributing setting changed.
+                _, projects = load_data(args.config_dir)
+                project = _select_projects(projects, [args.project], False)[0]
+                presets = [p for p in project.presets if p.name == args.preset]
+                if not presets:
+                    raise SystemExit(f"Unknown preset '{args.preset}'")
+                snapshot = snapshots.freeze(presets[0], project.name)
+
+        command = args.arguments
+        if command and command[0] == "--":
+            command = command[1:]
+        process = launch(snapshot, command)
+    except (SnapshotError, OSError) as error:
+        raise SystemExit(str(error))
+    return process.wait()
+
+
+def _find_holder(
+    root: Configuration, projects: list[Project], name: str
+) -> Union[Configuration, Preset]:
+    # "<project>/<preset>", or a configuration name or path.
+    project_name, _, preset_name = name.partition("/")
+    for project in projects:
+        if project.name == project_name:
+            for preset in project.presets:
+                if preset.name == preset_name:
+                    return preset
+    configuration = root.get_child_by_name(name) or root.get_child_by_path(name)
+    if configuration is None:
+        raise SystemExit(f"No preset or configuration named '{name}'")
+    return configuration
+
+
+def diff_command(args: argparse.Namespace) -> int:
+    from rez_wg_config_launcher_demo.diff import diff
+
+    root, projects = load_data(args.config_dir)
+    left = _find_holder(root, projects, args.left)
+    right = _find_holder(root, projects, args.right)
+    result = diff(left, right)
+    if args.json:
+        json.dump(result.to_dict(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    common_ancestor = result.common_ancestor
+    if common_ancestor is not None:
+        print(
+            f"common ancestor: {common_ancestor.name}"
+            f" ({len(result.common_holders)} shared)"
+        )
+    markers = {"ADDED": "+", "REMOVED": "-", "OVERRIDDEN": "~"}
+    for difference in result.differences:
+        print(f"{markers[difference.kind.name]} {difference.type}: {difference.key}")
+        for side, value, provenance in [
+            (left.name, difference.left_value, difference.left_provenance),
+            (right.name, difference.right_value, difference.right_provenance),
+        ]:
+            holders = ", ".join(
+                config_setting.configuration.name for config_setting in provenance
+            )
+            print(f"    {side}: {value if value is not None else '(unset)'}", end="")
+            print(f"  [{holders}]" if holders else "")
+    return 0
+
+
+def create_resolve_cache(args: argparse.Namespace) -> Optional["ResolveCache"]:
+    if not args.packages_path:
+        return None
+    from rez_wg_config_launcher_demo.rez_resolve import (
+        LocalPackageRepository,
+        ResolveCache,
+    )
+
+    return ResolveCache(
+        LocalPackageRepository(args.packages_path), directory=args.resolve_cache_dir
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="rez_wg_config_launcher_demo")
+    parser.add_argument(
+        "--config-dir",
+        help="Load configurations and projects from this directory"
+        " instead of the built-in demo data",
+    )
+    parser.add_argument(
+        "--packages-path",
+        action="append",
+        help="Resolve package requests against this local package repository,"
+        " caching the results (can be given more than once)",
+    )
+    parser.add_argument(
+        "--resolve-cache-dir",
+        help="Where resolved contexts are cached"
+        " (defaults to ~/.cache/rez_wg_config_launcher_demo/resolves)",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        help="Where launch snapshots are stored"
+        " (defaults to ~/.cache/rez_wg_config_launcher_demo/snapshots)",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record resolution and Qt model call timings from startup, as the"
+        " launcher's Diagnostics panel shows them",
+    )
+    parser.add_argument(
+        "--instrument-json",
+        metavar="PATH",
+        help="Write call counts, latencies and chain depths to this JSON file on"
+        " exit (implies --instrument)",
+    )
+    parser.add_argument(
+        "--instrument-trace",
+        metavar="PATH",
+        help="Write a Chrome trace (chrome://tracing, Perfetto) of the recorded"
+        " calls to this file on exit (implies --instrument)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    resolve_parser = subparsers.add_parser(
+        "resolve", help="Resolve presets without starting the UI"
+    )
+    resolve_parser.add_argument(
+        "--all", action="store_true", help="Resolve every preset of every project"
+    )
+    resolve_parser.add_argument(
+        "--project", action="append", help="Only resolve the given project(s)"
+    )
+    resolve_parser.add_argument("--json", action="store_true", help="Output JSON")
+    resolve_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Resolve projects across this many worker processes",
+    )
+    resolve_parser.set_defaults(func=resolve_command)
+
+    diff_parser = subparsers.add_parser(
+        "diff",
+        help="Show how the resolved settings of two presets or configurations differ",
+    )
+    diff_parser.add_argument(
+        "left", help="'<project>/<preset>', or a configuration name or path"
+    )
+    diff_parser.add_argument("right", help="Compared against the left one")
+    diff_parser.add_argument("--json", action="store_true", help="Output JSON")
+    diff_parser.set_defaults(func=diff_command)
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="Freeze the resolved launch environment of presets into snapshots",
+    )
+    snapshot_parser.add_argument(
+        "--all", action="store_true", help="Freeze every preset of every project"
+    )
+    snapshot_parser.add_argument(
+        "--project", action="append", help="Only freeze the given project(s)"
+    )
+    snapshot_parser.add_argument(
+        "--preset", action="append", help="Only freeze the given preset(s)"
+    )
+    snapshot_parser.add_argument(
+        "--json", action="store_true", help="Output the fingerprints as JSON"
+    )
+    snapshot_parser.set_defaults(func=snapshot_command)
+
+    launch_parser = subparsers.add_parser(
+        "launch",
+        help="Start a preset's tool from its snapshot, without resolving",
+    )
+    launch_parser.add_argument("--project", help="Project of the preset")
+    launch_parser.add_argument("--preset", help="Preset to launch")
+    launch_parser.add_argument(
+        "--snapshot", metavar="PATH", help="Launch from this snapshot file instead"
+    )
+    launch_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the snapshot against the configurations first and freeze"
+        " it again if they changed",
+    )
+    launch_parser.add_argument(
+        "arguments",
+        metavar="command",
+        nargs=argparse.REMAINDER,
+        help="Command to run after '--', defaults to the preset's first tool",
+    )
+    launch_parser.set_defaults(func=launch_command)
+
+    export_parser = subparsers.add_parser(
+        "export-demo", help="Write the built-in demo data as a config directory"
+    )
+    export_parser.add_argument("directory")
+    export_parser.set_defaults(func=export_demo_command)
+
+    export_packages_parser = subparsers.add_parser(
+        "export-demo-packages",
+        help="Write a local package repository the demo presets resolve against",
+    )
+    export_packages_parser.add_argument("directory")
+    export_packages_parser.set_defaults(func=export_demo_packages_command)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    instrument = args.instrument or args.instrument_json or args.instrument_trace
+    if args.command is None:
+        # Only the UI needs Qt, keep it out of the headless commands.
+        from rez_wg_config_launcher_demo.main import run
+
+        if instrument:
+            # After the UI modules are imported, so the Qt models are covered.
+            _enable_instrumentation()
+        run(args.config_dir, create_resolve_cache(args))
+        result = 0
+    else:
+        if instrument:
+            _enable_instrumentation()
+        result = args.func(args)
+
+    if instrument:
+        from rez_wg_config_launcher_demo.instrumentation import instrumentation
+
+        # Worker processes (--jobs) are not instrumented, only this process.
+        if args.instrument_json:
+            instrumentation.write_json(args.instrument_json)
+        if args.instrument_trace:
+            instrumentation.write_chrome_trace(args.instrument_trace)
+    return result
+
+
+def _enable_instrumentation():
+    from rez_wg_config_launcher_demo.instrumentation import instrumentation
+
+    instrumentation.enable()
@@ -1,8 +1,224 @@
-from rez_wg_config_launcher_demo.data_model import Configuration
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+from rez_wg_config_launcher_demo.data_model import Configuration, Preset
 from rez_wg_config_launcher_demo import ui_model
+from rez_wg_config_launcher_demo.store import ConfigSource, ConfigStoreError
+from qtpy import QtCore
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from rez_wg_config_launcher_demo.launch import Launch, LaunchEvent, LaunchQueue
 
 
 def create_config_tree_model_from_root_config(
     root: Configuration,
 ) -> ui_model.TreeConfigurationModel:
     return ui_model.TreeConfigurationModel(root)
+
+
+class ConfigSourceWatcher(QtCore.QObject):
+    # Watches a config directory and emits the patches for changed files.
+    # QFileSystemWatcher uses inotify (or the platform's equivalent) where it is
+    # available; paths it cannot watch are covered by polling instead.
+    patchesAvailable = QtCore.Signal(list)
+    reloadFailed = QtCore.Signal(str)
+
+    def __init__(
+        self,
+        source: ConfigSource,
+        poll_interval_ms: int = 2000,
+        debounce_ms: int = 200,
+        parent: QtCore.QObject | None = None,
+    ):
+        super(ConfigSourceWatcher, self).__init__(parent)
+        self.source = source
+
+        # Editors often write several files (or write and rename) in a row,
+        # collapse those into one reload.
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self.reload)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self.reload)
+
+        self._file_system_watcher = QtCore.QFileSystemWatcher(self)
+        self._file_system_watcher.directoryChanged.connect(self._schedule_reload)
+        self._file_system_watcher.fileChanged.connect(self._schedule_reload)
+        self._watch_paths()
+
+    @property
+    def polling(self) -> bool:
+        return self._poll_timer.isActive()
+
+    def _watch_paths(self):
+        watched = set(self._file_system_watcher.files())
+        watched.update(self._file_system_watcher.directories())
+        missing = [path for path in self.source.watched_paths() if path not in watched]
+        if not missing:
+            return
+        failed = self._file_system_watcher.addPaths(missing)
+        if failed and not self._poll_timer.isActive():
+            self._poll_timer.start()
+
+    def _schedule_reload(self, _path: str):
+        self._debounce_timer.start()
+
+    def reload(self):
+        try:
+            patches = self.source.reload()
+        except (ConfigStoreError, OSError, ValueError) as error:
+            self.reloadFailed.emit(str(error))
+            return
+        # Files replaced by a rename drop out of the watcher, and new files and
+        # directories need watching too.
+        self._watch_paths()
+        if patches:
+            self.patchesAvailable.emit(patches)
+
+
+class _SettingsResolveSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, object, object)
+    failed = QtCore.Signal(int, object, str)
+
+
+class _SettingsResolveTask(QtCore.QRunnable):
+    def __init__(
+        self,
+        request_id: int,
+        holder: Union[Configuration, Preset],
+        signals: _SettingsResolveSignals,
+    ):
+        super(_SettingsResolveTask, self).__init__()
+        self.request_id = request_id
+        self.holder = holder
+        self.signals = signals
+
+    def run(self):
+        try:
+            settings = self.holder.get_all_configuration_settings()
+        except Exception as error:
+            self.signals.failed.emit(self.request_id, self.holder, str(error))
+            return
+        self.signals.finished.emit(self.request_id, self.holder, settings)
+
+
+class SettingsResolveQueue(QtCore.QObject):
+    # Resolves settings on a QThreadPool, off the GUI thread. Only one
+    # resolution runs at a time and only the latest request waits behind it,
+    # so rapid selection changes coalesce; results of requests that were
+    # superseded or cancelled in the meantime are dropped.
+    resolved = QtCore.Signal(object, list)
+    resolveFailed = QtCore.Signal(object, str)
+
+    def __init__(
+        self,
+        thread_pool: QtCore.QThreadPool | None = None,
+        parent: QtCore.QObject | None = None,
+    ):
+        super(SettingsResolveQueue, self).__init__(parent)
+        self._thread_pool = thread_pool or QtCore.QThreadPool.globalInstance()
+        self._latest_request = 0
+        self._running = False
+        self._pending: Optional[tuple[int, Union[Configuration, Preset]]] = None
+        # Emitted from pool threads, delivered queued on this object's thread.
+        self._signals = _SettingsResolveSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    @property
+    def busy(self) -> bool:
+        return self._running or self._pending is not None
+
+    def request(self, holder: Union[Configuration, Preset]):
+        self._latest_request += 1
+        self._pending = (self._latest_request, holder)
+        if not self._running:
+            self._start_pending()
+
+    def cancel(self):
+        self._latest_request += 1
+        self._pending = None
+
+    def _start_pending(self):
+        request_id, holder = self._pending  # type: ignore[misc]
+        self._pending = None
+        self._running = True
+        self._thread_pool.start(_SettingsResolveTask(request_id, holder, self._signals))
+
+    def _task_done(self):
+        self._running = False
+        if self._pending is not None:
+            self._start_pending()
+
+    def _on_finished(self, request_id: int, holder, settings):
+        self._task_done()
+        if request_id == self._latest_request:
+            self.resolved.emit(holder, settings)
+
+    def _on_failed(self, request_id: int, holder, message: str):
+        self._task_done()
+        if request_id == self._latest_request:
+            self.resolveFailed.emit(holder, message)
+
+
+class _LaunchSignals(QtCore.QObject):
+    event = QtCore.Signal(object)
+    tools = QtCore.Signal(object, object)
+
+
+class LaunchController(QtCore.QObject):
+    # Bridges a LaunchQueue into the Qt event loop: its events arrive on the
+    # queue's own thread and are re-emitted on this object's thread.
+    # launchChanged carries the launch and the LaunchState it changed to, which
+    # the launch may have left again by the time the signal is delivered;
+    # outputReceived carries the launch, the stream name and a list of lines.
+    # toolsResolved answers request_tools with the preset and its tool names,
+    # toolsFailed with the preset and the error.
+    launchChanged = QtCore.Signal(object, object)
+    outputReceived = QtCore.Signal(object, str, list)
+    toolsResolved = QtCore.Signal(object, list)
+    toolsFailed = QtCore.Signal(object, str)
+
+    def __init__(self, queue: "LaunchQueue", parent: QtCore.QObject | None = None):
+        super(LaunchController, self).__init__(parent)
+        self.queue = queue
+        self._signals = _LaunchSignals(self)
+        self._signals.event.connect(self._on_event)
+        self._signals.tools.connect(self._on_tools)
+        self._listener = self._signals.event.emit
+        queue.add_listener(self._listener)
+
+    def launch(
+        self,
+        preset: Preset,
+        tool: Optional[str] = None,
+        arguments: Sequence[str] = (),
+        command: Optional[Sequence[str]] = None,
+    ) -> "Launch":
+        return self.queue.submit(preset, tool, arguments, command)
+
+    def request_tools(self, preset: Preset):
+        self.queue.resolve_tools(preset).add_done_callback(
+            lambda future: self._signals.tools.emit(preset, future)
+        )
+
+    def shutdown(self):
+        self.queue.remove_listener(self._listener)
+        self.queue.shutdown()
+
+    def _on_event(self, event: "LaunchEvent"):
+        if event.stream is not None:
+            self.outputReceived.emit(event.launch, event.stream, list(event.lines))
+        else:
+            self.launchChanged.emit(event.launch, event.state)
+
+    def _on_tools(self, preset: Preset, future: "Future[list[str]]"):
+        try:
+            tools = future.result()
+        except Exception as error:
+            self.toolsFailed.emit(preset, str(error))
+            return
+        self.toolsResolved.emit(preset, tools)
@@ -1,127 +1,598 @@
 from dataclasses import dataclass, field
 from enum import Enum
+import itertools
 import os
-from typing import Any, Generator, Optional, Self
+import sys
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Self,
+    Sequence,
+)
 import abc
 
 
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+
+# Hit/miss counters of the resolved settings caches, shared by every
+# Configuration and Preset so they can be monitored from one place.
+resolution_cache_stats = CacheStats()
+
+
+class DuplicateConfigurationNameError(ValueError):
+    pass
+
+
+class ConfigurationCycleError(ValueError):
+    pass
+
+
+class ChangeKind(Enum):
+    SETTINGS = 0
+    PARENT = 1
+    INHERITS = 2
+    PRESETS = 3
+    BULK = 4
+
+
+@dataclass(frozen=True)
+class DataModelChange:
+    # `subject` is the Configuration or Preset that changed, or the Project
+    # whose presets did (ChangeKind.PRESETS). A ProjectsPatch sends PRESETS
+    # with the list of projects it replaced the contents of. A committed
+    # Transaction sends one BULK change with its tree's root as subject and the
+    # changes it made in `changes`, see Transaction.
+    subject: Any
+    kind: ChangeKind
+    changes: tuple["DataModelChange", ...] = ()
+
+
+_change_listeners: list[Callable[[DataModelChange], None]] = []
+
+
+# Listeners are called synchronously after every mutation made through the
+# data model API, for example to keep a search index up to date.
+def add_change_listener(listener: Callable[[DataModelChange], None]):
+    _change_listeners.append(listener)
+
+
+def remove_change_listener(listener: Callable[[DataModelChange], None]):
+    _change_listeners.remove(listener)
+
+
+def _notify(
+    subject: Any, kind: ChangeKind, changes: tuple[DataModelChange, ...] = ()
+):
+    if _change_listeners:
+        change = DataModelChange(subject, kind, changes)
+        for listener in list(_change_listeners):
+            listener(change)
+
+
 class EnvVarAction(Enum):
     APPEND = 0
     PREPEND = 1
     SET = 2
 
+    # Members are singletons, the identity hash is valid and, unlike Enum's
+    # default, does not run Python code for every EnvVar hashed.
+    __hash__ = object.__hash__
 
-@dataclass
+
+# Settings are slotted and their strings interned: a studio tree holds hundreds
+# of thousands of them, mostly repeating the same few keys, package names and
+# values.
+@dataclass(frozen=True, slots=True)
 class _Setting:
-    pass
+    type: ClassVar[str]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnvVar(_Setting):
     key: str
     value: str
     action: EnvVarAction
-    type: str = "Environment Variable"
+    type: ClassVar[str] = "Environment Variable"
+
+    def __post_init__(self):
+        object.__setattr__(self, "key", sys.intern(self.key))
+        object.__setattr__(self, "value", sys.intern(self.value))
 
     def __repr__(self) -> str:
         return f"{self.key}: {self.value} ({self.action.name})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PackageRequirement(_Setting):
     package_name: str
     version_specifier: str
-    type: str = "Package Requirement"
+    type: ClassVar[str] = "Package Requirement"
+
+    def __post_init__(self):
+        object.__setattr__(self, "package_name", sys.intern(self.package_name))
+        object.__setattr__(self, "version_specifier", sys.intern(self.version_specifier))
 
     def __repr__(self) -> str:
         return f"{self.package_name}{self.version_specifier}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Icon(_Setting):
     icon: os.PathLike | str
-    type: str = "Icon"
+    type: ClassVar[str] = "Icon"
+
+    def __post_init__(self):
+        if isinstance(self.icon, str):
+            object.__setattr__(self, "icon", sys.intern(self.icon))
 
     def __repr__(self) -> str:
         return f"{self.icon}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Tool(_Setting):
     name: str
-    type: str = "Tool"
+    type: ClassVar[str] = "Tool"
+
+    def __post_init__(self):
+        object.__setattr__(self, "name", sys.intern(self.name))
 
     def __repr__(self) -> str:
         return f"{self.name}"
 
 
-@dataclass
-class _SettingHolder:
+# Default for list fields of configurations and presets that most nodes leave
+# empty. Shared and immutable, the list is only created on first append.
+_NO_ITEMS: tuple = ()
+
+
+@dataclass(eq=False, slots=True)
+class _SettingHolder(abc.ABC):
     name: str
 
     def add_env_var(self, key: str, value: str, action: EnvVarAction):
-        self.settings.append(EnvVar(key, value, action))  # type: ignore[attr-defined]
+        self._add_setting(EnvVar(key, value, action))
         return self
 
     def add_package_requirement(self, package_name: str, version_specifier: str):
-        self.settings.append(PackageRequirement(package_name, version_specifier))  # type: ignore[attr-defined]
+        self._add_setting(PackageRequirement(package_name, version_specifier))
         return self
 
     def add_icon(self, icon: os.PathLike | str):
-        self.settings.append(Icon(icon))  # type: ignore[attr-defined]
+        self._add_setting(Icon(icon))
         return self
 
     def add_tool(self, name: str):
-        self.settings.append(Tool(name))  # type: ignore[attr-defined]
+        self._add_setting(Tool(name))
         return self
 
+    # `settings` is declared by the subclasses, a slotted dataclass base
+    # cannot declare a field with a default before their fields without one.
+    @abc.abstractmethod
+    def set_settings(self, settings: Iterable[_Setting]) -> Self:
+        pass
 
-@dataclass
+    @abc.abstractmethod
+    def _add_setting(self, setting: _Setting):
+        pass
+
+    # Invalidates what was resolved from the holder's settings and notifies
+    # the change listeners.
+    @abc.abstractmethod
+    def _settings_changed(self):
+        pass
+
+
+@dataclass(eq=False, slots=True)
 class Configuration(_SettingHolder):
     parent: Optional[Self] = None
-    children: list[Self] = field(default_factory=lambda: [])
-    inherits: list[Self] = field(default_factory=lambda: [])
-    settings: list[_Setting] = field(default_factory=lambda: [])
+    children: list[Self] = _NO_ITEMS  # type: ignore[assignment]
+    inherits: list[Self] = _NO_ITEMS  # type: ignore[assignment]
+    settings: list[_Setting] = _NO_ITEMS  # type: ignore[assignment]
+    _inherited_by: list[Self] = field(
+        default=_NO_ITEMS, init=False, repr=False  # type: ignore[arg-type]
+    )
+    _generation: int = field(default=0, init=False, repr=False)
+    _resolved_cache: Optional[tuple[int, "ResolvedSettings"]] = field(
+        default=None, init=False, repr=False
+    )
+    # Bumped only when parents or inherits change. The order is stored together
+    # with the structure generation it was computed at, see
+    # `get_resolution_order`.
+    _structure_generation: int = field(default=0, init=False, repr=False)
+    _resolution_order: Optional[tuple[int, tuple[Self, ...]]] = field(
+        default=None, init=False, repr=False
+    )
+    # Only populated on tree roots: name -> node and path -> node for the whole
+    # tree, kept up to date as configurations are attached.
+    _name_index: Optional[dict[str, Self]] = field(default=None, init=False, repr=False)
+    _path_index: Optional[dict[str, Self]] = field(default=None, init=False, repr=False)
+    # Position in parent.children, see `row`.
+    _row: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.parent is None:
+            self._build_index()
 
     def get_all_configuration_settings(self):
-        all_configuration_settings: list[ConfigurationSetting] = []
-        previous_settings: list[_Setting] = []
-        for config in self.parents_inherits_self_generator():
-            for setting in config.settings:
-                if setting not in previous_settings:
-                    previous_settings.append(setting)
-                    all_configuration_settings.append(
-                        ConfigurationSetting(setting, config)
-                    )
-        return all_configuration_settings
+        return self.get_resolved_settings().to_list()
+
+    def get_resolved_settings(self) -> "ResolvedSettings":
+        # Walks up the chain of shared prefixes until a node with valid cached
+        # settings (or the start of the order), then layers each node on top of
+        # the one before. Iterative, so deep trees never hit the recursion
+        # limit.
+        # Generations are read up front: settings may be resolved on a worker
+        # thread while the tree is edited, and a result computed from older
+        # data must not be cached under a newer generation.
+        pending: list[tuple[Configuration, int, tuple[Configuration, ...]]] = []
+        resolved: Optional[ResolvedSettings] = None
+        config: Optional[Configuration] = self
+        while config is not None:
+            generation = config._generation
+            cached = config._resolved_cache
+            if cached is not None and cached[0] == generation:
+                resolution_cache_stats.hits += 1
+                resolved = cached[1]
+                break
+            resolution_cache_stats.misses += 1
+            order = config.get_resolution_order()
+            base, start = config._shared_prefix(order)
+            pending.append((config, generation, order[start:]))
+            config = base
+
+        for config, generation, layer_order in reversed(pending):
+            resolved = ResolvedSettings.layer(resolved, layer_order)
+            if config._generation == generation:
+                config._resolved_cache = (generation, resolved)
+        assert resolved is not None
+        return resolved
+
+    def _shared_prefix(self, order: tuple[Self, ...]) -> tuple[Optional[Self], int]:
+        # The node whose resolution order is the longest proper prefix of this
+        # one and that prefix's length. Its resolved settings are shared rather
+        # than copied. That is the parent unless inherits reorder the chain.
+        for index in range(len(order) - 2, -1, -1):
+            candidate = order[index]
+            candidate_order = candidate._cached_resolution_order()
+            if (
+                candidate_order is not None
+                and len(candidate_order) == index + 1
+                and candidate_order == order[: index + 1]
+            ):
+                return candidate, index + 1
+        return None, 0
+
+    def release_cached_settings(self):
+        # Frees memory held for this node only, nothing is invalidated: the
+        # resolved settings are rebuilt and lazily loaded settings decoded again
+        # the next time they are needed.
+        self._resolved_cache = None
+        release = getattr(self.settings, "release", None)
+        if release is not None:
+            release()
 
     def add_inheriting_configuration(self, inherits: Self):
+        if inherits is self or self in inherits.get_resolution_order():
+            raise ConfigurationCycleError(
+                f"'{self.name}' cannot inherit '{inherits.name}', which resolves through it"
+            )
+        if self.inherits is _NO_ITEMS:
+            self.inherits = []
         self.inherits.append(inherits)
+        inherits._add_inherited_by(self)
+        self._invalidate(structure=True)
+        _notify(self, ChangeKind.INHERITS)
+        return self
+
+    def set_inheriting_configurations(self, inherits: Iterable[Self]):
+        inherits = list(inherits)
+        for inherit in inherits:
+            if inherit is self or self in inherit.get_resolution_order():
+                raise ConfigurationCycleError(
+                    f"'{self.name}' cannot inherit '{inherit.name}', which resolves through it"
+                )
+        for inherit in self.inherits:
+            inherit._inherited_by.remove(self)
+        self.inherits = inherits or _NO_ITEMS  # type: ignore[assignment]
+        for inherit in inherits:
+            inherit._add_inherited_by(self)
+        self._invalidate(structure=True)
+        _notify(self, ChangeKind.INHERITS)
         return self
 
     def add_child_configuration(self, child: Self):
-        self.children.append(child)
-        child.parent = self
+        self._attach_child(child)
+        child._invalidate(structure=True)
+        _notify(child, ChangeKind.PARENT)
         return self
 
     def set_parent_configuration(self, parent: Self):
-        parent.children.append(self)
-        self.parent = parent
+        parent._attach_child(self)
+        self._invalidate(structure=True)
+        _notify(self, ChangeKind.PARENT)
+        return self
+
+    @property
+    def inherited_by(self) -> tuple[Self, ...]:
+        return tuple(self._inherited_by)
+
+    def remove_child_configuration(self, child: Self):
+        if child.parent is not self:
+            raise ValueError(f"'{child.name}' is not a child of '{self.name}'")
+        child._detach_from_parent()
+        child._invalidate(structure=True)
+        _notify(child, ChangeKind.PARENT)
+        return self
+
+    @property
+    def row(self) -> int:
+        # Kept up to date as children are attached and detached. `children` is
+        # a plain list though, so a stale position is looked up and stored
+        # again rather than trusted.
+        parent = self.parent
+        if parent is None:
+            return 0
+        siblings: Sequence[Configuration] = parent.children
+        row = self._row
+        if row >= len(siblings) or siblings[row] is not self:
+            row = self._row = siblings.index(self)
+        return row
+
+    @property
+    def path(self) -> str:
+        names = []
+        config = self
+        while config.parent is not None:
+            names.append(config.name)
+            config = config.parent
+        return "/".join(reversed(names))
+
+    def get_root(self) -> Self:
+        config = self
+        while config.parent is not None:
+            config = config.parent
+        return config
+
+    def _add_inherited_by(self, configuration: Self):
+        if self._inherited_by is _NO_ITEMS:
+            self._inherited_by = []
+        self._inherited_by.append(configuration)
+
+    def _attach_child(self, child: Self):
+        if self._is_descendant_of(child):
+            raise ConfigurationCycleError(
+                f"'{child.name}' cannot become a child of its descendant '{self.name}'"
+            )
+        root = self.get_root()
+        root_names, root_paths = root._indexes()
+        if child.parent is None:
+            subtree: Iterable[Configuration] = child._indexes()[0].values()
+        else:
+            subtree = child.child_generator()
+        for config in subtree:
+            existing = root_names.get(config.name)
+            if existing is not None and existing is not config:
+                raise DuplicateConfigurationNameError(
+                    f"A configuration named '{config.name}' already exists under '{root.name}'"
+                )
+
+        if child.parent is not None:
+            child._detach_from_parent()
+
+        child_names, child_paths = child._indexes()
+        prefix = f"{self.path}/{child.name}" if self.parent else child.name
+        root_names.update(child_names)
+        for relative_path, config in child_paths.items():
+            path = f"{prefix}/{relative_path}" if relative_path else prefix
+            root_paths[path] = config
+        child._name_index = None
+        child._path_index = None
+
+        child._row = len(self.children)
+        if self.children is _NO_ITEMS:
+            self.children = []
+        self.children.append(child)
+        child.parent = self
+
+    def _detach_from_parent(self):
+        # The subtree's entries move from the root's indexes to its own, the
+        # rest of the tree is not scanned.
+        parent = self.parent
+        assert parent is not None
+        root_names, root_paths = self.get_root()._indexes()
+        names: dict[str, Self] = {}
+        paths: dict[str, Self] = {}
+        prefix = self.path
+        stack: list[tuple[str, Self]] = [("", self)]
+        while stack:
+            path, config = stack.pop()
+            root_names.pop(config.name, None)
+            root_paths.pop(f"{prefix}/{path}" if path else prefix, None)
+            names[config.name] = config
+            paths[path] = config
+            for child in config.children:
+                stack.append((f"{path}/{child.name}" if path else child.name, child))
+
+        row = self.row
+        del parent.children[row]
+        for sibling in parent.children[row:]:
+            sibling._row -= 1
+        self.parent = None
+        self._row = 0
+        self._name_index = names
+        self._path_index = paths
+        parent._invalidate(structure=True)
+
+    def _indexes(self) -> tuple[dict[str, Self], dict[str, Self]]:
+        # Only tree roots have them.
+        assert self._name_index is not None and self._path_index is not None
+        return self._name_index, self._path_index
+
+    def _build_index(self):
+        self._name_index = {}
+        self._path_index = {}
+        stack: list[tuple[str, Configuration]] = [("", self)]
+        while stack:
+            path, config = stack.pop()
+            if config.name in self._name_index:
+                raise DuplicateConfigurationNameError(
+                    f"A configuration named '{config.name}' already exists under '{self.name}'"
+                )
+            self._name_index[config.name] = config
+            self._path_index[path] = config
+            for child in config.children:
+                stack.append((f"{path}/{child.name}" if path else child.name, child))
+
+    def set_settings(self, settings: Iterable[_Setting]) -> Self:
+        self.settings = list(settings)
+        self._settings_changed()
         return self
 
+    def _add_setting(self, setting: _Setting):
+        if self.settings is _NO_ITEMS:
+            self.settings = []
+        self.settings.append(setting)
+        self._settings_changed()
+
+    def _settings_changed(self):
+        self._invalidate()
+        _notify(self, ChangeKind.SETTINGS)
+
+    def _invalidate(self, structure: bool = False):
+        _invalidate_all([self], structure)
+
     def parents_inherits_self_generator(
         self, inherit_parents: bool = True, root: bool = True
     ):
-        if self.parent:
-            yield from self.parent.parents_inherits_self_generator(root=False)
-            yield self.parent
+        if inherit_parents:
+            resolution_order = self.get_resolution_order()
+            yield from resolution_order if root else resolution_order[:-1]
+            return
 
-        if root or inherit_parents:
-            for inherit in self.inherits:
-                yield inherit
+        ancestors = []
+        config = self.parent
+        while config is not None:
+            ancestors.append(config)
+            config = config.parent
+        yield from reversed(ancestors)
+        yield from self.inherits
         if root:
             yield self
 
+    def get_resolution_order(self) -> tuple[Self, ...]:
+        cached = self._cached_resolution_order()
+        if cached is not None:
+            return cached
+
+        # Post-order walk over the parent/inherits graph with an explicit stack,
+        # so deep trees never hit the recursion limit. Nodes on the current path
+        # are tracked to detect cycles.
+        # Orders may be computed on a worker thread while the tree is edited.
+        # Each is stored in one assignment together with the structure
+        # generation read before its bases were, so an order computed from
+        # bases that were changed meanwhile is never read back.
+        visiting: set[Configuration] = set()
+        merged: dict[Configuration, tuple[Configuration, ...]] = {}
+        stack: list[tuple[Configuration, bool, int]] = [(self, False, 0)]
+        while stack:
+            config, expanded, generation = stack.pop()
+            if config in merged:
+                continue
+            if expanded:
+                order = config._merge_resolution_orders(merged)
+                merged[config] = order
+                config._resolution_order = (generation, order)
+                visiting.discard(config)
+                continue
+            if config is not self and config._cached_resolution_order() is not None:
+                continue
+
+            visiting.add(config)
+            stack.append((config, True, config._structure_generation))
+            for base in config._bases():
+                if base in visiting:
+                    raise ConfigurationCycleError(
+                        f"'{config.name}' resolves through itself via '{base.name}'"
+                    )
+                if base not in merged and base._cached_resolution_order() is None:
+                    stack.append((base, False, 0))
+        return merged[self]  # type: ignore[return-value]
+
+    def _cached_resolution_order(self) -> Optional[tuple[Self, ...]]:
+        cached = self._resolution_order
+        if cached is not None and cached[0] == self._structure_generation:
+            return cached[1]
+        return None
+
+    def _bases(self) -> list[Self]:
+        # Most specific first: later inherits override earlier ones, and all of
+        # them override the parent.
+        bases = list(reversed(self.inherits))
+        if self.parent is not None:
+            bases.append(self.parent)
+        return bases
+
+    def _merge_resolution_orders(
+        self, known: dict["Configuration", tuple["Configuration", ...]]
+    ) -> tuple["Configuration", ...]:
+        # C3 merge (as used for Python's MRO) of the bases' resolution orders.
+        # Orders are stored least specific first, the merge works on the
+        # reversed sequences. Where the hierarchy is inconsistent the head of
+        # the most specific sequence is taken instead of failing, so an explicit
+        # inherit still overrides settings coming in through the parent.
+        bases = self._bases()
+        sequences = [
+            (known.get(base) or base.get_resolution_order())[::-1] for base in bases
+        ]
+        sequences.append(tuple(bases))
+        positions = [0] * len(sequences)
+        tail_counts: dict[Configuration, int] = {}
+        for sequence in sequences:
+            for config in sequence[1:]:
+                tail_counts[config] = tail_counts.get(config, 0) + 1
+
+        merged: list[Configuration] = [self]
+        emitted: set[Configuration] = {self}
+        while True:
+            heads = [
+                sequence[position]
+                for sequence, position in zip(sequences, positions)
+                if position < len(sequence)
+            ]
+            if not heads:
+                break
+            candidate = next(
+                (head for head in heads if not tail_counts.get(head)), heads[0]
+            )
+            merged.append(candidate)
+            emitted.add(candidate)
+            for index, sequence in enumerate(sequences):
+                position = positions[index]
+                while position < len(sequence) and sequence[position] in emitted:
+                    position += 1
+                    if position < len(sequence):
+                        tail_counts[sequence[position]] -= 1
+                positions[index] = position
+
+        merged.reverse()
+        return tuple(merged)
+
     def child_generator(self, root: bool = True):
         if root:
             yield self
@@ -131,44 +602,214 @@ class Configuration(_SettingHolder):
             yield from child.child_generator(root=False)
 
     def get_child_by_name(self, name: str) -> Optional[Self]:
-        for child in self.child_generator():
-            if child.name == name:
-                return child
-        return None
+        config = self.get_root()._indexes()[0].get(name)
+        if config is None or not config._is_descendant_of(self):
+            return None
+        return config
 
-@dataclass
+    def get_child_by_path(self, path: str) -> Optional[Self]:
+        path = path.strip("/")
+        if self.parent is not None:
+            path = f"{self.path}/{path}" if path else self.path
+        return self.get_root()._indexes()[1].get(path)
+
+    def _is_descendant_of(self, ancestor: Self) -> bool:
+        config: Optional[Configuration] = self
+        while config is not None:
+            if config is ancestor:
+                return True
+            config = config.parent
+        return False
+
+
+def _invalidate_all(configs: Iterable[Configuration], structure: bool = False):
+    # Everything resolving through these nodes is stale: their subtrees and
+    # every configuration inheriting them (and, transitively, their subtrees).
+    seen: set[Configuration] = set()
+    stack: list[Configuration] = list(configs)
+    while stack:
+        config = stack.pop()
+        if config in seen:
+            continue
+        seen.add(config)
+        config._generation += 1
+        config._resolved_cache = None
+        if structure:
+            config._structure_generation += 1
+            config._resolution_order = None
+        stack.extend(config.children)
+        stack.extend(config._inherited_by)
+    resolution_cache_stats.invalidations += len(seen)
+
+
+@dataclass(slots=True)
 class ConfigurationSetting:
     setting: _Setting
     configuration: _SettingHolder
 
 
-@dataclass
+# Resolved settings as a persistent, layered sequence: a layer only holds the
+# settings its holders add on top of a shared base layer, typically the
+# parent's, so resolving a subtree allocates ConfigurationSettings for each
+# node's own settings rather than copies of every ancestor's. Layers are never
+# modified once built.
+class ResolvedSettings:
+    __slots__ = (
+        "base",
+        "own",
+        "holders",
+        "_own_settings",
+        "_all_settings",
+        "_depth",
+        "_length",
+    )
+
+    # Every this many layers one stores all settings of its chain, bounding
+    # membership tests on deep trees.
+    _CHECKPOINT_INTERVAL = 16
+
+    def __init__(
+        self,
+        base: Optional["ResolvedSettings"],
+        own: tuple[ConfigurationSetting, ...],
+        holders: tuple[_SettingHolder, ...] = (),
+    ):
+        self.base = base
+        self.own = own
+        # The holders the layer was made from, `own` skips their settings that
+        # are already in the base.
+        self.holders = holders
+        self._own_settings = frozenset(config_setting.setting for config_setting in own)
+        self._depth: int = base._depth + 1 if base is not None else 0
+        self._length: int = len(own) + (base._length if base is not None else 0)
+        self._all_settings: Optional[frozenset[_Setting]] = None
+        if base is not None and self._depth % self._CHECKPOINT_INTERVAL == 0:
+            self._all_settings = frozenset(
+                config_setting.setting for config_setting in self
+            )
+
+    @classmethod
+    def layer(
+        cls, base: Optional["ResolvedSettings"], holders: Iterable[_SettingHolder]
+    ) -> "ResolvedSettings":
+        # Settings already in the base, or earlier in the layer, are skipped.
+        # The base is checked with one set difference per base layer rather
+        # than a lookup per setting.
+        holders = tuple(holders)
+        remaining: set[_Setting] = set()
+        for holder in holders:
+            remaining.update(holder.settings)  # type: ignore[attr-defined]
+        layer = base
+        while layer is not None and remaining:
+            if layer._all_settings is not None:
+                remaining -= layer._all_settings
+                break
+            remaining -= layer._own_settings
+            layer = layer.base
+
+        own: list[ConfigurationSetting] = []
+        for holder in holders:
+            for setting in holder.settings:  # type: ignore[attr-defined]
+                if setting in remaining:
+                    remaining.discard(setting)
+                    own.append(ConfigurationSetting(setting, holder))
+        return cls(base, tuple(own), holders)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, setting: object) -> bool:
+        layer: Optional[ResolvedSettings] = self
+        while layer is not None:
+            if layer._all_settings is not None:
+                return setting in layer._all_settings
+            if setting in layer._own_settings:
+                return True
+            layer = layer.base
+        return False
+
+    def __iter__(self) -> Iterator[ConfigurationSetting]:
+        for layer in self.layers():
+            yield from layer.own
+
+    def layers(self) -> list["ResolvedSettings"]:
+        # Least specific first, the order settings are applied in.
+        layers = []
+        layer: Optional[ResolvedSettings] = self
+        while layer is not None:
+            layers.append(layer)
+            layer = layer.base
+        layers.reverse()
+        return layers
+
+    def to_list(self) -> list[ConfigurationSetting]:
+        settings: list[ConfigurationSetting] = []
+        for layer in self.layers():
+            settings.extend(layer.own)
+        return settings
+
+
+@dataclass(eq=False, slots=True)
 class Preset(_SettingHolder):
     base_configuration: Configuration
-    settings: list[_Setting] = field(default_factory=lambda: [])
+    settings: list[_Setting] = _NO_ITEMS  # type: ignore[assignment]
+    _generation: int = field(default=0, init=False, repr=False)
+    _resolved_cache: Optional[tuple[int, int, ResolvedSettings]] = field(
+        default=None, init=False, repr=False
+    )
 
     def configuration_preset_generator(self, inherit_parents: bool = True) -> Generator[_SettingHolder, Any, Any]:
-        yield from self.base_configuration.parents_inherits_self_generator(
-            root=False, inherit_parents=inherit_parents
-        )
+        if inherit_parents:
+            yield from self.base_configuration.get_resolution_order()
+        else:
+            yield from self.base_configuration.parents_inherits_self_generator(
+                inherit_parents=False
+            )
         yield self
     
     
     def get_all_configuration_settings(self):
-        all_configuration_settings: list[ConfigurationSetting] = []
-        previous_settings: list[_Setting] = []
-        for config in self.configuration_preset_generator():
-            setting: _Setting
-            for setting in config.settings:
-                if setting not in previous_settings:
-                    previous_settings.append(setting)
-                    all_configuration_settings.append(
-                        ConfigurationSetting(setting, config)
-                    )
-        return all_configuration_settings
+        return self.get_resolved_settings().to_list()
 
+    def get_resolved_settings(self) -> ResolvedSettings:
+        generation = self._generation
+        base_generation = self.base_configuration._generation
+        cached = self._resolved_cache
+        if (
+            cached is not None
+            and cached[0] == generation
+            and cached[1] == base_generation
+        ):
+            resolution_cache_stats.hits += 1
+            return cached[2]
 
-@dataclass
+        resolution_cache_stats.misses += 1
+        # The base configuration resolves (and caches) the shared part of the
+        # chain, the preset only layers its own settings on top.
+        resolved = ResolvedSettings.layer(
+            self.base_configuration.get_resolved_settings(), (self,)
+        )
+        self._resolved_cache = (generation, base_generation, resolved)
+        return resolved
+
+    def set_settings(self, settings: Iterable[_Setting]) -> Self:
+        self.settings = list(settings)
+        self._settings_changed()
+        return self
+
+    def _add_setting(self, setting: _Setting):
+        if self.settings is _NO_ITEMS:
+            self.settings = []
+        self.settings.append(setting)
+        self._settings_changed()
+
+    def _settings_changed(self):
+        self._generation += 1
+        self._resolved_cache = None
+        _notify(self, ChangeKind.SETTINGS)
+
+
+@dataclass(eq=False, slots=True)
 class Project:
     name: str
     short_name: str
@@ -176,4 +817,329 @@ class Project:
 
     def add_preset(self, preset: Preset):
         self.presets.append(preset)
+        _notify(self, ChangeKind.PRESETS)
+        return self
+
+
+# Collects mutations of a configuration tree (and of presets and projects built
+# on it) and applies them in one go on commit: the tree's indexes are updated
+# once, everything resolving through a changed node is invalidated once and
+# listeners get a single BULK change instead of one per call. Nothing
+# is applied when validation fails: duplicate names and parent or inherits
+# cycles raise the same errors as the per-call API, before the tree is touched.
+#
+#   with Transaction(root) as transaction:
+#       show = transaction.add_configuration("show", studio)
+#       transaction.add_env_var(show, "SHOW", "show", EnvVarAction.SET)
+#       transaction.add_inheriting_configuration(show, maya)
+#
+# Configurations created by `add_configuration` are only attached on commit,
+# until then nothing else sees them and they are edited directly. The BULK
+# change lists SETTINGS changes first, then PARENT, INHERITS and PRESETS. Like
+# with `add_child_configuration`, a PARENT change stands for the configuration's
+# whole subtree: created configurations are only listed through the topmost
+# one's.
+class Transaction:
+    def __init__(self, root: Configuration):
+        if root.parent is not None:
+            raise ValueError(f"'{root.name}' is not the root of its tree")
+        self.root = root
+        # Created configurations, in the order they were created in.
+        self._created: dict[Configuration, int] = {}
+        # Parents set through `set_parent_configuration`
+        self._parents: dict[Configuration, Configuration] = {}
+        # Inherits added to existing configurations
+        self._inherits: dict[Configuration, list[Configuration]] = {}
+        # Existing holder -> settings replacing its own (None to keep them) and
+        # settings added after those
+        self._settings: dict[
+            _SettingHolder, tuple[Optional[list[_Setting]], list[_Setting]]
+        ] = {}
+        self._presets: dict[Project, list[Preset]] = {}
+        self._committed = False
+
+    def __enter__(self) -> Self:
         return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Mutations collected before an error are dropped with the transaction.
+        if exc_type is None:
+            self.commit()
+
+    def add_configuration(
+        self,
+        name: str,
+        parent: Configuration,
+        inherits: Iterable[Configuration] = (),
+        settings: Iterable[_Setting] = (),
+    ) -> Configuration:
+        # Created with its parent set, so no index of its own is built for it.
+        config = Configuration(name, parent=parent)
+        self._created[config] = len(self._created)
+        inherits = list(inherits)
+        if inherits:
+            config.inherits = inherits
+        settings = list(settings)
+        if settings:
+            config.settings = settings
+        return config
+
+    def set_parent_configuration(
+        self, configuration: Configuration, parent: Configuration
+    ):
+        self._parents[configuration] = parent
+        if configuration in self._created:
+            configuration.parent = parent
+        return self
+
+    def add_inheriting_configuration(
+        self, configuration: Configuration, inherits: Configuration
+    ):
+        if configuration in self._created:
+            if configuration.inherits is _NO_ITEMS:
+                configuration.inherits = []
+            configuration.inherits.append(inherits)
+        else:
+            self._inherits.setdefault(configuration, []).append(inherits)
+        return self
+
+    def add_env_var(
+        self, holder: _SettingHolder, key: str, value: str, action: EnvVarAction
+    ):
+        return self._add_setting(holder, EnvVar(key, value, action))
+
+    def add_package_requirement(
+        self, holder: _SettingHolder, package_name: str, version_specifier: str
+    ):
+        return self._add_setting(
+            holder, PackageRequirement(package_name, version_specifier)
+        )
+
+    def add_icon(self, holder: _SettingHolder, icon: os.PathLike | str):
+        return self._add_setting(holder, Icon(icon))
+
+    def add_tool(self, holder: _SettingHolder, name: str):
+        return self._add_setting(holder, Tool(name))
+
+    def set_settings(self, holder: _SettingHolder, settings: Iterable[_Setting]):
+        if holder in self._created:
+            holder.settings = list(settings)  # type: ignore[attr-defined]
+        else:
+            self._settings[holder] = (list(settings), [])
+        return self
+
+    def add_preset(self, project: Project, preset: Preset):
+        self._presets.setdefault(project, []).append(preset)
+        return self
+
+    def commit(self):
+        if self._committed:
+            raise ValueError("The transaction was already committed")
+        self._validate()
+        self._committed = True
+        root = self.root
+
+        # Existing configurations first, configurations created under them are
+        # indexed with the paths they end up at.
+        moved = [config for config in self._parents if config not in self._created]
+        for config in moved:
+            self._parents[config]._attach_child(config)
+
+        paths: dict[Configuration, str] = {}
+        name_index = root._name_index
+        path_index = root._path_index
+        for config in self._created:
+            parent: Configuration = config.parent  # type: ignore[assignment]
+            config._row = len(parent.children)
+            if parent.children is _NO_ITEMS:
+                parent.children = []
+            parent.children.append(config)
+            parent_path = paths.get(parent)
+            if parent_path is None:
+                parent_path = self._path(parent, paths)
+            path = f"{parent_path}/{config.name}" if parent_path else config.name
+            paths[config] = path
+            name_index[config.name] = config  # type: ignore[index]
+            path_index[path] = config  # type: ignore[index]
+            for inherit in config.inherits:
+                inherit._add_inherited_by(config)
+
+        for config, inherits in self._inherits.items():
+            if config.inherits is _NO_ITEMS:
+                config.inherits = []
+            config.inherits.extend(inherits)
+            for inherit in inherits:
+                inherit._add_inherited_by(config)
+
+        for holder, (replaced, added) in self._settings.items():
+            if replaced is not None:
+                holder.settings = replaced + added  # type: ignore[attr-defined]
+            elif holder.settings is _NO_ITEMS:  # type: ignore[attr-defined]
+                holder.settings = added  # type: ignore[attr-defined]
+            else:
+                holder.settings.extend(added)  # type: ignore[attr-defined]
+
+        for project, presets in self._presets.items():
+            project.presets.extend(presets)
+
+        self._invalidate(moved)
+        _notify(root, ChangeKind.BULK, self._changes())
+
+    def _add_setting(self, holder: _SettingHolder, setting: _Setting):
+        if holder in self._created:
+            if holder.settings is _NO_ITEMS:  # type: ignore[attr-defined]
+                holder.settings = []  # type: ignore[attr-defined]
+            holder.settings.append(setting)  # type: ignore[attr-defined]
+            return self
+        pending = self._settings.get(holder)
+        if pending is None:
+            pending = self._settings[holder] = (None, [])
+        pending[1].append(setting)
+        return self
+
+    def _validate(self):
+        # Cycles first, the tree membership checks walk up pending parents.
+        self._check_cycles()
+        root = self.root
+        in_tree: dict[Configuration, bool] = {}
+
+        def check_in_tree(parent: Configuration):
+            # In the tree or in a subtree the transaction attaches to it. Walks
+            # up until a configuration that was checked already.
+            chain = []
+            node: Optional[Configuration] = parent
+            result = False
+            while node is not None:
+                known = in_tree.get(node)
+                if known is not None:
+                    result = known
+                    break
+                chain.append(node)
+                if node is root:
+                    result = True
+                    break
+                node = self._parents.get(node, node.parent)
+            for node in chain:
+                in_tree[node] = result
+            if not result:
+                raise ValueError(
+                    f"'{parent.name}' is not in the tree of '{root.name}'"
+                )
+
+        names: dict[str, Configuration] = {}
+        name_index = root._name_index
+        for config in itertools.chain(self._created, self._parents):
+            parent = config.parent if config in self._created else self._parents[config]
+            if parent not in self._created:
+                check_in_tree(parent)  # type: ignore[arg-type]
+            if config in self._created:
+                subtree: Iterable[Configuration] = (config,)
+            elif config.parent is None:
+                subtree = config._name_index.values()  # type: ignore[union-attr]
+            else:
+                subtree = config.child_generator()
+            for node in subtree:
+                existing = names.get(node.name)
+                if existing is None:
+                    existing = name_index.get(node.name)  # type: ignore[union-attr]
+                if existing is not None and existing is not node:
+                    raise DuplicateConfigurationNameError(
+                        f"A configuration named '{node.name}' already exists under '{root.name}'"
+                    )
+                names[node.name] = node
+
+    def _check_cycles(self):
+        # Depth-first over parents and inherits as they are after the commit.
+        # The tree had no cycles, so a new one either goes through an existing
+        # configuration whose parent or inherits changed, or only through
+        # created ones. Created configurations start out below their parent,
+        # created before them, a cycle among them has an edge to one created
+        # at the same time or later. Only those edges are searched from.
+        created = self._created
+        starts = list(itertools.chain(self._parents, self._inherits))
+        for config, position in created.items():
+            if created.get(config.parent, -1) >= position or any(  # type: ignore[arg-type]
+                created.get(base, -1) >= position for base in config.inherits
+            ):
+                starts.append(config)
+
+        done: set[Configuration] = set()
+        visiting: set[Configuration] = set()
+        for start in starts:
+            if start in done:
+                continue
+            stack: list[tuple[Configuration, bool]] = [(start, False)]
+            while stack:
+                config, expanded = stack.pop()
+                if expanded:
+                    visiting.discard(config)
+                    done.add(config)
+                    continue
+                if config in done:
+                    continue
+                visiting.add(config)
+                stack.append((config, True))
+                for base in self._bases(config):
+                    if base in visiting:
+                        raise ConfigurationCycleError(
+                            f"'{config.name}' resolves through itself via '{base.name}'"
+                        )
+                    if base not in done:
+                        stack.append((base, False))
+
+    def _bases(self, config: Configuration) -> list[Configuration]:
+        bases = list(config.inherits)
+        bases.extend(self._inherits.get(config, ()))
+        parent = self._parents.get(config, config.parent)
+        if parent is not None:
+            bases.append(parent)
+        return bases
+
+    def _path(self, config: Configuration, paths: dict[Configuration, str]) -> str:
+        # Created configurations may be attached to ones created after them,
+        # the chain up to an indexed configuration is resolved first.
+        chain = []
+        node = config
+        while node not in paths and node in self._created:
+            chain.append(node)
+            node = node.parent  # type: ignore[assignment]
+        path = paths.get(node)
+        if path is None:
+            path = paths[node] = node.path
+        for node in reversed(chain):
+            path = paths[node] = f"{path}/{node.name}" if path else node.name
+        return path
+
+    def _invalidate(self, moved: list[Configuration]):
+        # One pass over everything resolving through the existing nodes whose
+        # structure changed and one over those whose settings did. Created
+        # configurations have nothing cached yet.
+        structure = moved + list(self._inherits)
+        if structure:
+            _invalidate_all(structure, structure=True)
+        settings: list[Configuration] = []
+        for holder in self._settings:
+            if isinstance(holder, Preset):
+                holder._generation += 1
+                holder._resolved_cache = None
+            elif isinstance(holder, Configuration):
+                settings.append(holder)
+        if settings:
+            _invalidate_all(settings)
+
+    def _changes(self) -> tuple[DataModelChange, ...]:
+        changes = [
+            DataModelChange(holder, ChangeKind.SETTINGS) for holder in self._settings
+        ]
+        changes.extend(
+            DataModelChange(config, ChangeKind.PARENT)
+            for config in dict.fromkeys(itertools.chain(self._created, self._parents))
+            if config.parent not in self._created
+        )
+        changes.extend(
+            DataModelChange(config, ChangeKind.INHERITS) for config in self._inherits
+        )
+        changes.extend(
+            DataModelChange(project, ChangeKind.PRESETS) for project in self._presets
+        )
+        return tuple(changes)
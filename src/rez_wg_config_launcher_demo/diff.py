@@ -0,0 +1,364 @@
+from dataclasses import dataclass, field
+from enum import Enum
+import itertools
+import os
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    ConfigurationSetting,
+    EnvVar,
+    Icon,
+    PackageRequirement,
+    Preset,
+    ResolvedSettings,
+    Tool,
+    _Setting,
+    _SettingHolder,
+)
+from rez_wg_config_launcher_demo.resolver import (
+    ResolvedEnvironment,
+    SettingsResolver,
+    resolution_order,
+)
+
+
+class DifferenceKind(Enum):
+    ADDED = 0
+    REMOVED = 1
+    OVERRIDDEN = 2
+
+
+# Keys the settings of a layer's holders set, dicts keep their order.
+@dataclass
+class _LayerKeys:
+    environment: dict[str, None] = field(default_factory=lambda: {})
+    packages: dict[str, None] = field(default_factory=lambda: {})
+    tools: dict[str, None] = field(default_factory=lambda: {})
+    icon: bool = False
+
+
+@dataclass
+class _ToolProvenance:
+    tools: dict[str, list[ConfigurationSetting]] = field(default_factory=lambda: {})
+    icons: list[ConfigurationSetting] = field(default_factory=lambda: [])
+
+
+# One resolved key that differs, read as going from `left` to `right`. A value
+# is None on the side the key is missing from, provenance lists the settings
+# that contributed to the key on each side, in the order they were applied.
+# Slotted, diffing every pair of presets of a project makes a lot of them.
+@dataclass(slots=True)
+class SettingDifference:
+    kind: DifferenceKind
+    type: str
+    key: str
+    left_value: Optional[str]
+    right_value: Optional[str]
+    left_provenance: list[ConfigurationSetting] = field(default_factory=lambda: [])
+    right_provenance: list[ConfigurationSetting] = field(default_factory=lambda: [])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind.name,
+            "type": self.type,
+            "key": self.key,
+            "left": {
+                "value": self.left_value,
+                "provenance": _provenance_names(self.left_provenance),
+            },
+            "right": {
+                "value": self.right_value,
+                "provenance": _provenance_names(self.right_provenance),
+            },
+        }
+
+
+# `common_holders` is the part of the resolution orders both holders share, the
+# last of them is their nearest common ancestor.
+@dataclass
+class HolderDiff:
+    left: Union[Configuration, Preset]
+    right: Union[Configuration, Preset]
+    common_holders: tuple[_SettingHolder, ...]
+    differences: list[SettingDifference]
+
+    @property
+    def common_ancestor(self) -> Optional[_SettingHolder]:
+        return self.common_holders[-1] if self.common_holders else None
+
+    def to_dict(self) -> dict[str, Any]:
+        common_ancestor = self.common_ancestor
+        return {
+            "left": self.left.name,
+            "right": self.right.name,
+            "common_ancestor": common_ancestor.name if common_ancestor else None,
+            "common_holders": len(self.common_holders),
+            "differences": [difference.to_dict() for difference in self.differences],
+        }
+
+
+# Diffs the resolved settings of configurations and presets. Both sides are
+# resolved from the deepest ResolvedSettings layer they share, which is folded
+# once and reused by every later diff going through it, and only keys set above
+# that layer are compared: everything else resolves identically on both sides.
+# Layers are folded from their holders' own settings, as `resolve` does, not
+# from the deduplicated settings they list.
+# Diffing every pair of presets in a project folds each shared configuration
+# and each preset once. Layers are immutable, results never go stale, but an
+# engine holds on to the layers it has seen; use one per comparison session.
+class DiffEngine:
+    def __init__(self, separator: str = os.pathsep):
+        self.separator = separator
+        self._resolvers: dict[ResolvedSettings, SettingsResolver] = {}
+        self._environments: dict[ResolvedSettings, ResolvedEnvironment] = {}
+        self._keys: dict[ResolvedSettings, _LayerKeys] = {}
+        self._provenances: dict[ResolvedSettings, _ToolProvenance] = {}
+
+    def diff(
+        self,
+        left: Union[Configuration, Preset],
+        right: Union[Configuration, Preset],
+    ) -> HolderDiff:
+        left_settings = left.get_resolved_settings()
+        right_settings = right.get_resolved_settings()
+        common = _common_layer(left_settings, right_settings)
+        left_layers = _layers_above(left_settings, common)
+        right_layers = _layers_above(right_settings, common)
+        left_environment = self._environment(left_settings, common, left_layers)
+        right_environment = self._environment(right_settings, common, right_layers)
+
+        environment_keys: dict[str, None] = {}
+        package_names: dict[str, None] = {}
+        tool_names: dict[str, None] = {}
+        icon_changed = False
+        for layer in itertools.chain(left_layers, right_layers):
+            keys = self._layer_keys(layer)
+            environment_keys.update(keys.environment)
+            package_names.update(keys.packages)
+            tool_names.update(keys.tools)
+            icon_changed = icon_changed or keys.icon
+
+        differences = []
+        left_values = left_environment.environment
+        right_values = right_environment.environment
+        for key in environment_keys:
+            left_value = left_values.get(key)
+            right_value = right_values.get(key)
+            if left_value != right_value:
+                differences.append(
+                    _difference(
+                        EnvVar.type,
+                        key,
+                        left_value,
+                        right_value,
+                        left_environment.environment_provenance.get(key, []),
+                        right_environment.environment_provenance.get(key, []),
+                    )
+                )
+        for name in package_names:
+            left_package = left_environment.packages.get(name)
+            right_package = right_environment.packages.get(name)
+            if left_package != right_package:
+                differences.append(
+                    _difference(
+                        PackageRequirement.type,
+                        name,
+                        repr(left_package) if left_package is not None else None,
+                        repr(right_package) if right_package is not None else None,
+                        left_environment.package_provenance.get(name, []),
+                        right_environment.package_provenance.get(name, []),
+                    )
+                )
+
+        left_tools = {tool.name for tool in left_environment.tools}
+        right_tools = {tool.name for tool in right_environment.tools}
+        for name in tool_names:
+            if (name in left_tools) != (name in right_tools):
+                differences.append(
+                    _difference(
+                        Tool.type,
+                        name,
+                        name if name in left_tools else None,
+                        name if name in right_tools else None,
+                        self._provenance(left_settings).tools.get(name, []),
+                        self._provenance(right_settings).tools.get(name, []),
+                    )
+                )
+        if icon_changed:
+            left_icon, right_icon = left_environment.icon, right_environment.icon
+            left_value = str(left_icon.icon) if left_icon is not None else None
+            right_value = str(right_icon.icon) if right_icon is not None else None
+            if left_value != right_value:
+                differences.append(
+                    _difference(
+                        Icon.type,
+                        "icon",
+                        left_value,
+                        right_value,
+                        self._provenance(left_settings).icons,
+                        self._provenance(right_settings).icons,
+                    )
+                )
+
+        return HolderDiff(left, right, common_holders(left, right), differences)
+
+    def diff_all(
+        self, holders: Iterable[Union[Configuration, Preset]]
+    ) -> list[HolderDiff]:
+        return [
+            self.diff(left, right)
+            for left, right in itertools.combinations(list(holders), 2)
+        ]
+
+    def clear(self):
+        self._resolvers.clear()
+        self._environments.clear()
+        self._keys.clear()
+        self._provenances.clear()
+
+    def _layer_keys(self, layer: ResolvedSettings) -> "_LayerKeys":
+        keys = self._keys.get(layer)
+        if keys is None:
+            keys = self._keys[layer] = _LayerKeys()
+            for setting in _layer_settings(layer):
+                if isinstance(setting, EnvVar):
+                    keys.environment[setting.key] = None
+                elif isinstance(setting, PackageRequirement):
+                    keys.packages[setting.package_name] = None
+                elif isinstance(setting, Tool):
+                    keys.tools[setting.name] = None
+                elif isinstance(setting, Icon):
+                    keys.icon = True
+        return keys
+
+    def _provenance(self, settings: ResolvedSettings) -> "_ToolProvenance":
+        # The resolver does not track where tools and icons come from, they are
+        # looked up once per holder that has one in a difference.
+        provenance = self._provenances.get(settings)
+        if provenance is None:
+            provenance = self._provenances[settings] = _ToolProvenance()
+            for layer in settings.layers():
+                for holder in layer.holders:
+                    for setting in holder.settings:  # type: ignore[attr-defined]
+                        if isinstance(setting, Tool):
+                            tools = provenance.tools.setdefault(setting.name, [])
+                            tools.append(ConfigurationSetting(setting, holder))
+                        elif isinstance(setting, Icon):
+                            icon = ConfigurationSetting(setting, holder)
+                            provenance.icons.append(icon)
+        return provenance
+
+    def _resolver(self, layer: ResolvedSettings) -> SettingsResolver:
+        # Folded from the nearest layer below that already was. Stored
+        # resolvers are only ever copied, never applied to again.
+        resolver = self._resolvers.get(layer)
+        if resolver is not None:
+            return resolver
+        pending = []
+        base: Optional[ResolvedSettings] = layer
+        while base is not None and base not in self._resolvers:
+            pending.append(base)
+            base = base.base
+        if base is None:
+            resolver = SettingsResolver(self.separator)
+        else:
+            resolver = self._resolvers[base].copy()
+        for pending_layer in reversed(pending):
+            resolver.apply_holders(pending_layer.holders)
+        self._resolvers[layer] = resolver
+        return resolver
+
+    def _environment(
+        self,
+        settings: ResolvedSettings,
+        common: Optional[ResolvedSettings],
+        layers: list[ResolvedSettings],
+    ) -> ResolvedEnvironment:
+        environment = self._environments.get(settings)
+        if environment is not None:
+            return environment
+        if common is None:
+            resolver = SettingsResolver(self.separator)
+        else:
+            resolver = self._resolver(common).copy()
+        for layer in layers:
+            resolver.apply_holders(layer.holders)
+        environment = self._environments[settings] = resolver.result()
+        return environment
+
+
+def diff(
+    left: Union[Configuration, Preset],
+    right: Union[Configuration, Preset],
+    separator: str = os.pathsep,
+) -> HolderDiff:
+    return DiffEngine(separator).diff(left, right)
+
+
+def common_holders(
+    left: Union[Configuration, Preset], right: Union[Configuration, Preset]
+) -> tuple[_SettingHolder, ...]:
+    left_order = resolution_order(left)
+    right_order = resolution_order(right)
+    length = 0
+    for left_holder, right_holder in zip(left_order, right_order):
+        if left_holder is not right_holder:
+            break
+        length += 1
+    return left_order[:length]
+
+
+def _common_layer(
+    left: ResolvedSettings, right: ResolvedSettings
+) -> Optional[ResolvedSettings]:
+    left_layers = set()
+    layer: Optional[ResolvedSettings] = left
+    while layer is not None:
+        left_layers.add(layer)
+        layer = layer.base
+    layer = right
+    while layer is not None and layer not in left_layers:
+        layer = layer.base
+    return layer
+
+
+def _layers_above(
+    settings: ResolvedSettings, common: Optional[ResolvedSettings]
+) -> list[ResolvedSettings]:
+    # Least specific first.
+    layers = []
+    layer: Optional[ResolvedSettings] = settings
+    while layer is not common and layer is not None:
+        layers.append(layer)
+        layer = layer.base
+    layers.reverse()
+    return layers
+
+
+def _layer_settings(layer: ResolvedSettings) -> Iterator[_Setting]:
+    for holder in layer.holders:
+        yield from holder.settings  # type: ignore[attr-defined]
+
+
+def _difference(
+    setting_type: str,
+    key: str,
+    left: Optional[str],
+    right: Optional[str],
+    left_provenance: list[ConfigurationSetting],
+    right_provenance: list[ConfigurationSetting],
+) -> SettingDifference:
+    if left is None:
+        kind = DifferenceKind.ADDED
+    elif right is None:
+        kind = DifferenceKind.REMOVED
+    else:
+        kind = DifferenceKind.OVERRIDDEN
+    return SettingDifference(
+        kind, setting_type, key, left, right, left_provenance, right_provenance
+    )
+
+
+def _provenance_names(provenance: list[ConfigurationSetting]) -> list[str]:
+    return [config_setting.configuration.name for config_setting in provenance]
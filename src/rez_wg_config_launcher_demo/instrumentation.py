@@ -0,0 +1,251 @@
+import functools
+import inspect
+import json
+import math
+import os
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    Preset,
+    resolution_cache_stats,
+)
+
+# Resolution entry points, wrapped while instrumentation is enabled. The batch
+# resolver walks resolution orders directly.
+DATA_MODEL_TARGETS: list[tuple[type, str]] = [
+    (Configuration, "parents_inherits_self_generator"),
+    (Configuration, "get_resolution_order"),
+    (Configuration, "get_all_configuration_settings"),
+    (Configuration, "get_resolved_settings"),
+    (Configuration, "get_child_by_name"),
+    (Preset, "get_all_configuration_settings"),
+    (Preset, "get_resolved_settings"),
+]
+
+# Qt models and the methods their views call the most. Only wrapped when
+# ui_model is already imported, instrumenting a headless run never pulls in Qt.
+QT_MODEL_CLASSES = [
+    "TreeConfigurationModel",
+    "ConfigTableSettingModel",
+    "ListPresetModel",
+]
+QT_MODEL_METHODS = ["data", "index", "parent", "rowCount"]
+
+
+@dataclass
+class CallStats:
+    count: int = 0
+    total_ns: int = 0
+    durations_ns: array = field(default_factory=lambda: array("q"))
+
+    def add(self, duration_ns: int):
+        self.count += 1
+        self.total_ns += duration_ns
+        self.durations_ns.append(duration_ns)
+
+    def percentile_ns(self, percentile: float) -> int:
+        if not self.durations_ns:
+            return 0
+        durations = sorted(self.durations_ns)
+        return durations[max(math.ceil(len(durations) * percentile / 100) - 1, 0)]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "p95_us": self.percentile_ns(95) / 1e3,
+            "max_us": max(self.durations_ns, default=0) / 1e3,
+        }
+
+
+# Records call counts, latencies and chain depths of the resolution code and
+# the Qt models. Enabling replaces the measured methods on their classes with
+# timing wrappers and disabling puts the originals back, so nothing is paid
+# while it is off.
+# PySide binds a Python override to a Qt object the first time C++ calls it, so
+# models only report calls when they were created while instrumentation was
+# enabled (see the `--instrument` option), and wrappers they bound forward
+# without recording once it is disabled again.
+class Instrumentation:
+    def __init__(self, max_trace_events: int = 500_000):
+        self.max_trace_events = max_trace_events
+        self.enabled = False
+        self.calls: dict[str, CallStats] = {}
+        # Length of the resolution order, by configuration or preset. Keyed by
+        # the holder rather than its name, names are not unique.
+        self.chain_depths: dict[Union[Configuration, Preset], int] = {}
+        self.dropped_trace_events = 0
+        self._events: list[tuple[str, str, int, int, int, Optional[str]]] = []
+        self._originals: list[tuple[type, str, Callable]] = []
+        self._epoch_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        if self.enabled:
+            return
+        targets = [(cls, name, "data_model") for cls, name in DATA_MODEL_TARGETS]
+        ui_model = sys.modules.get(f"{__package__}.ui_model")
+        if ui_model is not None:
+            for class_name in QT_MODEL_CLASSES:
+                cls = getattr(ui_model, class_name)
+                targets.extend(
+                    (cls, name, "qt")
+                    for name in QT_MODEL_METHODS
+                    if name in cls.__dict__
+                )
+
+        for cls, name, category in targets:
+            function = cls.__dict__[name]
+            self._originals.append((cls, name, function))
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", category, function))
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for cls, name, function in reversed(self._originals):
+            setattr(cls, name, function)
+        self._originals.clear()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.chain_depths = {}
+            self.dropped_trace_events = 0
+            self._events = []
+            self._epoch_ns = time.perf_counter_ns()
+        resolution_cache_stats.reset()
+
+    def _wrap(self, name: str, category: str, function: Callable) -> Callable:
+        record = self._record
+        if inspect.isgeneratorfunction(function):
+            # Only the time spent inside the generator counts, not what the
+            # caller does between items.
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                if not self.enabled:
+                    yield from function(*args, **kwargs)
+                    return
+                iterator = function(*args, **kwargs)
+                start = time.perf_counter_ns()
+                elapsed = 0
+                try:
+                    while True:
+                        step = time.perf_counter_ns()
+                        try:
+                            item = next(iterator)
+                        finally:
+                            elapsed += time.perf_counter_ns() - step
+                        yield item
+                except StopIteration:
+                    return
+                finally:
+                    record(name, category, args[0], start, elapsed)
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, category, args[0], start, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    def _record(
+        self, name: str, category: str, subject: Any, start: int, duration: int
+    ):
+        holder = None
+        depth = None
+        if category == "data_model":
+            holder = subject.name
+            depth = _chain_depth(subject)
+        with self._lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = CallStats()
+            stats.add(duration)
+            if depth is not None:
+                self.chain_depths[subject] = depth
+            if len(self._events) < self.max_trace_events:
+                self._events.append(
+                    (name, category, start, duration, threading.get_ident(), holder)
+                )
+            else:
+                self.dropped_trace_events += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            calls = {name: stats.to_dict() for name, stats in self.calls.items()}
+            chain_depths = [
+                (holder.name, depth) for holder, depth in self.chain_depths.items()
+            ]
+            dropped = self.dropped_trace_events
+        depths = [depth for _, depth in chain_depths]
+        return {
+            "calls": calls,
+            # (name, depth) pairs, a name can appear more than once.
+            "chain_depths": chain_depths,
+            "max_chain_depth": max(depths, default=0),
+            "mean_chain_depth": sum(depths) / len(depths) if depths else 0.0,
+            "resolution_cache": {
+                "hits": resolution_cache_stats.hits,
+                "misses": resolution_cache_stats.misses,
+                "invalidations": resolution_cache_stats.invalidations,
+            },
+            "dropped_trace_events": dropped,
+        }
+
+    # Trace Event Format, opens in chrome://tracing and Perfetto.
+    def to_chrome_trace(self) -> dict:
+        with self._lock:
+            events = list(self._events)
+            epoch = self._epoch_ns
+        pid = os.getpid()
+        trace_events = []
+        for name, category, start, duration, thread, holder in events:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - epoch) / 1e3,
+                "dur": duration / 1e3,
+                "pid": pid,
+                "tid": thread,
+            }
+            if holder is not None:
+                event["args"] = {"holder": holder}
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+
+def _chain_depth(holder: Any) -> Optional[int]:
+    if isinstance(holder, Preset):
+        order = holder.base_configuration._cached_resolution_order()
+        return None if order is None else len(order) + 1
+    order = holder._cached_resolution_order()
+    return None if order is None else len(order)
+
+
+# Shared by the CLI and the launcher's Diagnostics panel.
+instrumentation = Instrumentation()
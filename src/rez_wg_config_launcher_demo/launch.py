@@ -0,0 +1,373 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+import os
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+from rez_wg_config_launcher_demo.data_model import ConfigurationSetting, Preset
+from rez_wg_config_launcher_demo.resolver import (
+    SettingsResolver,
+    fold_environment,
+    resolution_order,
+    resolve,
+)
+
+if TYPE_CHECKING:
+    from rez_wg_config_launcher_demo.rez_resolve import ResolveCache, ResolvedContext
+
+# Process output is read in chunks of up to this many bytes and forwarded a
+# chunk's complete lines at a time, chatty tools do not flood the listeners.
+_READ_SIZE = 64 * 1024
+
+
+class LaunchError(ValueError):
+    pass
+
+
+class LaunchState(Enum):
+    QUEUED = 0
+    RESOLVING = 1
+    RUNNING = 2
+    FINISHED = 3
+    FAILED = 4
+
+
+# Seconds, None until the launch got that far. resolve covers the preset's
+# settings and, with a resolve cache, its package context; spawn is creating
+# the process; start is from submitting the launch until its process runs,
+# waiting for a free slot included.
+@dataclass
+class LaunchTimings:
+    resolve_seconds: Optional[float] = None
+    spawn_seconds: Optional[float] = None
+    start_seconds: Optional[float] = None
+    run_seconds: Optional[float] = None
+
+    def to_dict(self) -> dict[str, Optional[float]]:
+        return {
+            "resolve_seconds": self.resolve_seconds,
+            "spawn_seconds": self.spawn_seconds,
+            "start_seconds": self.start_seconds,
+            "run_seconds": self.run_seconds,
+        }
+
+
+# Updated by the queue's thread as the launch progresses. `context` is the
+# package context resolved for it, when the queue has a resolve cache.
+@dataclass(eq=False)
+class Launch:
+    launch_id: int
+    preset_name: str
+    tool: str
+    command: list[str]
+    packages: list[str]
+    state: LaunchState = LaunchState.QUEUED
+    pid: Optional[int] = None
+    returncode: Optional[int] = None
+    error: Optional[str] = None
+    context: Optional["ResolvedContext"] = None
+    timings: LaunchTimings = field(default_factory=LaunchTimings)
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def done(self) -> bool:
+        return self.state in (LaunchState.FINISHED, LaunchState.FAILED)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "launch_id": self.launch_id,
+            "preset": self.preset_name,
+            "tool": self.tool,
+            "command": self.command,
+            "state": self.state.name,
+            "pid": self.pid,
+            "returncode": self.returncode,
+            "error": self.error,
+            "timings": self.timings.to_dict(),
+        }
+
+
+class LaunchEventKind(Enum):
+    STATE = 0
+    OUTPUT = 1
+
+
+# `stream` ("stdout" or "stderr") and `lines` are only set for OUTPUT events.
+@dataclass(frozen=True)
+class LaunchEvent:
+    launch: Launch
+    kind: LaunchEventKind
+    state: LaunchState
+    stream: Optional[str] = None
+    lines: tuple[str, ...] = ()
+
+
+# Starts the tools of presets as asyncio subprocesses, on an event loop running
+# in its own thread that is started with the first launch. At most
+# `max_concurrent` launches resolve and spawn at the same time, the others wait
+# for a slot; a launch frees its slot once its process started, so long running
+# tools do not hold up the queue. Listeners are called on the queue's thread
+# with every LaunchEvent.
+# A preset's settings are resolved by `submit`, on the calling thread, as the
+# data model is not thread safe; only the package context resolve runs in the
+# background. `resolve_tools` likewise collects the settings on the calling
+# thread and only folds them in the background. Processes still running are
+# terminated by `shutdown`, their output pipes end with the queue.
+class LaunchQueue:
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        separator: str = os.pathsep,
+        resolve_cache: Optional["ResolveCache"] = None,
+        base_environment: Optional[dict[str, str]] = None,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.separator = separator
+        self.resolve_cache = resolve_cache
+        # Variables presets do not set are inherited from it, by default the
+        # launching process's environment.
+        self.base_environment = base_environment
+        self.launches: dict[int, Launch] = {}
+        self._listeners: list[Callable[[LaunchEvent], None]] = []
+        self._lock = threading.Lock()
+        self._next_launch_id = 1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Only touched on the queue's thread.
+        self._processes: dict[int, asyncio.subprocess.Process] = {}
+
+    def add_listener(self, listener: Callable[[LaunchEvent], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[LaunchEvent], None]):
+        self._listeners.remove(listener)
+
+    def submit(
+        self,
+        preset: Preset,
+        tool: Optional[str] = None,
+        arguments: Sequence[str] = (),
+        command: Optional[Sequence[str]] = None,
+    ) -> Launch:
+        # Launches `tool`, by default the preset's first, with `arguments`.
+        # `command` replaces the tool's command line altogether, e.g. with a
+        # dummy executable.
+        start = time.perf_counter()
+        resolved = resolve(preset, self.separator)
+        tool_names = [resolved_tool.name for resolved_tool in resolved.tools]
+        if tool is None:
+            if not tool_names and not command:
+                raise LaunchError(f"Preset '{preset.name}' has no tool to launch")
+            tool = tool_names[0] if tool_names else command[0]  # type: ignore[index]
+        elif tool not in tool_names and not command:
+            raise LaunchError(f"Preset '{preset.name}' has no tool '{tool}'")
+        environment = fold_environment(
+            resolved.environment,
+            resolved.environment_extensions,
+            os.environ if self.base_environment is None else self.base_environment,
+        )
+
+        with self._lock:
+            launch_id = self._next_launch_id
+            self._next_launch_id += 1
+        launch = Launch(
+            launch_id=launch_id,
+            preset_name=preset.name,
+            tool=tool,
+            command=list(command) if command else [tool, *arguments],
+            packages=resolved.package_requests(),
+            submitted_at=start,
+        )
+        launch.timings.resolve_seconds = time.perf_counter() - start
+        self.launches[launch_id] = launch
+        self._emit(launch, LaunchEventKind.STATE)
+        asyncio.run_coroutine_threadsafe(
+            self._run(launch, environment), self._ensure_loop()
+        )
+        return launch
+
+    def resolve_tools(self, preset: Preset) -> "Future[list[str]]":
+        # The names of the tools `submit` can launch for the preset, folded on
+        # the queue's threads, e.g. to list them without blocking a GUI.
+        settings = [
+            ConfigurationSetting(setting, holder)
+            for holder in resolution_order(preset)
+            for setting in holder.settings  # type: ignore[attr-defined]
+        ]
+        return asyncio.run_coroutine_threadsafe(
+            self._resolve_tools(settings), self._ensure_loop()
+        )
+
+    def terminate(self, launch_id: int):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._terminate, launch_id)
+
+    def shutdown(self, timeout: float = 5.0):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._stop_processes(timeout), loop)
+        try:
+            future.result(timeout + 1.0)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(ready,),
+                    name="launch-queue",
+                    daemon=True,
+                )
+                self._thread.start()
+                ready.wait()
+            return self._loop  # type: ignore[return-value]
+
+    def _run_loop(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # One thread per slot, the default executor would cap the package
+        # resolves running at once below the limit on small machines.
+        loop.set_default_executor(
+            ThreadPoolExecutor(self.max_concurrent, thread_name_prefix="launch-resolve")
+        )
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    async def _resolve_tools(self, settings: list[ConfigurationSetting]) -> list[str]:
+        resolver = SettingsResolver(self.separator)
+        resolved = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: resolver.apply_all(settings).result()
+        )
+        return [tool.name for tool in resolved.tools]
+
+    async def _run(self, launch: Launch, environment: dict[str, str]):
+        async with self._semaphore:  # type: ignore[union-attr]
+            self._set_state(launch, LaunchState.RESOLVING)
+            try:
+                if self.resolve_cache is not None:
+                    start = time.perf_counter()
+                    launch.context = await asyncio.get_running_loop().run_in_executor(
+                        None, self.resolve_cache.resolve, launch.packages
+                    )
+                    settings_seconds = launch.timings.resolve_seconds or 0.0
+                    launch.timings.resolve_seconds = (
+                        settings_seconds + time.perf_counter() - start
+                    )
+            except Exception as error:
+                self._fail(launch, f"Resolving the packages failed: {error}")
+                return
+
+            start = time.perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *launch.command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=environment,
+                )
+            except Exception as error:
+                self._fail(launch, str(error))
+                return
+            started = time.perf_counter()
+            launch.timings.spawn_seconds = started - start
+            launch.timings.start_seconds = started - launch.submitted_at
+            launch.pid = process.pid
+            self._processes[launch.launch_id] = process
+            self._set_state(launch, LaunchState.RUNNING)
+
+        try:
+            await asyncio.gather(
+                self._forward_output(launch, process.stdout, "stdout"),
+                self._forward_output(launch, process.stderr, "stderr"),
+            )
+            launch.returncode = await process.wait()
+        finally:
+            self._processes.pop(launch.launch_id, None)
+        launch.timings.run_seconds = time.perf_counter() - started
+        self._set_state(launch, LaunchState.FINISHED)
+
+    async def _forward_output(
+        self, launch: Launch, stream: Optional[asyncio.StreamReader], name: str
+    ):
+        if stream is None:
+            return
+        remainder = b""
+        while True:
+            data = await stream.read(_READ_SIZE)
+            if not data:
+                break
+            *lines, remainder = (remainder + data).split(b"\n")
+            if lines:
+                self._emit(launch, LaunchEventKind.OUTPUT, name, _decode(lines))
+        if remainder:
+            self._emit(launch, LaunchEventKind.OUTPUT, name, _decode([remainder]))
+
+    def _terminate(self, launch_id: int):
+        process = self._processes.get(launch_id)
+        if process is not None and process.returncode is None:
+            process.terminate()
+
+    async def _stop_processes(self, timeout: float):
+        processes = list(self._processes.values())
+        for process in processes:
+            if process.returncode is None:
+                process.terminate()
+        if not processes:
+            return
+        await asyncio.wait(
+            [asyncio.ensure_future(process.wait()) for process in processes],
+            timeout=timeout,
+        )
+        for process in processes:
+            if process.returncode is None:
+                process.kill()
+
+    def _fail(self, launch: Launch, message: str):
+        launch.error = message
+        self._set_state(launch, LaunchState.FAILED)
+
+    def _set_state(self, launch: Launch, state: LaunchState):
+        launch.state = state
+        self._emit(launch, LaunchEventKind.STATE)
+
+    def _emit(
+        self,
+        launch: Launch,
+        kind: LaunchEventKind,
+        stream: Optional[str] = None,
+        lines: tuple[str, ...] = (),
+    ):
+        event = LaunchEvent(launch, kind, launch.state, stream, lines)
+        for listener in list(self._listeners):
+            listener(event)
+
+
+def _decode(lines: list[bytes]) -> tuple[str, ...]:
+    return tuple(
+        line.decode("utf-8", errors="replace").rstrip("\r") for line in lines
+    )
+
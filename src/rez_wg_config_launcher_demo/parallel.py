@@ -0,0 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Any, Optional
+
+from rez_wg_config_launcher_demo.batch import BatchResolver
+from rez_wg_config_launcher_demo.data_model import Configuration, Preset, Project
+from rez_wg_config_launcher_demo.serialization import dumps_tree, loads_tree
+
+# Set once per worker process by _initialize_worker.
+_worker_resolver: Optional[BatchResolver] = None
+_worker_projects: list[Project] = []
+
+
+def _initialize_worker(payload: bytes, separator: str):
+    global _worker_resolver, _worker_projects
+    _, _worker_projects = loads_tree(payload)
+    _worker_resolver = BatchResolver(separator)
+
+
+def _resolve_project(project_index: int) -> list[dict[str, Any]]:
+    assert _worker_resolver is not None
+    project = _worker_projects[project_index]
+    return [
+        _worker_resolver.resolve_preset(preset).to_dict()
+        for preset in project.presets
+    ]
+
+
+# Resolves every preset of the given projects across a process pool. The tree is
+# serialized once and handed to each worker when it starts, tasks only carry a
+# project's position, names are not unique. A worker keeps its BatchResolver
+# between tasks so ancestors it already folded are reused for later projects.
+# Results come back as ResolvedEnvironment.to_dict(), in preset order, and are
+# keyed by the caller's Project and Preset objects like BatchResolver's.
+def resolve_projects_parallel(
+    root: Configuration,
+    projects: list[Project],
+    max_workers: Optional[int] = None,
+    separator: str = os.pathsep,
+) -> dict[Project, dict[Preset, dict[str, Any]]]:
+    payload = dumps_tree(root, projects)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_initialize_worker,
+        initargs=(payload, separator),
+    ) as executor:
+        results = list(executor.map(_resolve_project, range(len(projects))))
+    return {
+        project: dict(zip(project.presets, resolved))
+        for project, resolved in zip(projects, results)
+    }
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Iterable, Union
+
+from rez_wg_config_launcher_demo.data_model import (
+    ChangeKind,
+    Configuration,
+    Project,
+    _notify,
+    _Setting,
+    _SettingHolder,
+)
+
+# In-place edits to a loaded tree. They are computed up front (for example by
+# store.ConfigSource.reload) and applied one at a time, so a Qt model can wrap
+# each one in the matching begin/end or dataChanged notifications.
+
+
+@dataclass
+class AddConfigurationPatch:
+    configuration: Configuration
+    parent: Configuration
+
+    def apply(self):
+        self.configuration.set_parent_configuration(self.parent)
+
+
+@dataclass
+class RemoveConfigurationPatch:
+    configuration: Configuration
+
+    def apply(self):
+        self.configuration.set_inheriting_configurations([])
+        self.configuration.parent.remove_child_configuration(self.configuration)  # type: ignore[union-attr]
+
+
+@dataclass
+class MoveConfigurationPatch:
+    configuration: Configuration
+    parent: Configuration
+
+    def apply(self):
+        self.configuration.set_parent_configuration(self.parent)
+
+
+@dataclass
+class InheritsPatch:
+    configuration: Configuration
+    inherits: list[Configuration]
+
+    def apply(self):
+        self.configuration.set_inheriting_configurations(self.inherits)
+
+
+@dataclass
+class SettingsPatch:
+    holder: _SettingHolder
+    settings: list[_Setting]
+
+    def apply(self):
+        self.holder.set_settings(self.settings)
+
+
+@dataclass
+class ProjectsPatch:
+    # Replaces the content of `projects` in place, so everyone holding the list
+    # sees the reloaded projects.
+    projects: list[Project]
+    new_projects: list[Project]
+
+    def apply(self):
+        self.projects[:] = self.new_projects
+        _notify(self.projects, ChangeKind.PRESETS)
+
+
+Patch = Union[
+    AddConfigurationPatch,
+    RemoveConfigurationPatch,
+    MoveConfigurationPatch,
+    InheritsPatch,
+    SettingsPatch,
+    ProjectsPatch,
+]
+
+
+def apply_patches(patches: Iterable[Patch]):
+    for patch in patches:
+        patch.apply()
@@ -0,0 +1,238 @@
+from dataclasses import dataclass, field
+import os
+from typing import Any, Iterable, Mapping, Optional, Self, Union
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    ConfigurationSetting,
+    EnvVar,
+    EnvVarAction,
+    Icon,
+    PackageRequirement,
+    Preset,
+    Tool,
+    _SettingHolder,
+)
+
+
+@dataclass
+class ResolvedEnvironment:
+    environment: dict[str, str] = field(default_factory=lambda: {})
+    packages: dict[str, PackageRequirement] = field(default_factory=lambda: {})
+    tools: list[Tool] = field(default_factory=lambda: [])
+    icon: Optional[Icon] = None
+    # Every setting that contributed to a key, in the order it was applied.
+    environment_provenance: dict[str, list[ConfigurationSetting]] = field(
+        default_factory=lambda: {}
+    )
+    package_provenance: dict[str, list[ConfigurationSetting]] = field(
+        default_factory=lambda: {}
+    )
+    # The (prefix, suffix) joined around the inherited value of keys that are
+    # only prepended or appended to, never set.
+    environment_extensions: dict[str, tuple[str, str]] = field(
+        default_factory=lambda: {}
+    )
+
+    def package_requests(self) -> list[str]:
+        return [repr(requirement) for requirement in self.packages.values()]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "environment": dict(self.environment),
+            "packages": self.package_requests(),
+            "tools": [tool.name for tool in self.tools],
+            "icon": str(self.icon.icon) if self.icon is not None else None,
+            "provenance": {
+                "environment": {
+                    key: [config_setting.configuration.name for config_setting in settings]
+                    for key, settings in self.environment_provenance.items()
+                },
+                "packages": {
+                    key: [config_setting.configuration.name for config_setting in settings]
+                    for key, settings in self.package_provenance.items()
+                },
+            },
+        }
+
+
+class _EnvAccumulator:
+    __slots__ = ("prepends", "value", "appends", "_joined")
+
+    def __init__(self):
+        self.prepends: list[str] = []
+        self.value: Optional[str] = None
+        self.appends: list[str] = []
+        self._joined: Optional[tuple[str, str]] = None
+
+    def apply(self, env_var: EnvVar):
+        self._joined = None
+        if env_var.action == EnvVarAction.SET:
+            self.prepends = []
+            self.value = env_var.value
+            self.appends = []
+        elif env_var.action == EnvVarAction.PREPEND:
+            self.prepends.append(env_var.value)
+        else:
+            self.appends.append(env_var.value)
+
+    def copy(self) -> "_EnvAccumulator":
+        accumulator = _EnvAccumulator()
+        accumulator.prepends = list(self.prepends)
+        accumulator.value = self.value
+        accumulator.appends = list(self.appends)
+        accumulator._joined = self._joined
+        return accumulator
+
+    def join(self, separator: str) -> str:
+        if self._joined is not None and self._joined[0] == separator:
+            return self._joined[1]
+        parts = self.prepends[::-1]
+        if self.value is not None:
+            parts.append(self.value)
+        parts.extend(self.appends)
+        joined = separator.join(parts)
+        self._joined = (separator, joined)
+        return joined
+
+    def extension(self, separator: str) -> Optional[tuple[str, str]]:
+        if self.value is not None:
+            return None
+        prefix = "".join(value + separator for value in self.prepends[::-1])
+        suffix = "".join(separator + value for value in self.appends)
+        return prefix, suffix
+
+
+# Folds resolved settings into a final environment in a single pass. Every key
+# has its own accumulator, so applying a setting never rescans earlier ones.
+# Copies share accumulators and provenance lists copy-on-write, which keeps
+# forking a resolved prefix for many presets cheap.
+class SettingsResolver:
+    def __init__(self, separator: str = os.pathsep):
+        self.separator = separator
+        self._environment: dict[str, _EnvAccumulator] = {}
+        self._packages: dict[str, PackageRequirement] = {}
+        self._tools: dict[str, Tool] = {}
+        self._icon: Optional[Icon] = None
+        self._environment_provenance: dict[str, list[ConfigurationSetting]] = {}
+        self._package_provenance: dict[str, list[ConfigurationSetting]] = {}
+        # Keys whose accumulator and provenance list are not shared.
+        self._owned_environment: set[str] = set()
+        self._owned_packages: set[str] = set()
+
+    def apply(self, config_setting: ConfigurationSetting) -> Self:
+        setting = config_setting.setting
+        if isinstance(setting, EnvVar):
+            key = setting.key
+            if key not in self._owned_environment:
+                self._owned_environment.add(key)
+                accumulator = self._environment.get(key)
+                if accumulator is None:
+                    self._environment[key] = _EnvAccumulator()
+                    self._environment_provenance[key] = []
+                else:
+                    self._environment[key] = accumulator.copy()
+                    self._environment_provenance[key] = list(
+                        self._environment_provenance[key]
+                    )
+            self._environment[key].apply(setting)
+            self._environment_provenance[key].append(config_setting)
+        elif isinstance(setting, PackageRequirement):
+            key = setting.package_name
+            if key not in self._owned_packages:
+                self._owned_packages.add(key)
+                self._package_provenance[key] = list(
+                    self._package_provenance.get(key, ())
+                )
+            # Later requirements win, but keep the package's first position.
+            self._packages[key] = setting
+            self._package_provenance[key].append(config_setting)
+        elif isinstance(setting, Tool):
+            self._tools.setdefault(setting.name, setting)
+        elif isinstance(setting, Icon):
+            self._icon = setting
+        return self
+
+    def apply_all(self, config_settings: Iterable[ConfigurationSetting]) -> Self:
+        for config_setting in config_settings:
+            self.apply(config_setting)
+        return self
+
+    def apply_holders(self, holders: Iterable[_SettingHolder]) -> Self:
+        for holder in holders:
+            for setting in holder.settings:  # type: ignore[attr-defined]
+                self.apply(ConfigurationSetting(setting, holder))
+        return self
+
+    def copy(self) -> "SettingsResolver":
+        resolver = SettingsResolver(self.separator)
+        resolver._environment = dict(self._environment)
+        resolver._packages = dict(self._packages)
+        resolver._tools = dict(self._tools)
+        resolver._icon = self._icon
+        resolver._environment_provenance = dict(self._environment_provenance)
+        resolver._package_provenance = dict(self._package_provenance)
+        self._share()
+        return resolver
+
+    def result(self) -> ResolvedEnvironment:
+        self._share()
+        return ResolvedEnvironment(
+            environment={
+                key: accumulator.join(self.separator)
+                for key, accumulator in self._environment.items()
+            },
+            packages=dict(self._packages),
+            tools=list(self._tools.values()),
+            icon=self._icon,
+            environment_provenance=dict(self._environment_provenance),
+            package_provenance=dict(self._package_provenance),
+            environment_extensions={
+                key: extension
+                for key, accumulator in self._environment.items()
+                if (extension := accumulator.extension(self.separator)) is not None
+            },
+        )
+
+    def _share(self):
+        self._owned_environment.clear()
+        self._owned_packages.clear()
+
+
+# The environment a tool is started in: `base_environment` with the resolved
+# variables, where a variable only prepended or appended to extends the
+# inherited value instead of replacing it.
+def fold_environment(
+    environment: Mapping[str, str],
+    extensions: Mapping[str, tuple[str, str]],
+    base_environment: Mapping[str, str],
+) -> dict[str, str]:
+    folded = dict(base_environment)
+    for key, value in environment.items():
+        inherited = folded.get(key)
+        extension = extensions.get(key)
+        if inherited and extension is not None:
+            folded[key] = extension[0] + inherited + extension[1]
+        else:
+            folded[key] = value
+    return folded
+
+
+def resolution_order(holder: Union[Configuration, Preset]) -> tuple[_SettingHolder, ...]:
+    if isinstance(holder, Preset):
+        return (*holder.base_configuration.get_resolution_order(), holder)
+    return holder.get_resolution_order()
+
+
+# Folds every holder's own settings in resolution order. The resolved settings
+# shown in the UI list a setting only once, where it first appears; here a
+# setting repeated further down the chain is applied again, so the most
+# specific holder setting a value wins.
+def resolve(
+    holder: Union[Configuration, Preset], separator: str = os.pathsep
+) -> ResolvedEnvironment:
+    return (
+        SettingsResolver(separator)
+        .apply_holders(resolution_order(holder))
+        .result()
+    )
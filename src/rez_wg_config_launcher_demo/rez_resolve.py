@@ -0,0 +1,380 @@
+import abc
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Iterable, Optional, Union
+
+from rez_wg_config_launcher_demo.batch import BatchResolver
+from rez_wg_config_launcher_demo.data_model import CacheStats, Preset
+from rez_wg_config_launcher_demo.resolver import resolve as resolve_settings
+
+PACKAGE_DEFINITION_FILE_NAME = "package.json"
+
+_REQUEST_PATTERN = re.compile(r"^([A-Za-z_][\w.-]*?)\s*((?:~=|==|!=|>=|<=|>|<).*)?$")
+_CLAUSE_PATTERN = re.compile(r"^(~=|==|!=|>=|<=|>|<)\s*(\S+)$")
+
+
+class PackageResolveError(ValueError):
+    pass
+
+
+def _version_key(version: str) -> tuple:
+    # Numeric parts compare as numbers and sort after alphanumeric ones, so
+    # "1.10" > "1.9" and "2.0" > "2.0.beta".
+    return tuple(
+        (1, int(part), "") if part.isdigit() else (0, 0, part)
+        for part in re.split(r"[.\-]", version)
+    )
+
+
+def parse_request(request: str) -> tuple[str, str]:
+    # "houdini~=20.5" -> ("houdini", "~=20.5"), the form PackageRequirement uses.
+    match = _REQUEST_PATTERN.match(request.strip())
+    if match is None:
+        raise PackageResolveError(f"Invalid package request '{request}'")
+    return match.group(1), (match.group(2) or "").strip()
+
+
+def version_matches(version: str, specifier: str) -> bool:
+    # Comma separated clauses that must all hold. "~=X.Y" is a compatible
+    # release: at least X.Y and starting with X (a single part only pins it).
+    key = _version_key(version)
+    for clause in filter(None, (part.strip() for part in specifier.split(","))):
+        match = _CLAUSE_PATTERN.match(clause)
+        if match is None:
+            raise PackageResolveError(f"Invalid version specifier '{clause}'")
+        operator, bound = match.groups()
+        bound_key = _version_key(bound)
+        if operator == "~=":
+            prefix = bound_key[:-1] if len(bound_key) > 1 else bound_key
+            if key < bound_key or key[: len(prefix)] != prefix:
+                return False
+        elif operator == "==":
+            if key[: len(bound_key)] != bound_key:
+                return False
+        elif operator == "!=":
+            if key[: len(bound_key)] == bound_key:
+                return False
+        elif operator == ">=" and not key >= bound_key:
+            return False
+        elif operator == "<=" and not key <= bound_key:
+            return False
+        elif operator == ">" and not key > bound_key:
+            return False
+        elif operator == "<" and not key < bound_key:
+            return False
+    return True
+
+
+@dataclass(frozen=True)
+class ResolvedPackage:
+    name: str
+    version: str
+    root: str
+
+    def __repr__(self) -> str:
+        return f"{self.name}-{self.version}"
+
+
+@dataclass
+class ResolvedContext:
+    requests: list[str]
+    packages: list[ResolvedPackage] = field(default_factory=lambda: [])
+    resolved_at: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": list(self.requests),
+            "packages": [
+                {"name": package.name, "version": package.version, "root": package.root}
+                for package in self.packages
+            ],
+            "resolved_at": self.resolved_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ResolvedContext":
+        return cls(
+            requests=list(data["requests"]),
+            packages=[
+                ResolvedPackage(package["name"], package["version"], package["root"])
+                for package in data["packages"]
+            ],
+            resolved_at=data["resolved_at"],
+        )
+
+
+# Turns package requests into the list of package versions a rez context
+# would contain.
+class PackageResolver(abc.ABC):
+    # Identifies what the resolver resolves against, part of every cache key
+    # so results against different repositories never mix.
+    @property
+    @abc.abstractmethod
+    def namespace(self) -> str:
+        pass
+
+    @abc.abstractmethod
+    def resolve(self, requests: list[str]) -> ResolvedContext:
+        pass
+
+
+# Stand-in for a rez filesystem package repository, for running and testing
+# without a rez install. Packages live at <path>/<name>/<version>/ with an
+# optional package.json holding {"requires": [...]}. Resolution picks the
+# highest version satisfying every request on a package and does not backtrack,
+# a conflict with an already chosen version is an error.
+class LocalPackageRepository(PackageResolver):
+    def __init__(self, paths: Iterable[str], delay: float = 0.0):
+        self.paths = [os.path.abspath(path) for path in paths]
+        # Seconds every resolve takes, to stand in for a real solver.
+        self.delay = delay
+
+    @property
+    def namespace(self) -> str:
+        return os.pathsep.join(self.paths)
+
+    def versions(self, name: str) -> list[tuple[str, str]]:
+        # (version, root) of every version of a package, highest first. The
+        # first path providing a version wins, like rez package search paths.
+        found: dict[str, str] = {}
+        for path in self.paths:
+            package_directory = os.path.join(path, name)
+            if not os.path.isdir(package_directory):
+                continue
+            for version in os.listdir(package_directory):
+                root = os.path.join(package_directory, version)
+                if version not in found and os.path.isdir(root):
+                    found[version] = root
+        return sorted(
+            found.items(), key=lambda item: _version_key(item[0]), reverse=True
+        )
+
+    def requires(self, root: str) -> list[str]:
+        definition = os.path.join(root, PACKAGE_DEFINITION_FILE_NAME)
+        if not os.path.isfile(definition):
+            return []
+        with open(definition, encoding="utf-8") as file:
+            return list(json.load(file).get("requires", []))
+
+    def resolve(self, requests: list[str]) -> ResolvedContext:
+        if self.delay:
+            time.sleep(self.delay)
+        specifiers: dict[str, list[str]] = {}
+        parsed = [parse_request(request) for request in requests]
+        # Every top level request constrains its package before any is chosen.
+        for name, specifier in parsed:
+            specifiers.setdefault(name, []).append(specifier)
+
+        chosen: dict[str, ResolvedPackage] = {}
+        pending = list(parsed)
+        while pending:
+            name, specifier = pending.pop(0)
+            specifiers.setdefault(name, [])
+            if specifier not in specifiers[name]:
+                specifiers[name].append(specifier)
+            package = chosen.get(name)
+            if package is not None:
+                if not version_matches(package.version, specifier):
+                    raise PackageResolveError(
+                        f"Conflict: {package!r} does not satisfy '{name}{specifier}'"
+                    )
+                continue
+            combined = ",".join(specifiers[name])
+            for version, root in self.versions(name):
+                if version_matches(version, combined):
+                    package = ResolvedPackage(name, version, root)
+                    break
+            else:
+                raise PackageResolveError(f"No package satisfies '{name}{combined}'")
+            chosen[name] = package
+            pending.extend(
+                parse_request(request) for request in self.requires(package.root)
+            )
+        return ResolvedContext(list(requests), list(chosen.values()), time.time())
+
+
+def write_package_repository(path: str, packages: dict[str, dict[str, list[str]]]):
+    # packages: name -> version -> requires
+    for name, versions in packages.items():
+        for version, requires in versions.items():
+            root = os.path.join(path, name, version)
+            os.makedirs(root, exist_ok=True)
+            definition = {"name": name, "version": version, "requires": requires}
+            definition_path = os.path.join(root, PACKAGE_DEFINITION_FILE_NAME)
+            with open(definition_path, "w", encoding="utf-8") as file:
+                json.dump(definition, file)
+
+
+def default_cache_directory() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "rez_wg_config_launcher_demo", "resolves")
+
+
+def resolve_key(requests: list[str], namespace: str) -> str:
+    # Request order is kept, rez resolves can depend on it.
+    payload = json.dumps([namespace, list(requests)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Resolved contexts on disk, one JSON file per distinct package request list.
+# Entries expire `ttl` seconds after they were resolved, so releases to the
+# repository are picked up eventually, and only the `max_entries` most recently
+# used are kept. Reading an entry touches its file, the modification time is
+# the LRU order and survives restarts.
+class ResolveCache:
+    def __init__(
+        self,
+        resolver: PackageResolver,
+        directory: Optional[str] = None,
+        max_entries: int = 1024,
+        ttl: float = 24 * 60 * 60,
+    ):
+        self.resolver = resolver
+        self.directory = directory or default_cache_directory()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # invalidations counts expired and evicted entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._prewarm_generation = 0
+
+    def key(self, requests: list[str]) -> str:
+        return resolve_key(requests, self.resolver.namespace)
+
+    def get(self, requests: list[str]) -> Optional[ResolvedContext]:
+        path = self._path(self.key(requests))
+        try:
+            with open(path, encoding="utf-8") as file:
+                context = ResolvedContext.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, or left half written or outdated by another process
+            return None
+        if time.time() - context.resolved_at > self.ttl:
+            with self._lock:
+                self.stats.invalidations += 1
+                self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return context
+
+    def resolve(self, requests: list[str]) -> ResolvedContext:
+        context = self.get(requests)
+        if context is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return context
+        with self._lock:
+            self.stats.misses += 1
+        context = self.resolver.resolve(requests)
+        self._store(self.key(requests), context)
+        return context
+
+    def resolve_preset(self, preset: Preset) -> ResolvedContext:
+        return self.resolve(preset_requests(preset))
+
+    def prewarm(self, presets: Iterable[Preset]) -> Future:
+        # Resolves the presets' contexts on a background thread so a launch
+        # finds them cached. Package requests are collected here, on the
+        # calling thread, as the data model is not thread safe; only the
+        # package resolves run in the background. Starting another pre-warm
+        # abandons the rest of this one. The future's result maps preset names
+        # to their context or the error message of a failed resolve.
+        batch = BatchResolver()
+        requests = {
+            preset.name: batch.resolve_preset(preset).package_requests()
+            for preset in presets
+        }
+        with self._lock:
+            self._prewarm_generation += 1
+            generation = self._prewarm_generation
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="resolve-prewarm"
+                )
+        return self._executor.submit(self._prewarm, requests, generation)
+
+    def clear(self):
+        with self._lock:
+            for name in self._entry_names():
+                self._remove(os.path.join(self.directory, name))
+
+    def shutdown(self):
+        with self._lock:
+            self._prewarm_generation += 1
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _prewarm(
+        self, requests: dict[str, list[str]], generation: int
+    ) -> dict[str, Union[ResolvedContext, str]]:
+        results: dict[str, Union[ResolvedContext, str]] = {}
+        for preset_name, package_requests in requests.items():
+            if generation != self._prewarm_generation:
+                break
+            try:
+                results[preset_name] = self.resolve(package_requests)
+            except PackageResolveError as error:
+                results[preset_name] = str(error)
+        return results
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _store(self, key: str, context: ResolvedContext):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Written next to the entry and renamed, readers never see half of it.
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(context.to_dict(), file)
+        os.replace(temporary_path, path)
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        names = self._entry_names()
+        if len(names) <= self.max_entries:
+            return
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            self.stats.invalidations += 1
+            self._remove(path)
+
+    def _entry_names(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [name for name in names if name.endswith(".json")]
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def preset_requests(preset: Preset) -> list[str]:
+    # The final package requirement list of a preset, what the cache is keyed on.
+    return resolve_settings(preset).package_requests()
@@ -0,0 +1,307 @@
+from bisect import bisect_right
+from typing import Any, Iterable, NamedTuple, Optional, Union
+
+from rez_wg_config_launcher_demo.data_model import (
+    ChangeKind,
+    Configuration,
+    ConfigurationSetting,
+    DataModelChange,
+    EnvVar,
+    Icon,
+    PackageRequirement,
+    Preset,
+    Project,
+    Tool,
+    _Setting,
+    _SettingHolder,
+    add_change_listener,
+    remove_change_listener,
+)
+from rez_wg_config_launcher_demo.resolver import SettingsResolver, resolution_order
+
+
+def setting_term(setting: _Setting) -> str:
+    # What a setting is found by: the variable, package or tool name, or the
+    # icon path.
+    if isinstance(setting, EnvVar):
+        return setting.key
+    if isinstance(setting, PackageRequirement):
+        return setting.package_name
+    if isinstance(setting, Tool):
+        return setting.name
+    if isinstance(setting, Icon):
+        return str(setting.icon)
+    raise TypeError(f"Cannot index setting {setting!r}")
+
+
+def setting_value(setting: _Setting) -> Any:
+    if isinstance(setting, EnvVar):
+        return setting.value
+    if isinstance(setting, PackageRequirement):
+        return setting.version_specifier
+    if isinstance(setting, Tool):
+        return setting.name
+    if isinstance(setting, Icon):
+        return setting.icon
+    raise TypeError(f"Cannot index setting {setting!r}")
+
+
+# A tuple rather than a dataclass, broad searches create many of these.
+class SettingMatch(NamedTuple):
+    holder: Union[Configuration, Preset]
+    setting: _Setting
+
+    @property
+    def value(self) -> Any:
+        return setting_value(self.setting)
+
+
+# What a holder ends up with for a term: the variable or package name (the
+# tool's name or icon path otherwise) and its resolved value, as setting_value
+# gives it. A variable's value only covers what the holders set, not the
+# inherited environment.
+class ResolvedMatch(NamedTuple):
+    holder: Union[Configuration, Preset]
+    setting_type: type
+    key: str
+    value: Any
+
+
+# Inverted index from setting terms (lower-cased variable, package and tool
+# names, icon paths) to the configurations and presets that set them. It is
+# built once and then kept up to date through the data model's change
+# listeners, so it must be closed when no longer needed. A list of projects is
+# followed when a ProjectsPatch replaces its contents.
+#
+# Holders are indexed by their own settings: find() tells where a setting is
+# made. find_resolved() tells which configurations and presets end up with it,
+# through their base configurations too, and with which value; it only folds
+# the settings under the term along the resolution orders of the holders
+# resolving through one that sets it.
+#
+#   index = SettingsIndex(root, projects)
+#   index.find("HOUDINI_OTLSCAN_PATH")          # exact term
+#   index.find("rs_houdini", PackageRequirement)
+#   index.find_resolved("rs_houdini", PackageRequirement)
+#   index.search("houdini")                     # any term containing the text
+class SettingsIndex:
+    def __init__(self, root: Configuration, projects: Iterable[Project] = ()):
+        self.root = root
+        # term -> holder -> that holder's settings under the term, in order
+        self._entries: dict[str, dict[_SettingHolder, list[_Setting]]] = {}
+        self._holder_terms: dict[_SettingHolder, list[str]] = {}
+        self._project_presets: dict[Project, list[Preset]] = {}
+        self._projects: Iterable[Project] = ()
+        # Every term joined into one string, so substring search runs in a
+        # single str.find loop. Rebuilt lazily once terms were added or removed.
+        self._terms: list[str] = []
+        self._term_offsets: list[int] = []
+        self._term_text: Optional[str] = None
+
+        for config in root.child_generator():
+            self._add_holder(config)
+        self.set_projects(projects)
+        add_change_listener(self._on_change)
+
+    def close(self):
+        remove_change_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_projects(self, projects: Iterable[Project]):
+        for presets in self._project_presets.values():
+            for preset in presets:
+                self._remove_holder(preset)
+        self._project_presets = {}
+        self._projects = projects
+        for project in projects:
+            self._add_project(project)
+
+    def find(self, term: str, setting_type: Optional[type] = None) -> list[SettingMatch]:
+        holders = self._entries.get(term.lower())
+        if not holders:
+            return []
+        return [
+            SettingMatch(holder, setting)  # type: ignore[arg-type]
+            for holder, settings in holders.items()
+            for setting in settings
+            if setting_type is None or isinstance(setting, setting_type)
+        ]
+
+    def find_resolved(
+        self, term: str, setting_type: Optional[type] = None
+    ) -> list[ResolvedMatch]:
+        setters = self._entries.get(term.lower())
+        if not setters:
+            return []
+        # Everything resolving through a configuration setting the term: its
+        # subtree and whatever inherits it, transitively.
+        affected: dict[Configuration, None] = {}
+        stack = [holder for holder in setters if isinstance(holder, Configuration)]
+        while stack:
+            config = stack.pop()
+            if config in affected:
+                continue
+            affected[config] = None
+            stack.extend(config.children)
+            stack.extend(config._inherited_by)
+        holders: list[Union[Configuration, Preset]] = list(affected)
+        for presets in self._project_presets.values():
+            holders.extend(
+                preset
+                for preset in presets
+                if preset in setters or preset.base_configuration in affected
+            )
+
+        matches = []
+        for holder in holders:
+            order = resolution_order(holder)
+            resolver = SettingsResolver()
+            for order_holder in order:
+                for setting in setters.get(order_holder, ()):
+                    if setting_type is None or isinstance(setting, setting_type):
+                        resolver.apply(ConfigurationSetting(setting, order_holder))
+            resolved = resolver.result()
+            for key, value in resolved.environment.items():
+                matches.append(ResolvedMatch(holder, EnvVar, key, value))
+            for name, requirement in resolved.packages.items():
+                matches.append(
+                    ResolvedMatch(
+                        holder, PackageRequirement, name, requirement.version_specifier
+                    )
+                )
+            for tool in resolved.tools:
+                matches.append(ResolvedMatch(holder, Tool, tool.name, tool.name))
+            # Only if no other icon is set after it.
+            if resolved.icon is not None and _last_icon(order) == resolved.icon:
+                icon = resolved.icon.icon
+                matches.append(ResolvedMatch(holder, Icon, str(icon), icon))
+        return matches
+
+    def holders(
+        self, term: str, setting_type: Optional[type] = None
+    ) -> list[Union[Configuration, Preset]]:
+        holders = self._entries.get(term.lower(), {})
+        return [
+            holder  # type: ignore[misc]
+            for holder, settings in holders.items()
+            if setting_type is None
+            or any(isinstance(setting, setting_type) for setting in settings)
+        ]
+
+    def matching_terms(self, text: str) -> list[str]:
+        text = text.lower()
+        if not text or "\n" in text:
+            return []
+        term_text = self._term_text
+        if term_text is None:
+            term_text = self._build_term_text()
+        terms = []
+        position = term_text.find(text)
+        while position >= 0:
+            term_index = bisect_right(self._term_offsets, position) - 1
+            terms.append(self._terms[term_index])
+            # Continue after this term, it is only reported once.
+            next_term = term_index + 1
+            if next_term == len(self._terms):
+                break
+            position = term_text.find(text, self._term_offsets[next_term])
+        return terms
+
+    def search(self, text: str, setting_type: Optional[type] = None) -> list[SettingMatch]:
+        matches = []
+        for term in self.matching_terms(text):
+            matches.extend(self.find(term, setting_type))
+        return matches
+
+    def search_holders(
+        self, text: str, setting_type: Optional[type] = None, limit: Optional[int] = None
+    ) -> list[Union[Configuration, Preset]]:
+        # Like search, but only the distinct holders, which is all a filter needs.
+        found: dict[Union[Configuration, Preset], None] = {}
+        for term in self.matching_terms(text):
+            for holder in self.holders(term, setting_type):
+                found[holder] = None
+                if limit is not None and len(found) >= limit:
+                    return list(found)
+        return list(found)
+
+    def _build_term_text(self) -> str:
+        self._terms = list(self._entries)
+        offsets = []
+        offset = 0
+        for term in self._terms:
+            offsets.append(offset)
+            offset += len(term) + 1
+        self._term_offsets = offsets
+        self._term_text = "\n".join(self._terms)
+        return self._term_text
+
+    def _add_holder(self, holder: _SettingHolder):
+        terms: dict[str, list[_Setting]] = {}
+        for setting in holder.settings:  # type: ignore[attr-defined]
+            terms.setdefault(setting_term(setting).lower(), []).append(setting)
+        for term, settings in terms.items():
+            holders = self._entries.get(term)
+            if holders is None:
+                holders = self._entries[term] = {}
+                self._term_text = None
+            holders[holder] = settings
+        self._holder_terms[holder] = list(terms)
+
+    def _remove_holder(self, holder: _SettingHolder):
+        for term in self._holder_terms.pop(holder, ()):
+            holders = self._entries[term]
+            del holders[holder]
+            if not holders:
+                del self._entries[term]
+                self._term_text = None
+
+    def _add_project(self, project: Project):
+        presets = list(project.presets)
+        self._project_presets[project] = presets
+        for preset in presets:
+            self._add_holder(preset)
+
+    def _on_change(self, change: DataModelChange):
+        subject = change.subject
+        if change.kind == ChangeKind.BULK:
+            # Settings changes come first, holders the transaction attached are
+            # only indexed once, by their parent change.
+            for bulk_change in change.changes:
+                self._on_change(bulk_change)
+
+        elif change.kind == ChangeKind.SETTINGS:
+            if subject in self._holder_terms:
+                self._remove_holder(subject)
+                self._add_holder(subject)
+
+        elif change.kind == ChangeKind.PARENT:
+            # Attached to, moved within or removed from the indexed tree
+            if subject.get_root() is self.root:
+                for config in subject.child_generator():
+                    if config not in self._holder_terms:
+                        self._add_holder(config)
+            elif subject in self._holder_terms:
+                for config in subject.child_generator():
+                    self._remove_holder(config)
+
+        elif change.kind == ChangeKind.PRESETS:
+            if not isinstance(subject, Project):
+                # The contents of a list of projects were replaced
+                if subject is self._projects:
+                    self.set_projects(subject)
+            elif subject in self._project_presets:
+                for preset in self._project_presets[subject]:
+                    self._remove_holder(preset)
+                self._add_project(subject)
+
+
+def _last_icon(order: Iterable[_SettingHolder]) -> Optional[Icon]:
+    icon = None
+    for holder in order:
+        for setting in holder.settings:  # type: ignore[attr-defined]
+            if isinstance(setting, Icon):
+                icon = setting
+    return icon
@@ -0,0 +1,152 @@
+import marshal
+from typing import Any
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    EnvVar,
+    EnvVarAction,
+    Icon,
+    PackageRequirement,
+    Preset,
+    Project,
+    Tool,
+    _Setting,
+)
+
+FORMAT_VERSION = 1
+
+_ENV_VAR = 0
+_PACKAGE_REQUIREMENT = 1
+_ICON = 2
+_TOOL = 3
+
+
+class StringTable:
+    def __init__(self):
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def id(self, string: str) -> int:
+        string_id = self._ids.get(string)
+        if string_id is None:
+            string_id = self._ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+
+def encode_setting(setting: _Setting, strings: StringTable) -> tuple[int, ...]:
+    if isinstance(setting, EnvVar):
+        return (
+            _ENV_VAR,
+            strings.id(setting.key),
+            strings.id(setting.value),
+            setting.action.value,
+        )
+    if isinstance(setting, PackageRequirement):
+        return (
+            _PACKAGE_REQUIREMENT,
+            strings.id(setting.package_name),
+            strings.id(setting.version_specifier),
+        )
+    if isinstance(setting, Icon):
+        return (_ICON, strings.id(str(setting.icon)))
+    if isinstance(setting, Tool):
+        return (_TOOL, strings.id(setting.name))
+    raise TypeError(f"Cannot serialize setting {setting!r}")
+
+
+def decode_setting(encoded: tuple[int, ...], strings: list[str]) -> _Setting:
+    kind = encoded[0]
+    if kind == _ENV_VAR:
+        return EnvVar(strings[encoded[1]], strings[encoded[2]], EnvVarAction(encoded[3]))
+    if kind == _PACKAGE_REQUIREMENT:
+        return PackageRequirement(strings[encoded[1]], strings[encoded[2]])
+    if kind == _ICON:
+        return Icon(strings[encoded[1]])
+    if kind == _TOOL:
+        return Tool(strings[encoded[1]])
+    raise ValueError(f"Unknown setting kind {kind}")
+
+
+# The compact form is made of plain tuples of ints referencing one interned
+# string table, so it marshals quickly and every repeated key, value or package
+# name is stored once:
+#
+#   (version, strings, nodes, projects)
+#   node    = (name, parent index or -1, (inherits indices), (settings))
+#   project = (name, short name, ((preset name, base index, (settings)), ...))
+#
+# Nodes are stored in pre-order, so parents always precede their children.
+def encode_tree(root: Configuration, projects: list[Project]) -> tuple[Any, ...]:
+    strings = StringTable()
+    nodes = list(root.child_generator())
+    node_ids = {config: index for index, config in enumerate(nodes)}
+
+    encoded_nodes = tuple(
+        (
+            strings.id(config.name),
+            node_ids[config.parent] if config.parent is not None else -1,
+            tuple(node_ids[inherit] for inherit in config.inherits),
+            tuple(encode_setting(setting, strings) for setting in config.settings),
+        )
+        for config in nodes
+    )
+
+    encoded_projects = []
+    for project in projects:
+        encoded_presets = []
+        for preset in project.presets:
+            base_id = node_ids.get(preset.base_configuration)
+            if base_id is None:
+                raise ValueError(
+                    f"Preset '{preset.name}' is based on '{preset.base_configuration.name}',"
+                    f" which is not part of the '{root.name}' tree"
+                )
+            encoded_presets.append(
+                (
+                    strings.id(preset.name),
+                    base_id,
+                    tuple(encode_setting(setting, strings) for setting in preset.settings),
+                )
+            )
+        encoded_projects.append(
+            (strings.id(project.name), strings.id(project.short_name), tuple(encoded_presets))
+        )
+
+    return (FORMAT_VERSION, tuple(strings.strings), encoded_nodes, tuple(encoded_projects))
+
+
+def decode_tree(encoded: tuple[Any, ...]) -> tuple[Configuration, list[Project]]:
+    version, strings, encoded_nodes, encoded_projects = encoded
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported tree format version {version}")
+
+    nodes: list[Configuration] = []
+    for name, parent_id, _, settings in encoded_nodes:
+        config = Configuration(strings[name])
+        config.settings = [decode_setting(setting, strings) for setting in settings]
+        if parent_id >= 0:
+            config.set_parent_configuration(nodes[parent_id])
+        nodes.append(config)
+    for config, (_, _, inherits, _) in zip(nodes, encoded_nodes):
+        for inherit_id in inherits:
+            config.add_inheriting_configuration(nodes[inherit_id])
+
+    projects = []
+    for name, short_name, encoded_presets in encoded_projects:
+        project = Project(strings[name], strings[short_name])
+        for preset_name, base_id, settings in encoded_presets:
+            preset = Preset(strings[preset_name], nodes[base_id])
+            preset.settings = [decode_setting(setting, strings) for setting in settings]
+            project.add_preset(preset)
+        projects.append(project)
+
+    return nodes[0], projects
+
+
+def dumps_tree(root: Configuration, projects: list[Project]) -> bytes:
+    return marshal.dumps(encode_tree(root, projects))
+
+
+def loads_tree(data: bytes) -> tuple[Configuration, list[Project]]:
+    return decode_tree(marshal.loads(data))
@@ -0,0 +1,261 @@
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from rez_wg_config_launcher_demo.data_model import (
+    CacheStats,
+    EnvVar,
+    Icon,
+    PackageRequirement,
+    Preset,
+    Tool,
+    _Setting,
+)
+from rez_wg_config_launcher_demo.resolver import fold_environment, resolve
+
+if TYPE_CHECKING:
+    from rez_wg_config_launcher_demo.rez_resolve import ResolveCache
+
+# Part of every fingerprint, bump it when the snapshot contents change meaning.
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def default_snapshot_directory() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "rez_wg_config_launcher_demo", "snapshots")
+
+
+def _setting_key(setting: _Setting) -> list[str]:
+    if isinstance(setting, EnvVar):
+        return ["env", setting.key, setting.value, setting.action.name]
+    if isinstance(setting, PackageRequirement):
+        return ["package", setting.package_name, setting.version_specifier]
+    if isinstance(setting, Icon):
+        return ["icon", str(setting.icon)]
+    if isinstance(setting, Tool):
+        return ["tool", setting.name]
+    raise TypeError(f"Cannot fingerprint setting {setting!r}")
+
+
+def preset_fingerprint(
+    preset: Preset, separator: str = os.pathsep, namespace: str = ""
+) -> str:
+    # Hash of everything a preset's launch environment is computed from: the
+    # settings of every holder configuration_preset_generator yields, in
+    # resolution order, plus the separator and the package repository the
+    # context was resolved against. Names are left out, presets resolving
+    # through the same settings share a snapshot. Computing it walks the
+    # configuration tree but does not resolve anything.
+    digest = hashlib.sha256()
+    header = [SNAPSHOT_FORMAT_VERSION, separator, namespace]
+    digest.update(json.dumps(header).encode("utf-8"))
+    for holder in preset.configuration_preset_generator():
+        settings = [
+            _setting_key(setting)
+            for setting in holder.settings  # type: ignore[attr-defined]
+        ]
+        digest.update(b"\n")
+        digest.update(json.dumps(settings, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Everything needed to start a preset's tool, frozen when it was resolved.
+# `context` is the resolved package context, when one was resolved;
+# `environment_extensions` as in ResolvedEnvironment.
+@dataclass
+class LaunchSnapshot:
+    fingerprint: str
+    environment: dict[str, str]
+    packages: list[str]
+    tools: list[str]
+    icon: Optional[str] = None
+    context: Optional[dict[str, Any]] = None
+    environment_extensions: dict[str, tuple[str, str]] = field(
+        default_factory=lambda: {}
+    )
+    created_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "environment": self.environment,
+            "environment_extensions": self.environment_extensions,
+            "packages": self.packages,
+            "tools": self.tools,
+            "icon": self.icon,
+            "context": self.context,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LaunchSnapshot":
+        if data.get("version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data.get('version')}")
+        return cls(
+            fingerprint=data["fingerprint"],
+            environment=dict(data["environment"]),
+            packages=list(data["packages"]),
+            tools=list(data["tools"]),
+            icon=data["icon"],
+            context=data["context"],
+            environment_extensions={
+                key: (prefix, suffix)
+                for key, (prefix, suffix) in data["environment_extensions"].items()
+            },
+            created_at=data["created_at"],
+        )
+
+
+# Content addressed snapshots on disk: `snapshots/<ab>/<fingerprint>.json`,
+# plus one small pointer per project and preset naming the fingerprint it was
+# last frozen with. Changing any contributing setting changes the fingerprint,
+# so a stale snapshot is never picked up by fingerprint; pointers are moved on
+# by freezing again, e.g. whenever configurations are published.
+class SnapshotStore:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        separator: str = os.pathsep,
+        resolve_cache: Optional["ResolveCache"] = None,
+    ):
+        self.directory = directory or default_snapshot_directory()
+        self.separator = separator
+        self.resolve_cache = resolve_cache
+        # hits: frozen presets whose snapshot already existed
+        self.stats = CacheStats()
+
+    def fingerprint(self, preset: Preset) -> str:
+        namespace = ""
+        if self.resolve_cache is not None:
+            namespace = self.resolve_cache.resolver.namespace
+        return preset_fingerprint(preset, self.separator, namespace)
+
+    def freeze(self, preset: Preset, project_name: str) -> LaunchSnapshot:
+        fingerprint = self.fingerprint(preset)
+        snapshot = self.get(fingerprint)
+        if snapshot is None:
+            self.stats.misses += 1
+            snapshot = self._create(preset, fingerprint)
+            self._write(self._snapshot_path(fingerprint), snapshot.to_dict())
+        else:
+            self.stats.hits += 1
+        pointer_path = self._pointer_path(project_name, preset.name)
+        pointer = self._read(pointer_path)
+        if pointer is None or pointer.get("fingerprint") != fingerprint:
+            pointer = {"project": project_name, "preset": preset.name}
+            self._write(pointer_path, dict(pointer, fingerprint=fingerprint))
+        return snapshot
+
+    def get(self, fingerprint: str) -> Optional[LaunchSnapshot]:
+        data = self._read(self._snapshot_path(fingerprint))
+        if data is None:
+            return None
+        try:
+            snapshot = LaunchSnapshot.from_dict(data)
+        except (ValueError, KeyError, TypeError):
+            return None
+        # The address is the content's identity, never trust a mismatch.
+        return snapshot if snapshot.fingerprint == fingerprint else None
+
+    def lookup(self, project_name: str, preset_name: str) -> Optional[LaunchSnapshot]:
+        # The snapshot a preset was last frozen with, without loading any
+        # configuration.
+        pointer = self._read(self._pointer_path(project_name, preset_name))
+        if pointer is None or "fingerprint" not in pointer:
+            return None
+        return self.get(pointer["fingerprint"])
+
+    def load(self, path: str) -> LaunchSnapshot:
+        data = self._read(path)
+        if data is None:
+            raise SnapshotError(f"Cannot read snapshot '{path}'")
+        try:
+            return LaunchSnapshot.from_dict(data)
+        except (ValueError, KeyError, TypeError) as error:
+            raise SnapshotError(f"Invalid snapshot '{path}': {error}") from error
+
+    def _create(self, preset: Preset, fingerprint: str) -> LaunchSnapshot:
+        resolved = resolve(preset, self.separator)
+        packages = resolved.package_requests()
+        context = None
+        if self.resolve_cache is not None:
+            context = self.resolve_cache.resolve(packages).to_dict()
+        return LaunchSnapshot(
+            fingerprint=fingerprint,
+            environment=dict(resolved.environment),
+            packages=packages,
+            tools=[tool.name for tool in resolved.tools],
+            icon=str(resolved.icon.icon) if resolved.icon is not None else None,
+            context=context,
+            environment_extensions=dict(resolved.environment_extensions),
+        )
+
+    def _snapshot_path(self, fingerprint: str) -> str:
+        return os.path.join(
+            self.directory, "snapshots", fingerprint[:2], f"{fingerprint}.json"
+        )
+
+    def _pointer_path(self, project_name: str, preset_name: str) -> str:
+        # Preset names are free text, the file is named by their hash.
+        names = json.dumps([project_name, preset_name]).encode("utf-8")
+        return os.path.join(
+            self.directory, "presets", f"{hashlib.sha256(names).hexdigest()}.json"
+        )
+
+    @staticmethod
+    def _read(path: str) -> Optional[dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path: str, data: dict[str, Any]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written next to the file and renamed, readers never see half of it.
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temporary_path, path)
+
+
+def launch_environment(
+    snapshot: LaunchSnapshot, base_environment: Optional[dict[str, str]] = None
+) -> dict[str, str]:
+    # Variables the preset does not set are inherited from the base
+    # environment, by default the launching process's, and the ones it only
+    # prepends or appends to are extended.
+    return fold_environment(
+        snapshot.environment,
+        snapshot.environment_extensions,
+        os.environ if base_environment is None else base_environment,
+    )
+
+
+def launch(
+    snapshot: LaunchSnapshot,
+    command: Optional[Sequence[str]] = None,
+    base_environment: Optional[dict[str, str]] = None,
+    **popen_kwargs: Any,
+) -> subprocess.Popen:
+    # Starts the command, by default the snapshot's first tool, in the frozen
+    # environment.
+    if not command:
+        if not snapshot.tools:
+            raise SnapshotError("The snapshot has no tool, pass the command to run")
+        command = [snapshot.tools[0]]
+    environment = launch_environment(snapshot, base_environment)
+    return subprocess.Popen(list(command), env=environment, **popen_kwargs)
@@ -0,0 +1,718 @@
+from collections import UserList
+from dataclasses import dataclass, field
+import json
+import marshal
+import mmap
+import os
+import struct
+from typing import Any, Callable, Iterator, Optional
+
+from rez_wg_config_launcher_demo.data_model import (
+    Configuration,
+    EnvVar,
+    EnvVarAction,
+    Icon,
+    PackageRequirement,
+    Preset,
+    Project,
+    Tool,
+    _Setting,
+)
+from rez_wg_config_launcher_demo.patches import (
+    AddConfigurationPatch,
+    InheritsPatch,
+    MoveConfigurationPatch,
+    Patch,
+    ProjectsPatch,
+    RemoveConfigurationPatch,
+    SettingsPatch,
+)
+from rez_wg_config_launcher_demo.serialization import (
+    StringTable,
+    decode_setting,
+    encode_setting,
+)
+
+CONFIGURATIONS_DIRECTORY = "configurations"
+PROJECTS_DIRECTORY = "projects"
+CACHE_FILE_NAME = ".config_cache"
+
+_CACHE_MAGIC = b"RWGC"
+_CACHE_VERSION = 1
+# magic, version, header length
+_CACHE_PREFIX = struct.Struct("<4sIQ")
+
+
+class ConfigStoreError(ValueError):
+    pass
+
+
+# A list of settings that is only decoded on first access. Configurations loaded
+# from the binary cache hold one of these, so settings of nodes nobody looks at
+# are never materialized.
+class LazySettingList(UserList):
+    def __init__(self, loader: Callable[[], list[_Setting]]):
+        self._source: Optional[Callable[[], list[_Setting]]] = loader
+        self._loader: Optional[Callable[[], list[_Setting]]] = loader
+        self._data: list[_Setting] = []
+
+    @property
+    def data(self) -> list[_Setting]:  # type: ignore[override]
+        if self._loader is not None:
+            self._data = self._loader()
+            self._loader = None
+        return self._data
+
+    @data.setter
+    def data(self, value: list[_Setting]):
+        self._source = None
+        self._loader = None
+        self._data = value
+
+    @property
+    def materialized(self) -> bool:
+        return self._loader is None
+
+    def release(self):
+        # Drops the decoded settings, they are decoded again on next access.
+        # Settings that were assigned rather than loaded have nowhere to be
+        # reloaded from and are kept.
+        if self._source is not None:
+            self._loader = self._source
+            self._data = []
+
+    def detach(self):
+        # Decodes the settings if they were not yet and forgets where they came
+        # from, so the source can go away.
+        self._data = self.data
+        self._source = None
+
+    def __iter__(self) -> Iterator[_Setting]:
+        return iter(self.data)
+
+
+def _forget_source(method: Callable[..., Any]) -> Callable[..., Any]:
+    def mutate(self: LazySettingList, *args: Any, **kwargs: Any) -> Any:
+        # Edited settings differ from the decoded ones, `release` must keep them.
+        self._source = None
+        return method(self, *args, **kwargs)
+
+    return mutate
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "reverse",
+    "sort",
+    "extend",
+):
+    setattr(LazySettingList, _name, _forget_source(getattr(UserList, _name)))
+
+
+def setting_to_json(setting: _Setting) -> dict[str, Any]:
+    if isinstance(setting, EnvVar):
+        return {"env": setting.key, "value": setting.value, "action": setting.action.name}
+    if isinstance(setting, PackageRequirement):
+        return {"package": setting.package_name, "version": setting.version_specifier}
+    if isinstance(setting, Icon):
+        return {"icon": str(setting.icon)}
+    if isinstance(setting, Tool):
+        return {"tool": setting.name}
+    raise TypeError(f"Cannot serialize setting {setting!r}")
+
+
+def setting_from_json(data: dict[str, Any]) -> _Setting:
+    if "env" in data:
+        return EnvVar(data["env"], data["value"], EnvVarAction[data.get("action", "SET")])
+    if "package" in data:
+        return PackageRequirement(data["package"], data.get("version", ""))
+    if "icon" in data:
+        return Icon(data["icon"])
+    if "tool" in data:
+        return Tool(data["tool"])
+    raise ConfigStoreError(f"Unknown setting {data!r}")
+
+
+@dataclass
+class ConfigurationRecord:
+    name: str
+    parent: Optional[str] = None
+    inherits: list[str] = field(default_factory=lambda: [])
+    settings: list[_Setting] = field(default_factory=lambda: [])
+
+
+@dataclass
+class PresetRecord:
+    name: str
+    base: str
+    settings: list[_Setting] = field(default_factory=lambda: [])
+
+
+@dataclass
+class ProjectRecord:
+    name: str
+    short_name: str
+    presets: list[PresetRecord] = field(default_factory=lambda: [])
+
+
+def read_configuration_file(path: str) -> ConfigurationRecord:
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    try:
+        return ConfigurationRecord(
+            name=data["name"],
+            parent=data.get("parent"),
+            inherits=list(data.get("inherits", [])),
+            settings=[setting_from_json(setting) for setting in data.get("settings", [])],
+        )
+    except (KeyError, TypeError) as error:
+        raise ConfigStoreError(f"Invalid configuration file '{path}': {error}") from error
+
+
+def read_project_file(path: str) -> ProjectRecord:
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    try:
+        return ProjectRecord(
+            name=data["name"],
+            short_name=data.get("short_name", data["name"]),
+            presets=[
+                PresetRecord(
+                    name=preset["name"],
+                    base=preset["base"],
+                    settings=[
+                        setting_from_json(setting) for setting in preset.get("settings", [])
+                    ],
+                )
+                for preset in data.get("presets", [])
+            ],
+        )
+    except (KeyError, TypeError) as error:
+        raise ConfigStoreError(f"Invalid project file '{path}': {error}") from error
+
+
+def _scan_source_files(directory: str, kind: str) -> list[tuple[str, int, int]]:
+    # (path relative to `directory`, mtime in ns, size) for every JSON file,
+    # sorted so the order of children is stable between loads.
+    files = []
+    stack = [kind]
+    while stack:
+        relative_directory = stack.pop()
+        try:
+            entries = sorted(
+                os.scandir(os.path.join(directory, relative_directory)),
+                key=lambda entry: entry.name,
+            )
+        except FileNotFoundError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            relative_path = f"{relative_directory}/{entry.name}"
+            if entry.is_dir():
+                subdirectories.append(relative_path)
+            elif entry.name.endswith(".json"):
+                stat = entry.stat()
+                files.append((relative_path, stat.st_mtime_ns, stat.st_size))
+        stack.extend(reversed(subdirectories))
+    return files
+
+
+def _build_project(
+    record: ProjectRecord, find_configuration: Callable[[str], Optional[Configuration]]
+) -> Project:
+    project = Project(record.name, record.short_name)
+    for preset_record in record.presets:
+        base = find_configuration(preset_record.base)
+        if base is None:
+            raise ConfigStoreError(
+                f"Preset '{preset_record.name}' of '{record.name}'"
+                f" uses unknown configuration '{preset_record.base}'"
+            )
+        preset = Preset(preset_record.name, base)
+        preset.settings = preset_record.settings
+        project.add_preset(preset)
+    return project
+
+
+def _build_tree(
+    configurations: list[ConfigurationRecord], projects: list[ProjectRecord]
+) -> tuple[Configuration, list[Project]]:
+    nodes: dict[str, Configuration] = {}
+    for record in configurations:
+        if record.name in nodes:
+            raise ConfigStoreError(f"Configuration '{record.name}' is defined twice")
+        config = Configuration(record.name)
+        config.settings = record.settings
+        nodes[record.name] = config
+
+    roots = [record for record in configurations if not record.parent]
+    if len(roots) != 1:
+        raise ConfigStoreError(
+            f"Expected exactly one root configuration, found {[r.name for r in roots]}"
+        )
+
+    # Attach parents top-down so every subtree is merged into the root index as
+    # soon as it is connected.
+    children: dict[str, list[ConfigurationRecord]] = {}
+    for record in configurations:
+        if record.parent:
+            if record.parent not in nodes:
+                raise ConfigStoreError(
+                    f"Configuration '{record.name}' has unknown parent '{record.parent}'"
+                )
+            children.setdefault(record.parent, []).append(record)
+    stack = [roots[0]]
+    attached = 1
+    while stack:
+        record = stack.pop()
+        for child in children.get(record.name, []):
+            nodes[child.name].set_parent_configuration(nodes[record.name])
+        attached += len(children.get(record.name, []))
+        stack.extend(children.get(record.name, []))
+    if attached != len(nodes):
+        raise ConfigStoreError("Some configurations are not connected to the root")
+
+    for record in configurations:
+        for inherit in record.inherits:
+            if inherit not in nodes:
+                raise ConfigStoreError(
+                    f"Configuration '{record.name}' inherits unknown '{inherit}'"
+                )
+            nodes[record.name].add_inheriting_configuration(nodes[inherit])
+
+    loaded_projects = [_build_project(record, nodes.get) for record in projects]
+
+    return nodes[roots[0].name], loaded_projects
+
+
+# Binary cache layout:
+#
+#   magic, version, header length (_CACHE_PREFIX)
+#   header: marshalled (fingerprint, strings, configurations, projects)
+#       configuration = (name, parent or -1, (inherits), blob offset, blob size)
+#       project       = (name, short name, ((preset name, base, offset, size), ...))
+#   blobs: one marshalled tuple of encoded settings per configuration / preset
+#
+# All names and setting strings are ids into the interned string table. The file
+# is memory-mapped and a blob is only unmarshalled when its settings are first
+# accessed.
+def _write_cache(
+    cache_path: str,
+    fingerprint: tuple[tuple[str, int, int], ...],
+    configurations: list[ConfigurationRecord],
+    projects: list[ProjectRecord],
+):
+    strings = StringTable()
+    blobs: list[bytes] = []
+    offset = 0
+
+    def add_blob(settings: list[_Setting]) -> tuple[int, int]:
+        nonlocal offset
+        blob = marshal.dumps(tuple(encode_setting(setting, strings) for setting in settings))
+        blobs.append(blob)
+        location = (offset, len(blob))
+        offset += len(blob)
+        return location
+
+    encoded_configurations = tuple(
+        (
+            strings.id(record.name),
+            strings.id(record.parent) if record.parent else -1,
+            tuple(strings.id(inherit) for inherit in record.inherits),
+            *add_blob(record.settings),
+        )
+        for record in configurations
+    )
+    encoded_projects = tuple(
+        (
+            strings.id(project.name),
+            strings.id(project.short_name),
+            tuple(
+                (strings.id(preset.name), strings.id(preset.base), *add_blob(preset.settings))
+                for preset in project.presets
+            ),
+        )
+        for project in projects
+    )
+    header = marshal.dumps(
+        (fingerprint, tuple(strings.strings), encoded_configurations, encoded_projects)
+    )
+
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_CACHE_PREFIX.pack(_CACHE_MAGIC, _CACHE_VERSION, len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+    # Replace atomically so processes that still map the old cache keep a
+    # consistent view.
+    os.replace(temporary_path, cache_path)
+
+
+# Returns the mapping along with the records, settings are decoded from it until
+# it is closed. Every LazySettingList handed out is added to `lazy_settings`.
+def _read_cache(
+    cache_path: str,
+    fingerprint: tuple[tuple[str, int, int], ...],
+    lazy_settings: list[LazySettingList],
+) -> Optional[tuple[list[ConfigurationRecord], list[ProjectRecord], mmap.mmap]]:
+    try:
+        with open(cache_path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, header_size = _CACHE_PREFIX.unpack_from(mapped)
+        if magic != _CACHE_MAGIC or version != _CACHE_VERSION:
+            mapped.close()
+            return None
+        header_end = _CACHE_PREFIX.size + header_size
+        cached_fingerprint, strings, encoded_configurations, encoded_projects = (
+            marshal.loads(mapped[_CACHE_PREFIX.size : header_end])
+        )
+    except (struct.error, EOFError, ValueError, TypeError):
+        mapped.close()
+        return None
+    if cached_fingerprint != fingerprint:
+        mapped.close()
+        return None
+
+    def lazy_setting_list(offset: int, size: int) -> LazySettingList:
+        start = header_end + offset
+        end = start + size
+
+        def load() -> list[_Setting]:
+            return [decode_setting(setting, strings) for setting in marshal.loads(mapped[start:end])]
+
+        settings = LazySettingList(load)
+        lazy_settings.append(settings)
+        return settings
+
+    configurations = [
+        ConfigurationRecord(
+            name=strings[name],
+            parent=strings[parent] if parent >= 0 else None,
+            inherits=[strings[inherit] for inherit in inherits],
+            settings=lazy_setting_list(offset, size),  # type: ignore[arg-type]
+        )
+        for name, parent, inherits, offset, size in encoded_configurations
+    ]
+    projects = [
+        ProjectRecord(
+            name=strings[name],
+            short_name=strings[short_name],
+            presets=[
+                PresetRecord(
+                    strings[preset], strings[base], lazy_setting_list(offset, size)  # type: ignore[arg-type]
+                )
+                for preset, base, offset, size in presets
+            ],
+        )
+        for name, short_name, presets in encoded_projects
+    ]
+    return configurations, projects, mapped
+
+
+# A loaded config directory. Besides loading, it remembers which file defined
+# which configuration or project, so reload() only re-parses files whose
+# fingerprint changed and turns them into patches against the loaded tree.
+# Settings loaded from the binary cache are decoded from its memory mapping on
+# first access; close() (or leaving a `with` block) decodes the ones nobody
+# accessed yet and closes the mapping.
+class ConfigSource:
+    def __init__(self, directory: str, cache_path: Optional[str] = None):
+        self.directory = directory
+        self.cache_path = cache_path or os.path.join(directory, CACHE_FILE_NAME)
+        self.root: Optional[Configuration] = None
+        self.projects: list[Project] = []
+        self._files: dict[str, tuple[int, int]] = {}
+        self._configuration_names: dict[str, str] = {}
+        self._project_records: dict[str, ProjectRecord] = {}
+        self._cache: Optional[mmap.mmap] = None
+        self._cached_settings: list[LazySettingList] = []
+
+    def __enter__(self) -> "ConfigSource":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for settings in self._cached_settings:
+            settings.detach()
+        self._cached_settings = []
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _scan(self) -> tuple[list[tuple[str, int, int]], list[tuple[str, int, int]]]:
+        return (
+            _scan_source_files(self.directory, CONFIGURATIONS_DIRECTORY),
+            _scan_source_files(self.directory, PROJECTS_DIRECTORY),
+        )
+
+    def load(self) -> tuple[Configuration, list[Project]]:
+        configuration_files, project_files = self._scan()
+        fingerprint = tuple(configuration_files + project_files)
+
+        self.close()
+        cached = _read_cache(self.cache_path, fingerprint, self._cached_settings)
+        if cached is not None:
+            configurations, projects, self._cache = cached
+            records = (configurations, projects)
+        else:
+            records = (
+                [
+                    read_configuration_file(os.path.join(self.directory, path))
+                    for path, _, _ in configuration_files
+                ],
+                [
+                    read_project_file(os.path.join(self.directory, path))
+                    for path, _, _ in project_files
+                ],
+            )
+            try:
+                _write_cache(self.cache_path, fingerprint, *records)
+            except OSError:
+                # A read-only config location still loads, just without the cache.
+                pass
+
+        configurations, projects = records
+        self.root, self.projects = _build_tree(configurations, projects)
+        self._files = {path: (mtime, size) for path, mtime, size in fingerprint}
+        self._configuration_names = {
+            path: record.name
+            for (path, _, _), record in zip(configuration_files, configurations)
+        }
+        self._project_records = {
+            path: record for (path, _, _), record in zip(project_files, projects)
+        }
+        return self.root, self.projects
+
+    def _changes(self) -> tuple[list[str], dict[str, tuple[int, int]]]:
+        configuration_files, project_files = self._scan()
+        current = {
+            path: (mtime, size)
+            for path, mtime, size in configuration_files + project_files
+        }
+        changed = [path for path, stamp in current.items() if self._files.get(path) != stamp]
+        changed.extend(path for path in self._files if path not in current)
+        return changed, current
+
+    def changed_files(self) -> list[str]:
+        return self._changes()[0]
+
+    def watched_paths(self) -> list[str]:
+        # Every source file plus the directories holding them, so added and
+        # removed files are noticed as well as edits.
+        paths = []
+        for kind in (CONFIGURATIONS_DIRECTORY, PROJECTS_DIRECTORY):
+            for dirpath, _, filenames in os.walk(os.path.join(self.directory, kind)):
+                paths.append(dirpath)
+                paths.extend(
+                    os.path.join(dirpath, filename)
+                    for filename in filenames
+                    if filename.endswith(".json")
+                )
+        return paths
+
+    def reload(self) -> list[Patch]:
+        changed, current = self._changes()
+        if not changed or self.root is None:
+            return []
+
+        configuration_changes: dict[str, Optional[ConfigurationRecord]] = {}
+        project_changes: dict[str, Optional[ProjectRecord]] = {}
+        for path in changed:
+            full_path = os.path.join(self.directory, path)
+            exists = path in current
+            if path.startswith(CONFIGURATIONS_DIRECTORY + "/"):
+                configuration_changes[path] = (
+                    read_configuration_file(full_path) if exists else None
+                )
+            else:
+                project_changes[path] = read_project_file(full_path) if exists else None
+
+        root = self.root
+        removed: list[Configuration] = []
+        added: dict[str, ConfigurationRecord] = {}
+        updated: dict[str, ConfigurationRecord] = {}
+        for path, record in configuration_changes.items():
+            old_name = self._configuration_names.get(path)
+            if record is not None and record.name == old_name:
+                updated[record.name] = record
+                continue
+            if old_name is not None:
+                removed.append(root.get_child_by_name(old_name))  # type: ignore[arg-type]
+            if record is not None:
+                added[record.name] = record
+
+        # A configuration that moved to another file keeps its node.
+        for config in list(removed):
+            if config.name in added:
+                updated[config.name] = added.pop(config.name)
+                removed.remove(config)
+
+        removed_set = set(removed)
+        new_nodes = {name: Configuration(name) for name in added}
+        for name, record in added.items():
+            new_nodes[name].settings = record.settings
+
+        def find(name: Optional[str]) -> Optional[Configuration]:
+            if name is None:
+                return None
+            config = new_nodes.get(name) or root.get_child_by_name(name)
+            return None if config in removed_set else config
+
+        patches: list[Patch] = []
+        # Children go before their parents, so a removal never orphans a node.
+        for config in sorted(removed, key=lambda config: -config.path.count("/")):
+            remaining = [child for child in config.children if child not in removed_set]
+            if remaining:
+                raise ConfigStoreError(
+                    f"Cannot remove '{config.name}', '{remaining[0].name}' is its child"
+                )
+            for inheriting in config.inherited_by:
+                if inheriting not in removed_set and inheriting.name not in updated:
+                    raise ConfigStoreError(
+                        f"Cannot remove '{config.name}', '{inheriting.name}' inherits it"
+                    )
+            patches.append(RemoveConfigurationPatch(config))
+
+        # Projects are only rebuilt, and their presets' base configurations
+        # looked up again, when a project file changed.
+        if removed_set and not project_changes:
+            for project in self.projects:
+                for preset in project.presets:
+                    if preset.base_configuration in removed_set:
+                        raise ConfigStoreError(
+                            f"Cannot remove '{preset.base_configuration.name}',"
+                            f" preset '{preset.name}' of '{project.name}' uses it"
+                        )
+
+        # Parents go before their children, so every new node is attached to a
+        # node that is already part of the tree.
+        pending = dict(added)
+        while pending:
+            ready = [record for record in pending.values() if record.parent not in pending]
+            if not ready:
+                raise ConfigStoreError(f"Configurations {sorted(pending)} form a parent cycle")
+            for record in ready:
+                parent = find(record.parent)
+                if parent is None:
+                    raise ConfigStoreError(
+                        f"Configuration '{record.name}' has unknown parent '{record.parent}'"
+                    )
+                patches.append(AddConfigurationPatch(new_nodes[record.name], parent))
+                del pending[record.name]
+
+        for record in updated.values():
+            node = find(record.name)
+            parent = find(record.parent)
+            if parent is not node.parent:  # type: ignore[union-attr]
+                if parent is None:
+                    raise ConfigStoreError(
+                        f"Configuration '{record.name}' has unknown parent '{record.parent}'"
+                    )
+                patches.append(MoveConfigurationPatch(node, parent))  # type: ignore[arg-type]
+            if list(node.settings) != record.settings:  # type: ignore[union-attr]
+                patches.append(SettingsPatch(node, record.settings))  # type: ignore[arg-type]
+
+        for record in [*added.values(), *updated.values()]:
+            node = find(record.name)
+            inherits = [find(name) for name in record.inherits]
+            if None in inherits:
+                raise ConfigStoreError(
+                    f"Configuration '{record.name}' inherits an unknown configuration"
+                )
+            if inherits != node.inherits:  # type: ignore[union-attr]
+                patches.append(InheritsPatch(node, inherits))  # type: ignore[arg-type]
+
+        project_records = dict(self._project_records)
+        if project_changes:
+            for path, project_record in project_changes.items():
+                if project_record is None:
+                    project_records.pop(path, None)
+                else:
+                    project_records[path] = project_record
+            patches.append(
+                ProjectsPatch(
+                    self.projects,
+                    [
+                        _build_project(project_record, find)
+                        for _, project_record in sorted(project_records.items())
+                    ],
+                )
+            )
+
+        # Only remember the new state once the change set is known to be valid,
+        # a broken edit is picked up again on the next reload.
+        for path, record in configuration_changes.items():
+            if record is None:
+                self._configuration_names.pop(path, None)
+            else:
+                self._configuration_names[path] = record.name
+        self._project_records = project_records
+        self._files = current
+        return patches
+
+
+# The cache's mapping is only closed once the settings decoded from it are
+# garbage, use a ConfigSource to close it earlier.
+def load(
+    directory: str, cache_path: Optional[str] = None
+) -> tuple[Configuration, list[Project]]:
+    return ConfigSource(directory, cache_path).load()
+
+
+def configuration_file_path(directory: str, configuration: Configuration) -> str:
+    relative_path = configuration.path or configuration.name
+    return os.path.join(directory, CONFIGURATIONS_DIRECTORY, f"{relative_path}.json")
+
+
+def project_file_path(directory: str, project: Project) -> str:
+    return os.path.join(directory, PROJECTS_DIRECTORY, f"{project.name}.json")
+
+
+def _write_json(path: str, data: dict[str, Any]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+        file.write("\n")
+
+
+def save(directory: str, root: Configuration, projects: list[Project]):
+    for config in root.child_generator():
+        data: dict[str, Any] = {"name": config.name}
+        if config.parent is not None:
+            data["parent"] = config.parent.name
+        if config.inherits:
+            data["inherits"] = [inherit.name for inherit in config.inherits]
+        data["settings"] = [setting_to_json(setting) for setting in config.settings]
+        _write_json(configuration_file_path(directory, config), data)
+
+    for project in projects:
+        _write_json(
+            project_file_path(directory, project),
+            {
+                "name": project.name,
+                "short_name": project.short_name,
+                "presets": [
+                    {
+                        "name": preset.name,
+                        "base": preset.base_configuration.name,
+                        "settings": [setting_to_json(setting) for setting in preset.settings],
+                    }
+                    for preset in project.presets
+                ],
+            },
+        )
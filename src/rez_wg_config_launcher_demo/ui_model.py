@@ -1,18 +1,59 @@
-from typing import Union
+from collections import OrderedDict
+import difflib
+from typing import Iterable, Optional, Union
 from rez_wg_config_launcher_demo.data_model import (
     _Setting,
     _SettingHolder,
     Configuration,
+    ConfigurationSetting,
     Preset,
     Project,
 )
+from rez_wg_config_launcher_demo.diff import DifferenceKind, HolderDiff
+from rez_wg_config_launcher_demo.patches import (
+    AddConfigurationPatch,
+    InheritsPatch,
+    MoveConfigurationPatch,
+    Patch,
+    RemoveConfigurationPatch,
+    SettingsPatch,
+)
 from qtpy import QtWidgets, QtCore
 
+_DISPLAY_ROLE = QtCore.Qt.ItemDataRole.DisplayRole
+
 
 class TreeConfigurationModel(QtCore.QAbstractItemModel):
-    def __init__(self, root: Configuration, parent: QtWidgets.QWidget | None = None):
+    # Children are exposed in batches, so a view only ever holds rows for the
+    # parts of the tree it has shown. QTreeView calls fetchMore on every
+    # expanded node each time it lays out, so fetchMore only provides the first
+    # batch of a node; later batches are requested explicitly through
+    # fetch_more_rows, typically when a view scrolls to the last fetched row.
+    #
+    # Fetched nodes are kept in LRU order and once more than `max_fetched_rows`
+    # rows are fetched, the least recently used collapsed ones are dropped again
+    # and the settings of their nodes released.
+    def __init__(
+        self,
+        root: Configuration,
+        parent: QtWidgets.QWidget | None = None,
+        fetch_batch_size: int = 256,
+        max_fetched_rows: int = 20000,
+    ):
         super(TreeConfigurationModel, self).__init__(parent)
         self._rootItem = root
+        self.fetch_batch_size = fetch_batch_size
+        self.max_fetched_rows = max_fetched_rows
+        # node -> number of its children exposed as rows, least recently used first
+        self._fetched: OrderedDict[Configuration, int] = OrderedDict()
+        self._fetched_rows = 0
+        self._expanded: set[Configuration] = set()
+        # Views fetch from inside their own model signal handlers, so eviction
+        # runs from the event loop rather than in the middle of a change.
+        self._evict_timer = QtCore.QTimer(self)
+        self._evict_timer.setSingleShot(True)
+        self._evict_timer.setInterval(0)
+        self._evict_timer.timeout.connect(self._evict)
 
     def columnCount(self, _):
         return 1
@@ -28,6 +69,9 @@ class TreeConfigurationModel(QtCore.QAbstractItemModel):
         return None
 
     def index(self, row, column, parent):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+
         parentItem = self.getItem(parent)
 
         childItem = parentItem.children[row]
@@ -38,13 +82,15 @@ class TreeConfigurationModel(QtCore.QAbstractItemModel):
             return QtCore.QModelIndex()
 
     def parent(self, index):
-        item = self.getItem(index)
-        parentItem: Configuration = item.parent
+        if not index.isValid():
+            return QtCore.QModelIndex()
 
-        if parentItem == self._rootItem:
+        parentItem: Configuration = index.internalPointer().parent
+
+        if parentItem is self._rootItem:
             return QtCore.QModelIndex()
 
-        return self.createIndex(parentItem.children.index(item), 0, parentItem)
+        return self.createIndex(parentItem.row, 0, parentItem)
 
     def getItem(self, index):
         if index.isValid():
@@ -55,6 +101,8 @@ class TreeConfigurationModel(QtCore.QAbstractItemModel):
         return self._rootItem
 
     def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
         return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
 
     def rowCount(self, parent):
@@ -63,51 +111,459 @@ class TreeConfigurationModel(QtCore.QAbstractItemModel):
         else:
             parentItem = parent.internalPointer()
 
-        return len(parentItem.children)
+        return self._fetched.get(parentItem, 0)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        return bool(self.getItem(parent).children)
+
+    def canFetchMore(self, parent):
+        item = self.getItem(parent)
+        return item not in self._fetched and bool(item.children)
+
+    def fetchMore(self, parent):
+        if self.canFetchMore(parent):
+            self.fetch_more_rows(parent)
+
+    def has_more_rows(self, parent: QtCore.QModelIndex) -> bool:
+        item = self.getItem(parent)
+        return self._fetched.get(item, 0) < len(item.children)
+
+    def fetch_more_rows(self, parent: QtCore.QModelIndex, minimum: int = 0):
+        # Fetches the next batch, or at least enough rows to reach `minimum`.
+        item = self.getItem(parent)
+        fetched = self._fetched.get(item, 0)
+        count = min(
+            len(item.children) - fetched, max(self.fetch_batch_size, minimum - fetched)
+        )
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, fetched, fetched + count - 1)
+        self._fetched[item] = fetched + count
+        self._fetched.move_to_end(item)
+        self._fetched_rows += count
+        self.endInsertRows()
+        if self._fetched_rows > self.max_fetched_rows:
+            self._evict_timer.start()
+
+    def expose(self, configuration: Configuration):
+        # Fetches whatever is needed for `configuration` to have a row.
+        chain = []
+        config = configuration
+        while config.parent is not None and config is not self._rootItem:
+            chain.append(config)
+            config = config.parent
+        for config in reversed(chain):
+            parent = config.parent
+            assert parent is not None
+            if self._fetched.get(parent, 0) <= config.row:
+                self.fetch_more_rows(
+                    self.index_for_configuration(parent), config.row + 1
+                )
+
+    def set_expanded(self, index: QtCore.QModelIndex, expanded: bool):
+        item = self.getItem(index)
+        if expanded:
+            self._expanded.add(item)
+            if item in self._fetched:
+                self._fetched.move_to_end(item)
+        else:
+            self._expanded.discard(item)
+            if self._fetched_rows > self.max_fetched_rows:
+                self._evict_timer.start()
+
+    def fetched_row_count(self) -> int:
+        return self._fetched_rows
+
+    def _evict(self):
+        for item in list(self._fetched):
+            if self._fetched_rows <= self.max_fetched_rows:
+                break
+            if item is self._rootItem or item in self._expanded or item not in self._fetched:
+                continue
+            self._release(item)
+
+    def _release(self, item: Configuration):
+        rows = self._fetched[item]
+        self.beginRemoveRows(self.index_for_configuration(item), 0, rows - 1)
+        self._forget_rows(item)
+        self.endRemoveRows()
+
+    def _forget_rows(self, item: Configuration):
+        # Drops the fetched rows below `item`, and everything fetched below them.
+        stack = [item]
+        while stack:
+            config = stack.pop()
+            rows = self._fetched.pop(config, 0)
+            self._fetched_rows -= rows
+            for child in config.children[:rows]:
+                self._expanded.discard(child)
+                child.release_cached_settings()
+                stack.append(child)
+
+    def _children_appeared(self, item: Configuration):
+        # Lets views pick up the changed hasChildren of a row
+        if item.get_root() is self._rootItem:
+            index = self.index_for_configuration(item)
+            if index.isValid():
+                self.dataChanged.emit(index, index)
+
+    def index_for_configuration(self, configuration: Configuration) -> QtCore.QModelIndex:
+        if configuration is self._rootItem or configuration.parent is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(configuration.row, 0, configuration)
+
+    def apply_patch(self, patch: Patch):
+        # Wraps the patch in the matching notifications, so views keep their
+        # expansion and selection state instead of being reset. Only rows that
+        # were already fetched are announced, the rest show up on fetchMore.
+        if isinstance(patch, AddConfigurationPatch):
+            parent = patch.parent
+            row = len(parent.children)
+            if parent in self._fetched and self._fetched[parent] == row:
+                self.beginInsertRows(self.index_for_configuration(parent), row, row)
+                patch.apply()
+                self._fetched[parent] += 1
+                self._fetched_rows += 1
+                self.endInsertRows()
+            else:
+                patch.apply()
+                if row == 0:
+                    self._children_appeared(parent)
+
+        elif isinstance(patch, RemoveConfigurationPatch):
+            configuration = patch.configuration
+            source = configuration.parent
+            assert source is not None
+            row = configuration.row
+            if row < self._fetched.get(source, 0):
+                self.beginRemoveRows(self.index_for_configuration(source), row, row)
+                self._forget_rows(configuration)
+                patch.apply()
+                self._fetched[source] -= 1
+                self._fetched_rows -= 1
+                self.endRemoveRows()
+            else:
+                patch.apply()
+
+        elif isinstance(patch, MoveConfigurationPatch):
+            configuration = patch.configuration
+            source = configuration.parent
+            assert source is not None
+            destination = patch.parent
+            row = configuration.row
+            destination_row = len(destination.children)
+            source_visible = row < self._fetched.get(source, 0)
+            destination_visible = self._fetched.get(destination, -1) == destination_row
+            if (
+                source_visible
+                and destination_visible
+                and self.beginMoveRows(
+                    self.index_for_configuration(source),
+                    row,
+                    row,
+                    self.index_for_configuration(destination),
+                    destination_row,
+                )
+            ):
+                patch.apply()
+                self._fetched[source] -= 1
+                self._fetched[destination] += 1
+                self.endMoveRows()
+            else:
+                if source_visible:
+                    self.beginRemoveRows(self.index_for_configuration(source), row, row)
+                    self._forget_rows(configuration)
+                    patch.apply()
+                    self._fetched[source] -= 1
+                    self._fetched_rows -= 1
+                    self.endRemoveRows()
+                else:
+                    patch.apply()
+                if destination_row == 0:
+                    self._children_appeared(destination)
+                if destination_visible:
+                    self.beginInsertRows(
+                        self.index_for_configuration(destination),
+                        destination_row,
+                        destination_row,
+                    )
+                    self._fetched[destination] += 1
+                    self._fetched_rows += 1
+                    self.endInsertRows()
+
+        else:
+            patch.apply()
+            if isinstance(patch, (SettingsPatch, InheritsPatch)):
+                holder = patch.holder if isinstance(patch, SettingsPatch) else patch.configuration
+                if isinstance(holder, Configuration) and holder.get_root() is self._rootItem:
+                    index = self.index_for_configuration(holder)
+                    if index.isValid():
+                        self.dataChanged.emit(index, index)
+
+
+class SettingsFilterProxyModel(QtCore.QSortFilterProxyModel):
+    # Filters a TreeConfigurationModel down to a set of configurations, e.g.
+    # the results of a SettingsIndex search, and their ancestors.
+    def __init__(self, parent=None):
+        super(SettingsFilterProxyModel, self).__init__(parent)
+        self._visible: Optional[set[Configuration]] = None
+
+    def set_matches(self, configurations: Optional[Iterable[Configuration]]):
+        # None shows every configuration again
+        visible = None
+        if configurations is not None:
+            visible = set()
+            for configuration in configurations:
+                config: Optional[Configuration] = configuration
+                while config is not None and config not in visible:
+                    visible.add(config)
+                    config = config.parent
+        # Qt 6.10 replaced invalidateFilter with a begin/end pair
+        if hasattr(self, "beginFilterChange"):
+            self.beginFilterChange()
+            self._visible = visible
+            self.endFilterChange(QtCore.QSortFilterProxyModel.Direction.Rows)
+        else:
+            self._visible = visible
+            self.invalidateFilter()
+
+    @property
+    def filtering(self) -> bool:
+        return self._visible is not None
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._visible is None:
+            return True
+        parent = self.sourceModel().getItem(source_parent)
+        return parent.children[source_row] in self._visible
 
 
 class ConfigTableSettingModel(QtCore.QAbstractTableModel):
-    def __init__(self, configuration: Union[Configuration, Preset], parent=None):
+    # Display strings are computed once per row when rows arrive and kept in
+    # one list per column, painting only looks them up. Sorting and filtering
+    # select rows from these columns, the resolved settings are left as they
+    # are. Rows stay in resolution order while neither is active.
+    headers = ["Inherited from", "Setting Type", "Setting"]
+
+    def __init__(
+        self,
+        configuration: Optional[Union[Configuration, Preset]],
+        parent=None,
+        config_settings: Optional[list[ConfigurationSetting]] = None,
+    ):
         super(ConfigTableSettingModel, self).__init__(parent)
-        self.configuration: Union[Configuration] = configuration
-        self.config_settings = self.configuration.get_all_configuration_settings()
-
-    def rowCount(self, parent):
+        self.configuration: Optional[Union[Configuration, Preset]] = configuration
+        self.config_settings: list[ConfigurationSetting] = []
+        self._columns: list[list[str]] = [[] for _ in self.headers]
+        # Rows shown while sorted or filtered, as indexes into config_settings.
+        self._visible_rows: Optional[list[int]] = None
+        self._sort_column = -1
+        self._sort_order = QtCore.Qt.SortOrder.AscendingOrder
+        self._filter_text = ""
+        self._filter_keys: Optional[list[str]] = None
+        self._splice(0, 0, self._resolve(config_settings))
+
+    def _resolve(
+        self, config_settings: Optional[list[ConfigurationSetting]]
+    ) -> list[ConfigurationSetting]:
+        # Settings resolved elsewhere (e.g. on a worker thread) can be passed in
+        if config_settings is not None:
+            return config_settings
+        if self.configuration is None:
+            return []
+        return self.configuration.get_all_configuration_settings()
+
+    def _splice(
+        self, start: int, stop: int, config_settings: list[ConfigurationSetting]
+    ):
+        # Replaces rows start:stop of config_settings and of the display columns.
+        self.config_settings[start:stop] = config_settings
+        names, types, values = self._columns
+        names[start:stop] = [row.configuration.name for row in config_settings]
+        types[start:stop] = [row.setting.type for row in config_settings]
+        values[start:stop] = [str(row.setting) for row in config_settings]
+        self._filter_keys = None
+
+    def set_source(
+        self,
+        configuration: Optional[Union[Configuration, Preset]],
+        config_settings: Optional[list[ConfigurationSetting]] = None,
+    ):
+        # Switches to another configuration or preset in place. Rows the two
+        # share (typically everything inherited from common ancestors) stay
+        # untouched, so views keep their state and only repaint the rest.
+        self.configuration = configuration
+        self._update_rows(self._resolve(config_settings))
+
+    def refresh(self, config_settings: Optional[list[ConfigurationSetting]] = None):
+        self._update_rows(self._resolve(config_settings))
+
+    def _update_rows(self, config_settings: list[ConfigurationSetting]):
+        # Emits row level signals for the difference only. The common prefix
+        # and suffix are skipped before diffing what is left, opcodes are
+        # applied back to front so the row numbers of earlier ones stay valid.
+        if not self.config_settings or not config_settings:
+            # Nothing to compare, typically the first rows of a new source.
+            prefix = suffix = 0
+        else:
+            old_keys = [
+                (row.configuration, row.setting) for row in self.config_settings
+            ]
+            new_keys = [(row.configuration, row.setting) for row in config_settings]
+            prefix = 0
+            limit = min(len(old_keys), len(new_keys))
+            while prefix < limit and old_keys[prefix] == new_keys[prefix]:
+                prefix += 1
+            suffix = 0
+            limit -= prefix
+            while suffix < limit and old_keys[-1 - suffix] == new_keys[-1 - suffix]:
+                suffix += 1
+        if prefix == len(self.config_settings) == len(config_settings):
+            return
+
+        if self._visible_rows is not None:
+            # Sorted or filtered rows do not line up with the resolution order
+            # the diff works on.
+            self.beginResetModel()
+            self._splice(0, len(self.config_settings), config_settings)
+            self._update_visible_rows()
+            self.endResetModel()
+            return
+
+        old_end = len(self.config_settings) - suffix
+        new_end = len(config_settings) - suffix
+        if prefix == old_end or prefix == new_end:
+            # Only insertions or only removals, no need to diff.
+            opcodes = [("replace", prefix, old_end, prefix, new_end)]
+        else:
+            matcher = difflib.SequenceMatcher(
+                None,
+                old_keys[prefix:old_end],
+                new_keys[prefix:new_end],
+                autojunk=False,
+            )
+            opcodes = [
+                (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            ]
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                continue
+            if tag == "replace":
+                # Rows present on both sides are changed in place, only the
+                # surplus is removed or inserted.
+                common = min(i2 - i1, j2 - j1)
+                if common:
+                    self._splice(i1, i1 + common, config_settings[j1 : j1 + common])
+                    self.dataChanged.emit(
+                        self.index(i1, 0),
+                        self.index(i1 + common - 1, self.columnCount() - 1),
+                    )
+                i1 += common
+                j1 += common
+            if i2 > i1:
+                self.beginRemoveRows(QtCore.QModelIndex(), i1, i2 - 1)
+                self._splice(i1, i2, [])
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(QtCore.QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self._splice(i1, i1, config_settings[j1:j2])
+                self.endInsertRows()
+
+    def setting_at(self, row: int) -> ConfigurationSetting:
+        if self._visible_rows is not None:
+            row = self._visible_rows[row]
+        return self.config_settings[row]
+
+    def sort(self, column, order=QtCore.Qt.SortOrder.AscendingOrder):
+        # A column of -1 goes back to resolution order.
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_rows = [self._source_row(index.row()) for index in persistent]
+        self._sort_column = column
+        self._sort_order = order
+        self._update_visible_rows()
+        positions = self._visible_positions()
+        self.changePersistentIndexList(
+            persistent,
+            [
+                self.index(positions[row], index.column())
+                if row in positions
+                else QtCore.QModelIndex()
+                for row, index in zip(source_rows, persistent)
+            ],
+        )
+        self.layoutChanged.emit()
+
+    def set_filter_text(self, text: str):
+        # Keeps rows with the text in any column, ignoring case.
+        text = text.strip().casefold()
+        if text == self._filter_text:
+            return
+        self.beginResetModel()
+        self._filter_text = text
+        self._update_visible_rows()
+        self.endResetModel()
+
+    def _source_row(self, row: int) -> int:
+        return row if self._visible_rows is None else self._visible_rows[row]
+
+    def _visible_positions(self) -> dict[int, int]:
+        if self._visible_rows is None:
+            return {row: row for row in range(len(self.config_settings))}
+        return {row: position for position, row in enumerate(self._visible_rows)}
+
+    def _update_visible_rows(self):
+        if self._sort_column < 0 and not self._filter_text:
+            self._visible_rows = None
+            return
+        if self._filter_text:
+            if self._filter_keys is None:
+                self._filter_keys = [
+                    "\0".join(cells).casefold() for cells in zip(*self._columns)
+                ]
+            text = self._filter_text
+            rows = [row for row, key in enumerate(self._filter_keys) if text in key]
+        else:
+            rows = list(range(len(self.config_settings)))
+        if self._sort_column >= 0:
+            # Stable, rows that compare equal keep their resolution order.
+            keys = [value.casefold() for value in self._columns[self._sort_column]]
+            rows.sort(
+                key=keys.__getitem__,
+                reverse=self._sort_order == QtCore.Qt.SortOrder.DescendingOrder,
+            )
+        self._visible_rows = rows
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._visible_rows is not None:
+            return len(self._visible_rows)
         return len(self.config_settings)
 
-    def columnCount(self, parent):
-        return 3
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
 
     def headerData(self, section, orientation, role):
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if orientation == QtCore.Qt.Orientation.Horizontal:
-                if section == 0:
-                    return "Inherited from"
-                elif section == 1:
-                    return "Setting Type"
-                elif section == 2:
-                    return "Setting"
+        if (
+            role == QtCore.Qt.ItemDataRole.DisplayRole
+            and orientation == QtCore.Qt.Orientation.Horizontal
+        ):
+            return self.headers[section]
+        return None
 
     def data(self, index, role):
-        if not index.isValid():
+        # Called for every role of every painted cell, only the display role
+        # has a value.
+        if role != _DISPLAY_ROLE or not index.isValid():
             return None
-
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            config_setting = self.config_settings[index.row()]
-
-            if index.column() == 0:
-                config_name = config_setting.configuration.name
-                return config_name
-
-            elif index.column() == 1:
-                setting_type = config_setting.setting.type
-                return setting_type
-
-            elif index.column() == 2:
-                config_value = str(config_setting.setting)
-                return config_value
-
-        return None
+        row = index.row()
+        if self._visible_rows is not None:
+            row = self._visible_rows[row]
+        return self._columns[index.column()][row]
 
 
 class ListPresetModel(QtCore.QAbstractListModel):
@@ -128,3 +584,136 @@ class ListPresetModel(QtCore.QAbstractListModel):
             return preset.name
 
         return None
+
+
+# Differences of a HolderDiff, side by side. Display strings are built once per
+# diff, like ConfigTableSettingModel's columns.
+class SettingsDiffModel(QtCore.QAbstractTableModel):
+    KIND_MARKERS = {
+        DifferenceKind.ADDED: "+",
+        DifferenceKind.REMOVED: "-",
+        DifferenceKind.OVERRIDDEN: "~",
+    }
+
+    def __init__(self, parent=None):
+        super(SettingsDiffModel, self).__init__(parent)
+        self.diff: Optional[HolderDiff] = None
+        self.headers = ["", "Type", "Key", "Left", "Set by", "Right", "Set by"]
+        self._rows: list[tuple[str, ...]] = []
+
+    def set_diff(self, diff: Optional[HolderDiff]):
+        self.beginResetModel()
+        self.diff = diff
+        self._rows = []
+        if diff is not None:
+            self.headers[3] = diff.left.name
+            self.headers[5] = diff.right.name
+            self._rows = [
+                (
+                    self.KIND_MARKERS[difference.kind],
+                    difference.type,
+                    difference.key,
+                    difference.left_value or "",
+                    _holder_names(difference.left_provenance),
+                    difference.right_value or "",
+                    _holder_names(difference.right_provenance),
+                )
+                for difference in diff.differences
+            ]
+        self.endResetModel()
+        self.headerDataChanged.emit(
+            QtCore.Qt.Orientation.Horizontal, 0, len(self.headers) - 1
+        )
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role):
+        if (
+            role == QtCore.Qt.ItemDataRole.DisplayRole
+            and orientation == QtCore.Qt.Orientation.Horizontal
+        ):
+            return self.headers[section]
+        return None
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+        if role == _DISPLAY_ROLE or role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return self._rows[index.row()][index.column()]
+        return None
+
+
+def _holder_names(provenance: list[ConfigurationSetting]) -> str:
+    return ", ".join(config_setting.configuration.name for config_setting in provenance)
+
+
+# Read-only rows of plain values, as the Diagnostics panel shows them. Sorting
+# is done on the rows themselves, they are few and replaced on every refresh.
+class DiagnosticsTableModel(QtCore.QAbstractTableModel):
+    def __init__(self, headers: list[str], parent=None):
+        super(DiagnosticsTableModel, self).__init__(parent)
+        self.headers = headers
+        self.rows: list[tuple] = []
+        self._sort_column = 0
+        self._sort_order = QtCore.Qt.SortOrder.AscendingOrder
+
+    def set_rows(self, rows: list[tuple]):
+        self.beginResetModel()
+        self.rows = rows
+        self._sort_rows()
+        self.endResetModel()
+
+    def sort(self, column, order=QtCore.Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._sort_rows()
+        self.layoutChanged.emit()
+
+    def _sort_rows(self):
+        # Empty cells (None) sort past the values, in either order.
+        self.rows.sort(
+            key=lambda row: (row[self._sort_column] is None, row[self._sort_column]),
+            reverse=self._sort_order == QtCore.Qt.SortOrder.DescendingOrder,
+        )
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role):
+        if (
+            role == QtCore.Qt.ItemDataRole.DisplayRole
+            and orientation == QtCore.Qt.Orientation.Horizontal
+        ):
+            return self.headers[section]
+        return None
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            value = self.rows[index.row()][index.column()]
+            if value is None:
+                return ""
+            if isinstance(value, float):
+                return f"{value:.1f}"
+            return str(value)
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole and index.column() > 0:
+            alignment = QtCore.Qt.AlignmentFlag
+            return int(alignment.AlignRight | alignment.AlignVCenter)
+        return None
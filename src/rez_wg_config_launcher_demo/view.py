@@ -1,9 +1,18 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Union
 from qtpy import QtWidgets, QtCore
 
 from rez_wg_config_launcher_demo.data_model import Configuration, Preset, Project
+from rez_wg_config_launcher_demo.diff import DiffEngine
+from rez_wg_config_launcher_demo.instrumentation import Instrumentation, instrumentation
+from rez_wg_config_launcher_demo.patches import Patch, ProjectsPatch
+from rez_wg_config_launcher_demo.search import SettingsIndex
+from rez_wg_config_launcher_demo.store import ConfigSource
 from rez_wg_config_launcher_demo import ui_model, controller
 
+if TYPE_CHECKING:
+    from rez_wg_config_launcher_demo.launch import Launch, LaunchState
+    from rez_wg_config_launcher_demo.rez_resolve import ResolveCache
+
 
 class InspectPathTree(QtWidgets.QTreeView):
     def __init__(self, parent=None):
@@ -12,6 +21,41 @@ class InspectPathTree(QtWidgets.QTreeView):
         self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
         self.setAlternatingRowColors(True)
         self.setHeaderHidden(True)
+        self.setUniformRowHeights(True)
+        self.verticalScrollBar().valueChanged.connect(self.fetch_visible_rows)
+        self.expanded.connect(self.fetch_visible_rows)
+
+    def resizeEvent(self, event):
+        super(InspectPathTree, self).resizeEvent(event)
+        self.fetch_visible_rows()
+
+    def fetch_visible_rows(self, *_):
+        # Fetches the next batch of every node whose last fetched row is on
+        # screen, the bottom row and its ancestors are the only candidates.
+        view_model = model = self.model()
+        if isinstance(view_model, ui_model.SettingsFilterProxyModel):
+            # A filtered tree only shows rows that were fetched for its matches
+            if view_model.filtering:
+                return
+            model = view_model.sourceModel()
+        if not isinstance(model, ui_model.TreeConfigurationModel) or not self.isVisible():
+            return
+        index = self.indexAt(QtCore.QPoint(0, self.viewport().height() - 1))
+        if not index.isValid():
+            # Everything fits, start from the last row shown
+            parent = QtCore.QModelIndex()
+            while view_model.rowCount(parent) and (
+                not parent.isValid() or self.isExpanded(parent)
+            ):
+                index = view_model.index(view_model.rowCount(parent) - 1, 0, parent)
+                parent = index
+        if view_model is not model:
+            index = view_model.mapToSource(index)
+        while index.isValid():
+            parent = index.parent()
+            if index.row() == model.rowCount(parent) - 1 and model.has_more_rows(parent):
+                model.fetch_more_rows(parent)
+            index = parent
 
 
 class ConfigurationTable(QtWidgets.QTableView):
@@ -20,14 +64,78 @@ class ConfigurationTable(QtWidgets.QTableView):
 
         self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
         self.setAlternatingRowColors(True)
-        self.setSizeAdjustPolicy(
-            QtWidgets.QAbstractItemView.SizeAdjustPolicy.AdjustToContents
+        self.setWordWrap(False)
+        # Rows and columns have fixed sizes, so Qt never measures cell contents
+        # and a table of thousands of rows lays out as fast as a short one.
+        # Row numbers mean nothing here, hiding them also saves painting them.
+        vertical_header = self.verticalHeader()
+        vertical_header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        vertical_header.hide()
+        horizontal_header = self.horizontalHeader()
+        horizontal_header.setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeMode.Interactive
         )
-        self.horizontalHeader().setStretchLastSection(True)
-        self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        horizontal_header.setDefaultSectionSize(160)
+        horizontal_header.setStretchLastSection(True)
+        # Unsorted shows the resolution order, clicking a header sorts by it.
+        if hasattr(horizontal_header, "setSortIndicatorClearable"):
+            horizontal_header.setSortIndicatorClearable(True)
+        horizontal_header.setSortIndicator(-1, QtCore.Qt.SortOrder.AscendingOrder)
+        self.setSortingEnabled(True)
+
+        # Placed by the editor showing the table, filters whichever settings
+        # model the table shows.
+        self.filter_edit = QtWidgets.QLineEdit(parent)
+        self.filter_edit.setPlaceholderText("Filter settings...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.apply_filter)
+
+        self.loading_label = QtWidgets.QLabel("Resolving settings...", self.viewport())
+        self.loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.hide()
+        # Only show the loading state for resolutions that are actually slow,
+        # fast ones would just flicker.
+        self._loading_timer = QtCore.QTimer(self)
+        self._loading_timer.setSingleShot(True)
+        self._loading_timer.setInterval(100)
+        self._loading_timer.timeout.connect(self.loading_label.show)
+
+    def set_loading(self, loading: bool):
+        if loading:
+            self.loading_label.setText("Resolving settings...")
+            if not self.loading_label.isVisible():
+                self._loading_timer.start()
+        else:
+            self._loading_timer.stop()
+            self.loading_label.hide()
+
+    def show_error(self, message: str):
+        self._loading_timer.stop()
+        self.loading_label.setText(message)
+        self.loading_label.show()
+
+    def resizeEvent(self, event):
+        super(ConfigurationTable, self).resizeEvent(event)
+        self.loading_label.setGeometry(self.viewport().rect())
+
+    def setModel(self, model):
+        super(ConfigurationTable, self).setModel(model)
+        self.apply_filter()
+
+    def apply_filter(self, *_):
+        model = self.model()
+        if isinstance(model, ui_model.ConfigTableSettingModel):
+            model.set_filter_text(self.filter_edit.text())
 
 
 class PresetList(QtWidgets.QListView):
+    # Preset and the name of the tool to launch, None for its first tool
+    launchRequested = QtCore.Signal(object, object)
+    # The selected preset and the one to compare it with
+    compareRequested = QtCore.Signal(object, object)
+    # Preset whose tools the context menu lists, answer with set_tools
+    toolsRequested = QtCore.Signal(object)
+
     def __init__(self, parent=None, project=None):
         super(PresetList, self).__init__()
 
@@ -36,7 +144,11 @@ class PresetList(QtWidgets.QListView):
         self.setModel(ui_model.ListPresetModel(project))
         self.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
+        self.doubleClicked.connect(self.launch_selected_preset)
+        # Created on first use and reused for every preset after that
         self.preset_editor: Optional[PresetEditor] = None
+        # The preset and launch menu of the open context menu
+        self._launch_menu: Optional[tuple[Preset, QtWidgets.QMenu]] = None
 
     def show_context_menu(self, position: QtCore.QPoint):
         context_menu = QtWidgets.QMenu(self)
@@ -45,18 +157,84 @@ class PresetList(QtWidgets.QListView):
         action_edit.triggered.connect(self.show_preset_editor)
 
         context_menu.addAction(action_edit)
-        context_menu.exec(self.viewport().mapToGlobal(position))
+        preset = self.selected_preset()
+        if preset is not None:
+            presets = self.model().presets  # type: ignore[attr-defined]
+            others = [other for other in presets if other is not preset]
+            if others:
+                compare_menu = context_menu.addMenu("Compare With")
+                for other in others:
+                    action_compare = QtWidgets.QAction(other.name, compare_menu)
+                    action_compare.triggered.connect(
+                        lambda _=False, other=other: self.compareRequested.emit(
+                            preset, other
+                        )
+                    )
+                    compare_menu.addAction(action_compare)
+            context_menu.addSeparator()
+            # Filled in by set_tools once the preset's tools are resolved
+            launch_menu = context_menu.addMenu("Launch")
+            launch_menu.addAction("Resolving tools...").setEnabled(False)
+            self._launch_menu = (preset, launch_menu)
+            self.toolsRequested.emit(preset)
+        try:
+            context_menu.exec(self.viewport().mapToGlobal(position))
+        finally:
+            self._launch_menu = None
+
+    def set_tools(self, preset: Preset, tools: list[str]):
+        if self._launch_menu is None or self._launch_menu[0] is not preset:
+            return
+        launch_menu = self._launch_menu[1]
+        launch_menu.clear()
+        for tool in tools:
+            action_launch = QtWidgets.QAction(f"Launch {tool}", launch_menu)
+            action_launch.triggered.connect(
+                lambda _=False, name=tool: self.launchRequested.emit(preset, name)
+            )
+            launch_menu.addAction(action_launch)
+        if not tools:
+            launch_menu.addAction("No tools").setEnabled(False)
+
+    def set_tools_failed(self, preset: Preset, message: str):
+        if self._launch_menu is None or self._launch_menu[0] is not preset:
+            return
+        launch_menu = self._launch_menu[1]
+        launch_menu.clear()
+        launch_menu.addAction(f"Resolving tools failed: {message}").setEnabled(False)
+
+    def selected_preset(self) -> Optional[Preset]:
+        selected_indexes = self.selectedIndexes()
+        if not selected_indexes:
+            return None
+        model = selected_indexes[0].model()
+        return model.presets[selected_indexes[0].row()]  # type: ignore[attr-defined]
+
+    def launch_selected_preset(self, *_):
+        preset = self.selected_preset()
+        if preset is not None:
+            self.launchRequested.emit(preset, None)
 
     def show_preset_editor(self):
         selected_index = self.selectedIndexes()[0]
         preset = selected_index.model().presets[selected_index.row()]
-        
-        self.preset_settings_list = PresetEditor(preset=preset)
-        self.preset_settings_list.show()
+
+        if self.preset_editor is None:
+            self.preset_editor = PresetEditor(preset=preset)
+        else:
+            self.preset_editor.set_preset(preset)
+        self.preset_editor.show()
+        self.preset_editor.raise_()
 
 
 class AppLauncher(QtWidgets.QMainWindow):
-    def __init__(self, projects: list[Project], root_config: Configuration):
+    def __init__(
+        self,
+        projects: list[Project],
+        root_config: Configuration,
+        config_source: Optional[ConfigSource] = None,
+        resolve_cache: Optional["ResolveCache"] = None,
+    ):
         super(AppLauncher, self).__init__()
         self.resize(800, 800)
         self.setWindowTitle("App Launcher")
@@ -81,67 +259,290 @@ class AppLauncher(QtWidgets.QMainWindow):
         self.project_combo.currentIndexChanged.connect(self.on_project_changed)
 
         self.preset_list_view = PresetList(self, self.current_project)
+        self.preset_list_view.launchRequested.connect(self.launch_preset)
+        self.preset_list_view.compareRequested.connect(self.compare_presets)
+        self.preset_list_view.toolsRequested.connect(self.request_tools)
         main_layout.addWidget(self.preset_list_view)
 
-        # Config editor
+        # Config editor, most sessions never open it so it is only built on
+        # first use
         self.root_config = root_config
-        self.config_editor = ConfigEditor(self.root_config)
+        self._config_editor: Optional[ConfigEditor] = None
+        self._diagnostics_panel: Optional[DiagnosticsPanel] = None
+        # Launches start asyncio's loop thread, only once something is launched
+        self._launch_controller: Optional[controller.LaunchController] = None
+        self._launch_panel: Optional[LaunchPanel] = None
+        self._diff_panel: Optional[DiffPanel] = None
 
         # Menu Bar
         self.edit_menu = self.menuBar().addMenu("&Edit")
         open_config_editor = QtWidgets.QAction("Open Config Editor", self)
         open_config_editor.triggered.connect(self.open_config_editor)
         self.edit_menu.addAction(open_config_editor)
+        self.view_menu = self.menuBar().addMenu("&View")
+        open_diagnostics = QtWidgets.QAction("Diagnostics", self)
+        open_diagnostics.triggered.connect(self.open_diagnostics_panel)
+        self.view_menu.addAction(open_diagnostics)
+        open_launches = QtWidgets.QAction("Launches", self)
+        open_launches.triggered.connect(self.open_launch_panel)
+        self.view_menu.addAction(open_launches)
+        open_diff = QtWidgets.QAction("Compare Presets", self)
+        open_diff.triggered.connect(self.open_diff_panel)
+        self.view_menu.addAction(open_diff)
+
+        # Reload configs edited on disk while the launcher is open
+        self.config_watcher: Optional[controller.ConfigSourceWatcher] = None
+        if config_source is not None:
+            self.config_watcher = controller.ConfigSourceWatcher(config_source, parent=self)
+            self.config_watcher.patchesAvailable.connect(self.on_config_patches)
+            self.config_watcher.reloadFailed.connect(self.on_config_reload_failed)
+
+        # Resolve the current project's presets in the background, so
+        # launching one finds its context cached
+        self.resolve_cache = resolve_cache
+        self.prewarm_presets()
+
+    @property
+    def config_editor(self) -> "ConfigEditor":
+        if self._config_editor is None:
+            self._config_editor = ConfigEditor(self.root_config, projects=self.projects)
+        return self._config_editor
 
     def open_config_editor(self):
         self.config_editor.show()
+
+    @property
+    def diagnostics_panel(self) -> "DiagnosticsPanel":
+        if self._diagnostics_panel is None:
+            self._diagnostics_panel = DiagnosticsPanel(instrumentation)
+        return self._diagnostics_panel
+
+    def open_diagnostics_panel(self):
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
+
+    @property
+    def launch_controller(self) -> controller.LaunchController:
+        if self._launch_controller is None:
+            from rez_wg_config_launcher_demo.launch import LaunchQueue
+
+            self._launch_controller = controller.LaunchController(
+                LaunchQueue(resolve_cache=self.resolve_cache), parent=self
+            )
+            self._launch_controller.toolsResolved.connect(
+                self.preset_list_view.set_tools
+            )
+            self._launch_controller.toolsFailed.connect(
+                self.preset_list_view.set_tools_failed
+            )
+        return self._launch_controller
+
+    @property
+    def launch_panel(self) -> "LaunchPanel":
+        if self._launch_panel is None:
+            self._launch_panel = LaunchPanel(self.launch_controller)
+        return self._launch_panel
+
+    def open_launch_panel(self):
+        self.launch_panel.show()
+        self.launch_panel.raise_()
+
+    def request_tools(self, preset: Preset):
+        self.launch_controller.request_tools(preset)
+
+    def launch_preset(self, preset: Preset, tool: Optional[str] = None):
+        from rez_wg_config_launcher_demo.launch import LaunchError
+
+        # The panel is created first so it sees the launch from its start.
+        panel = self.launch_panel
+        try:
+            launch = self.launch_controller.launch(preset, tool)
+        except LaunchError as error:
+            self.statusBar().showMessage(str(error), 5000)
+            return
+        self.statusBar().showMessage(f"Launching {launch.tool} ({preset.name})", 3000)
+        if not panel.isVisible():
+            self.open_launch_panel()
+
+    @property
+    def diff_panel(self) -> "DiffPanel":
+        if self._diff_panel is None:
+            self._diff_panel = DiffPanel()
+            self._diff_panel.set_holders(self._diff_holders())
+        return self._diff_panel
+
+    def _diff_holders(self) -> list[tuple[str, Union[Configuration, Preset]]]:
+        return [
+            (f"{project.name} / {preset.name}", preset)
+            for project in self.projects
+            for preset in project.presets
+        ]
+
+    def open_diff_panel(self):
+        self.diff_panel.show()
+        self.diff_panel.raise_()
+
+    def compare_presets(self, left: Preset, right: Preset):
+        self.diff_panel.compare(left, right)
+        self.open_diff_panel()
+
+    def shutdown(self):
+        # Terminates the tools still running from the launcher
+        if self._launch_controller is not None:
+            self._launch_controller.shutdown()
     
     def on_project_changed(self, index):
+        if index < 0:
+            return
         self.current_project = self.projects[index]
         self.preset_list_view.setModel(ui_model.ListPresetModel(self.current_project))
+        self.prewarm_presets()
+
+    def prewarm_presets(self):
+        if self.resolve_cache is not None:
+            self.resolve_cache.prewarm(self.current_project.presets)
+
+    def on_config_patches(self, patches: list[Patch]):
+        # An editor built later starts from the patched tree
+        if self._config_editor is not None:
+            self._config_editor.apply_patches(patches)
+        if any(isinstance(patch, ProjectsPatch) for patch in patches):
+            self.refresh_projects()
+        self.statusBar().showMessage("Configuration reloaded", 3000)
+
+    def on_config_reload_failed(self, message: str):
+        self.statusBar().showMessage(f"Configuration reload failed: {message}")
+
+    def refresh_projects(self):
+        names = [project.name for project in self.projects]
+        current_name = self.current_project.name
+        current_row = names.index(current_name) if current_name in names else 0
+
+        self.project_combo.blockSignals(True)
+        self.project_combo.clear()
+        self.project_combo.addItems(names)
+        self.project_combo.setCurrentIndex(current_row)
+        self.project_combo.blockSignals(False)
+        if self.projects:
+            self.on_project_changed(current_row)
+        if self._diff_panel is not None:
+            self._diff_panel.set_holders(self._diff_holders())
 
 
 class PresetEditor(QtWidgets.QWidget):
     def __init__(self, preset: Preset, parent=None):
         super(PresetEditor, self).__init__(parent)
-        self.setWindowTitle("Preset Editor")
 
         self.resize(600, 600)
 
-        main_layout = QtWidgets.QHBoxLayout()
+        main_layout = QtWidgets.QVBoxLayout()
         self.setLayout(main_layout)
     
         self.configuration_table_view = ConfigurationTable(self)
-        list_model = ui_model.ConfigTableSettingModel(preset)
-        self.set_table_setting_model(list_model)
+        self.table_model = ui_model.ConfigTableSettingModel(None)
+        self.set_table_setting_model(self.table_model)
 
+        main_layout.addWidget(self.configuration_table_view.filter_edit)
         main_layout.addWidget(self.configuration_table_view)
 
+        self.resolve_queue = controller.SettingsResolveQueue(parent=self)
+        self.resolve_queue.resolved.connect(self.on_settings_resolved)
+        self.resolve_queue.resolveFailed.connect(self.on_settings_resolve_failed)
+        self.set_preset(preset)
+
+    def set_preset(self, preset: Preset):
+        self.preset = preset
+        self.setWindowTitle(f"Preset Editor - {preset.name}")
+        self.table_model.set_source(preset, [])
+        self.configuration_table_view.set_loading(True)
+        self.resolve_queue.request(preset)
+
     def set_table_setting_model(self, model: ui_model.ConfigTableSettingModel):
         self.configuration_table_view.setModel(model)
 
+    def on_settings_resolved(self, preset: Preset, config_settings):
+        self.configuration_table_view.set_loading(False)
+        self.table_model.set_source(preset, config_settings)
+
+    def on_settings_resolve_failed(self, preset: Preset, message: str):
+        self.configuration_table_view.show_error(message)
+
 
 class ConfigEditor(QtWidgets.QWidget):
-    def __init__(self, root_config: Configuration, parent=None):
+    # Searches with more matches only show the first ones, exposing every
+    # match would fetch most of a large tree.
+    max_search_matches = 1000
+
+    def __init__(
+        self,
+        root_config: Configuration,
+        parent=None,
+        expand_depth: int = 3,
+        projects: Optional[list[Project]] = None,
+    ):
         super(ConfigEditor, self).__init__(parent)
         self.setWindowTitle("Config Editor")
+        self.expand_depth = expand_depth
+        self.root_config = root_config
+        # Searched too, presets setting the text are listed below the search
+        # box and their base configurations are shown in the tree.
+        self.projects = projects if projects is not None else []
 
         self.resize(1000, 600)
 
         main_layout = QtWidgets.QHBoxLayout()
         self.setLayout(main_layout)
 
-        self.config_tree_view = InspectPathTree(self)
-        root = Configuration("root")
-        model = controller.create_config_tree_model_from_root_config(root)
-        self.set_tree_model(model)
+        self.search_edit = QtWidgets.QLineEdit(self)
+        self.search_edit.setPlaceholderText("Search settings...")
+        self.search_edit.setToolTip(
+            "Show configurations and presets setting a variable, package or tool"
+            " containing the text"
+        )
+        self.search_edit.setClearButtonEnabled(True)
+        # Typing restarts the timer, the search runs once typing pauses.
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.apply_search)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        # Built on the first search and kept up to date by the data model.
+        self.settings_index: Optional[SettingsIndex] = None
+        self.preset_matches_label = QtWidgets.QLabel(self)
+        self.preset_matches_label.setWordWrap(True)
+        self.preset_matches_label.hide()
 
+        self.config_tree_view = InspectPathTree(self)
+        self.config_tree_view.expanded.connect(
+            lambda index: self.tree_model.set_expanded(
+                self.tree_proxy.mapToSource(index), True
+            )
+        )
+        self.config_tree_view.collapsed.connect(
+            lambda index: self.tree_model.set_expanded(
+                self.tree_proxy.mapToSource(index), False
+            )
+        )
         self.configuration_table_view = ConfigurationTable(self)
-        table_model = ui_model.ConfigTableSettingModel(root)
-        self.set_table_setting_model(table_model)
-
-        main_layout.addWidget(self.config_tree_view)
-        main_layout.addWidget(self.configuration_table_view)
+        # One model for the lifetime of the editor, selections only switch its
+        # source.
+        self.table_model = ui_model.ConfigTableSettingModel(None)
+        self.set_table_setting_model(self.table_model)
+
+        self.current_configuration: Optional[Configuration] = None
+        self.resolve_queue = controller.SettingsResolveQueue(parent=self)
+        self.resolve_queue.resolved.connect(self.on_settings_resolved)
+        self.resolve_queue.resolveFailed.connect(self.on_settings_resolve_failed)
+
+        tree_layout = QtWidgets.QVBoxLayout()
+        tree_layout.addWidget(self.search_edit)
+        tree_layout.addWidget(self.preset_matches_label)
+        tree_layout.addWidget(self.config_tree_view)
+        main_layout.addLayout(tree_layout)
+        table_layout = QtWidgets.QVBoxLayout()
+        table_layout.addWidget(self.configuration_table_view.filter_edit)
+        table_layout.addWidget(self.configuration_table_view)
+        main_layout.addLayout(table_layout)
 
         config_tree_model = controller.create_config_tree_model_from_root_config(
             root_config
@@ -150,24 +551,443 @@ class ConfigEditor(QtWidgets.QWidget):
         # Connect selectionChanged signal to an intermediary function
 
     def set_tree_model(self, model: ui_model.TreeConfigurationModel):
-        self.config_tree_view.setModel(model)
+        # The view shows the model through a proxy that filters it by search.
+        self.tree_model = model
+        self.tree_proxy = ui_model.SettingsFilterProxyModel(self)
+        self.tree_proxy.setSourceModel(model)
+        self.config_tree_view.setModel(self.tree_proxy)
         self.config_tree_view.selectionModel().selectionChanged.connect(
             self.on_selection_changed
         )
+        self.expand_to_depth(self.expand_depth)
+
+    def expand_to_depth(self, depth: int):
+        # Like QTreeView.expandToDepth, but only walks the first fetched batch
+        # of each level and goes through expand() so the model knows what is
+        # expanded.
+        model = self.config_tree_view.model()
+        level = [QtCore.QModelIndex()]
+        for _ in range(depth + 1):
+            next_level = []
+            for parent in level:
+                if model.rowCount(parent) == 0 and model.canFetchMore(parent):
+                    model.fetchMore(parent)
+                for row in range(model.rowCount(parent)):
+                    index = model.index(row, 0, parent)
+                    if model.hasChildren(index):
+                        self.config_tree_view.expand(index)
+                        next_level.append(index)
+            level = next_level
+
+    def apply_search(self):
+        text = self.search_edit.text().strip()
+        if not text:
+            self.tree_proxy.set_matches(None)
+            self.preset_matches_label.hide()
+            return
+        if self.settings_index is None:
+            self.settings_index = SettingsIndex(self.root_config, self.projects)
+        matches = self.settings_index.search_holders(text, limit=self.max_search_matches)
+        configurations: dict[Configuration, None] = {}
+        presets = []
+        for holder in matches:
+            if isinstance(holder, Preset):
+                presets.append(holder)
+                configurations[holder.base_configuration] = None
+            else:
+                configurations[holder] = None
+        for configuration in configurations:
+            self.tree_model.expose(configuration)
+        self.tree_proxy.set_matches(configurations)
+        self.preset_matches_label.setText(
+            "Presets: " + ", ".join(preset.name for preset in presets)
+        )
+        self.preset_matches_label.setVisible(bool(presets))
         self.config_tree_view.expandAll()
 
+    def closeEvent(self, event):
+        if self.settings_index is not None:
+            self.settings_index.close()
+            self.settings_index = None
+        super(ConfigEditor, self).closeEvent(event)
+
     def set_table_setting_model(self, model: ui_model.ConfigTableSettingModel):
         self.configuration_table_view.setModel(model)
 
+    def apply_patches(self, patches: list[Patch]):
+        for patch in patches:
+            self.tree_model.apply_patch(patch)
+        # The index already followed the patches, matches may have changed.
+        if self.tree_proxy.filtering:
+            self.apply_search()
+        # Re-resolve the shown configuration, this also drops a result that
+        # was computed from the unpatched tree.
+        if self.current_configuration is not None:
+            self.resolve_queue.request(self.current_configuration)
+
     def on_selection_changed(self, selected, deselected):
         if not selected.indexes():
-            root = Configuration("root")
-            model = ui_model.ConfigTableSettingModel(root)
-            self.set_table_setting_model(model)
+            self.current_configuration = None
+            self.resolve_queue.cancel()
+            self.configuration_table_view.set_loading(False)
+            self.table_model.set_source(None)
             return
 
-        selected_id = selected.indexes()[0]
+        selected_id = self.tree_proxy.mapToSource(selected.indexes()[0])
         item = selected_id.internalPointer()
 
-        model = ui_model.ConfigTableSettingModel(configuration=item)
-        self.set_table_setting_model(model)
+        self.current_configuration = item
+        self.configuration_table_view.set_loading(True)
+        self.resolve_queue.request(item)
+
+    def on_settings_resolved(self, configuration: Configuration, config_settings):
+        self.configuration_table_view.set_loading(False)
+        self.table_model.set_source(configuration, config_settings)
+
+    def on_settings_resolve_failed(self, configuration: Configuration, message: str):
+        self.configuration_table_view.show_error(message)
+
+
+class DiagnosticsPanel(QtWidgets.QWidget):
+    def __init__(self, instrumentation: Instrumentation, parent=None):
+        super(DiagnosticsPanel, self).__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(700, 600)
+        self.instrumentation = instrumentation
+
+        main_layout = QtWidgets.QVBoxLayout()
+        self.setLayout(main_layout)
+
+        self.record_check = QtWidgets.QCheckBox("Record")
+        self.record_check.setToolTip(
+            "Time resolution calls and Qt model calls. Qt models only report"
+            " calls when they were created while recording"
+        )
+        self.record_check.setChecked(instrumentation.enabled)
+        self.record_check.toggled.connect(self.set_recording)
+        reset_button = QtWidgets.QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        export_json_button = QtWidgets.QPushButton("Export JSON...")
+        export_json_button.clicked.connect(self.export_json)
+        export_trace_button = QtWidgets.QPushButton("Export Chrome Trace...")
+        export_trace_button.clicked.connect(self.export_chrome_trace)
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.record_check)
+        button_layout.addStretch()
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(export_json_button)
+        button_layout.addWidget(export_trace_button)
+        main_layout.addLayout(button_layout)
+
+        self.summary_label = QtWidgets.QLabel()
+        main_layout.addWidget(self.summary_label)
+
+        self.calls_model = ui_model.DiagnosticsTableModel(
+            ["Function", "Calls", "Total (ms)", "Mean (us)", "p95 (us)", "Max (us)"],
+            self,
+        )
+        self.calls_view = self._create_table_view(self.calls_model)
+        self.calls_view.sortByColumn(2, QtCore.Qt.SortOrder.DescendingOrder)
+        main_layout.addWidget(self.calls_view, 2)
+
+        self.depths_model = ui_model.DiagnosticsTableModel(
+            ["Configuration", "Chain depth"], self
+        )
+        self.depths_view = self._create_table_view(self.depths_model)
+        self.depths_view.sortByColumn(1, QtCore.Qt.SortOrder.DescendingOrder)
+        main_layout.addWidget(self.depths_view, 1)
+
+        # Only polls while shown.
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setInterval(1000)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def _create_table_view(
+        self, model: QtCore.QAbstractItemModel
+    ) -> QtWidgets.QTableView:
+        view = QtWidgets.QTableView(self)
+        view.setModel(model)
+        view.setSortingEnabled(True)
+        view.setAlternatingRowColors(True)
+        view.verticalHeader().hide()
+        view.horizontalHeader().setSectionResizeMode(
+            0, QtWidgets.QHeaderView.ResizeMode.Stretch
+        )
+        return view
+
+    def set_recording(self, recording: bool):
+        if recording:
+            self.instrumentation.enable()
+        else:
+            self.instrumentation.disable()
+        self.refresh()
+
+    def reset(self):
+        self.instrumentation.reset()
+        self.refresh()
+
+    def refresh(self):
+        report = self.instrumentation.to_dict()
+        self.calls_model.set_rows(
+            [
+                (
+                    name,
+                    stats["count"],
+                    stats["total_ms"],
+                    stats["mean_us"],
+                    stats["p95_us"],
+                    stats["max_us"],
+                )
+                for name, stats in report["calls"].items()
+            ]
+        )
+        self.depths_model.set_rows(list(report["chain_depths"]))
+        cache = report["resolution_cache"]
+        summary = (
+            f"Chain depth: max {report['max_chain_depth']},"
+            f" mean {report['mean_chain_depth']:.1f}    "
+            f"Resolution cache: {cache['hits']} hits, {cache['misses']} misses,"
+            f" {cache['invalidations']} invalidations"
+        )
+        if report["dropped_trace_events"]:
+            summary += f"    {report['dropped_trace_events']} trace events dropped"
+        self.summary_label.setText(summary)
+
+    def export_json(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Diagnostics", "diagnostics.json", "JSON (*.json)"
+        )
+        if path:
+            self.instrumentation.write_json(path)
+
+    def export_chrome_trace(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Chrome Trace", "trace.json", "Trace Event JSON (*.json)"
+        )
+        if path:
+            self.instrumentation.write_chrome_trace(path)
+
+    def showEvent(self, event):
+        super(DiagnosticsPanel, self).showEvent(event)
+        self.record_check.setChecked(self.instrumentation.enabled)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        self._refresh_timer.stop()
+        super(DiagnosticsPanel, self).hideEvent(event)
+
+
+class LaunchPanel(QtWidgets.QWidget):
+    # Lines of tool output kept in the log, older ones are dropped.
+    MAX_LOG_LINES = 10_000
+
+    def __init__(self, launch_controller: controller.LaunchController, parent=None):
+        # qtpy's QtGui takes long to import, only pay for it once something
+        # is launched.
+        from qtpy import QtGui
+
+        super(LaunchPanel, self).__init__(parent)
+        self.setWindowTitle("Launches")
+        self.resize(800, 600)
+        self.launch_controller = launch_controller
+        self.launches: dict[int, "Launch"] = {}
+
+        main_layout = QtWidgets.QVBoxLayout()
+        self.setLayout(main_layout)
+
+        self.launches_model = ui_model.DiagnosticsTableModel(
+            [
+                "Launch",
+                "Preset",
+                "Tool",
+                "State",
+                "PID",
+                "Resolve (ms)",
+                "Spawn (ms)",
+                "To start (ms)",
+                "Exit code",
+            ],
+            self,
+        )
+        self.launches_view = QtWidgets.QTableView(self)
+        self.launches_view.setModel(self.launches_model)
+        self.launches_view.setSortingEnabled(True)
+        self.launches_view.setAlternatingRowColors(True)
+        self.launches_view.verticalHeader().hide()
+        self.launches_view.sortByColumn(0, QtCore.Qt.SortOrder.DescendingOrder)
+        main_layout.addWidget(self.launches_view, 1)
+
+        self.log_edit = QtWidgets.QPlainTextEdit(self)
+        self.log_edit.setReadOnly(True)
+        self.log_edit.setMaximumBlockCount(self.MAX_LOG_LINES)
+        self.log_edit.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+        self.log_edit.setFont(
+            QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont)
+        )
+        main_layout.addWidget(self.log_edit, 2)
+
+        clear_button = QtWidgets.QPushButton("Clear Log")
+        clear_button.clicked.connect(self.log_edit.clear)
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(clear_button)
+        main_layout.addLayout(button_layout)
+
+        # State changes come in bursts when many tools launch at once, the
+        # table is rebuilt once per burst.
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(100)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        launch_controller.launchChanged.connect(self.on_launch_changed)
+        launch_controller.outputReceived.connect(self.on_output_received)
+
+    def on_launch_changed(self, launch: "Launch", state: "LaunchState"):
+        from rez_wg_config_launcher_demo.launch import LaunchState
+
+        self.launches[launch.launch_id] = launch
+        self._refresh_timer.start()
+        prefix = f"[{launch.launch_id} {launch.tool}]"
+        timings = launch.timings
+        if state == LaunchState.RUNNING:
+            self.log_edit.appendPlainText(
+                f"{prefix} started {' '.join(launch.command)}, pid {launch.pid},"
+                f" resolve {_milliseconds(timings.resolve_seconds):.1f}ms,"
+                f" spawn {_milliseconds(timings.spawn_seconds):.1f}ms,"
+                f" {_milliseconds(timings.start_seconds):.1f}ms to start"
+            )
+        elif state == LaunchState.FINISHED:
+            self.log_edit.appendPlainText(
+                f"{prefix} exited with {launch.returncode}"
+                f" after {timings.run_seconds:.1f}s"
+            )
+        elif state == LaunchState.FAILED:
+            self.log_edit.appendPlainText(f"{prefix} failed: {launch.error}")
+
+    def on_output_received(self, launch: "Launch", stream: str, lines: list[str]):
+        prefix = f"[{launch.launch_id} {launch.tool}]"
+        if stream == "stderr":
+            prefix += " !"
+        self.log_edit.appendPlainText(
+            "\n".join(f"{prefix} {line}" for line in lines)
+        )
+
+    def refresh(self):
+        self.launches_model.set_rows(
+            [
+                (
+                    launch.launch_id,
+                    launch.preset_name,
+                    launch.tool,
+                    launch.state.name.capitalize(),
+                    launch.pid,
+                    _milliseconds(launch.timings.resolve_seconds),
+                    _milliseconds(launch.timings.spawn_seconds),
+                    _milliseconds(launch.timings.start_seconds),
+                    launch.returncode,
+                )
+                for launch in self.launches.values()
+            ]
+        )
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+class DiffPanel(QtWidgets.QWidget):
+    def __init__(self, parent=None):
+        super(DiffPanel, self).__init__(parent)
+        self.setWindowTitle("Compare Presets")
+        self.resize(1000, 600)
+        self.holders: list[tuple[str, Union[Configuration, Preset]]] = []
+        self.engine = DiffEngine()
+
+        main_layout = QtWidgets.QVBoxLayout()
+        self.setLayout(main_layout)
+
+        self.left_combo = QtWidgets.QComboBox()
+        self.right_combo = QtWidgets.QComboBox()
+        for combo in (self.left_combo, self.right_combo):
+            combo.currentIndexChanged.connect(self.refresh)
+        swap_button = QtWidgets.QPushButton("Swap")
+        swap_button.clicked.connect(self.swap)
+        combo_layout = QtWidgets.QHBoxLayout()
+        combo_layout.addWidget(self.left_combo, 1)
+        combo_layout.addWidget(swap_button)
+        combo_layout.addWidget(self.right_combo, 1)
+        main_layout.addLayout(combo_layout)
+
+        self.summary_label = QtWidgets.QLabel()
+        main_layout.addWidget(self.summary_label)
+
+        self.diff_model = ui_model.SettingsDiffModel(self)
+        self.diff_view = QtWidgets.QTableView(self)
+        self.diff_view.setModel(self.diff_model)
+        self.diff_view.setAlternatingRowColors(True)
+        self.diff_view.setWordWrap(False)
+        self.diff_view.verticalHeader().hide()
+        self.diff_view.horizontalHeader().setStretchLastSection(True)
+        main_layout.addWidget(self.diff_view)
+
+    def set_holders(self, holders: list[tuple[str, Union[Configuration, Preset]]]):
+        # Keeps the compared holders selected when they are still listed.
+        left, right = self._holder(self.left_combo), self._holder(self.right_combo)
+        self.holders = holders
+        # A fresh engine for the new holders, the old one's folds are dropped.
+        self.engine = DiffEngine()
+        labels = [label for label, _ in holders]
+        for combo, selected, default in [
+            (self.left_combo, left, 0),
+            (self.right_combo, right, 1),
+        ]:
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(labels)
+            combo.setCurrentIndex(self._row(selected, min(default, len(holders) - 1)))
+            combo.blockSignals(False)
+        self.refresh()
+
+    def compare(
+        self, left: Union[Configuration, Preset], right: Union[Configuration, Preset]
+    ):
+        for combo, holder in [(self.left_combo, left), (self.right_combo, right)]:
+            combo.blockSignals(True)
+            combo.setCurrentIndex(self._row(holder, combo.currentIndex()))
+            combo.blockSignals(False)
+        self.refresh()
+
+    def swap(self):
+        self.compare(self._holder(self.right_combo), self._holder(self.left_combo))
+
+    def refresh(self, *_):
+        left, right = self._holder(self.left_combo), self._holder(self.right_combo)
+        if left is None or right is None:
+            self.diff_model.set_diff(None)
+            self.summary_label.clear()
+            return
+        diff = self.engine.diff(left, right)
+        self.diff_model.set_diff(diff)
+        self.diff_view.resizeColumnsToContents()
+        common_ancestor = diff.common_ancestor
+        summary = f"{len(diff.differences)} difference(s)"
+        if common_ancestor is not None:
+            summary += (
+                f", common ancestor '{common_ancestor.name}'"
+                f" ({len(diff.common_holders)} shared)"
+            )
+        self.summary_label.setText(summary)
+
+    def _holder(self, combo: QtWidgets.QComboBox) -> Optional[Union[Configuration, Preset]]:
+        row = combo.currentIndex()
+        if 0 <= row < len(self.holders):
+            return self.holders[row][1]
+        return None
+
+    def _row(self, holder, default: int) -> int:
+        for row, (_, listed) in enumerate(self.holders):
+            if listed is holder:
+                return row
+        return default
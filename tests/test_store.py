@@ -0,0 +1,47 @@
+from rez_wg_config_launcher_demo import demo_data, store
+from rez_wg_config_launcher_demo.data_model import EnvVar, EnvVarAction, Transaction
+
+
+def _load_from_cache(directory):
+    root = demo_data.create_config_data()
+    store.save(str(directory), root, demo_data.create_project_data(root))
+    # The first load writes the binary cache, the second reads from it.
+    store.load(str(directory))
+    source = store.ConfigSource(str(directory))
+    root, _ = source.load()
+    assert source._cache is not None
+    return source, root
+
+
+def _env_keys(configuration):
+    return [s.key for s in configuration.settings if isinstance(s, EnvVar)]
+
+
+def test_released_settings_keep_edits(tmp_path):
+    source, root = _load_from_cache(tmp_path)
+    with source:
+        studio = root.get_child_by_name("studio")
+        assert isinstance(studio.settings, store.LazySettingList)
+        studio.add_env_var("EDITED", "1", EnvVarAction.SET)
+        studio.release_cached_settings()
+        assert "EDITED" in _env_keys(studio)
+
+
+def test_released_settings_keep_transaction_edits(tmp_path):
+    source, root = _load_from_cache(tmp_path)
+    with source:
+        studio = root.get_child_by_name("studio")
+        with Transaction(root) as transaction:
+            transaction.add_env_var(studio, "EDITED", "1", EnvVarAction.SET)
+        studio.release_cached_settings()
+        assert "EDITED" in _env_keys(studio)
+
+
+def test_unedited_settings_are_released(tmp_path):
+    source, root = _load_from_cache(tmp_path)
+    with source:
+        studio = root.get_child_by_name("studio")
+        keys = _env_keys(studio)
+        studio.release_cached_settings()
+        assert not studio.settings.materialized
+        assert _env_keys(studio) == keys